@@ -1,4 +1,4 @@
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, List
 
 import pytest
 from fastapi import FastAPI
@@ -8,10 +8,44 @@ from sqlalchemy.orm import sessionmaker
 
 from cyberarena.db.dependencies import get_db_session
 from cyberarena.db.utils import create_database, drop_database
+from cyberarena.game_module.card import LibraryCard
+from cyberarena.game_module.settings import settings as game_settings
 from cyberarena.settings import settings
 from cyberarena.web.application import get_app
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """
+    Add the option running the slow tests.
+
+    :param parser: parser of the command line options.
+    """
+    parser.addoption(
+        "--runslow",
+        action="store_true",
+        default=False,
+        help="run the tests marked as slow",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config,
+    items: List[pytest.Item],
+) -> None:
+    """
+    Skip the slow tests unless they are asked for.
+
+    :param config: pytest config.
+    :param items: collected tests.
+    """
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --runslow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
 @pytest.fixture(scope="session")
 def anyio_backend() -> str:
     """
@@ -22,6 +56,24 @@ def anyio_backend() -> str:
     return "asyncio"
 
 
+@pytest.fixture
+def card_library() -> LibraryCard:
+    """
+    Load the library of the game cards.
+
+    The library is a singleton, so it is reset to drop a library loaded
+    from another path by a previous test.
+
+    :return: the library.
+    """
+    LibraryCard.reset()
+    return LibraryCard(
+        game_settings.card_path,
+        game_settings.card_data_filename,
+        game_settings.card_image_filename,
+    )
+
+
 @pytest.fixture(scope="session")
 async def _engine() -> AsyncGenerator[AsyncEngine, None]:
     """
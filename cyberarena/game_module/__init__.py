@@ -5,6 +5,11 @@ from .game_manager import game_manager
 from .utils import (
     create_deck,
     get_card_from_id,
+    get_card_json,
+    get_catalogue_json,
+    get_catalogue_with_images_json,
+    get_path_card_atlas,
+    get_path_card_atlas_sheet,
     get_path_card_image,
     get_starting_cards_amount,
     setup_game_module,
@@ -13,7 +18,12 @@ from .utils import (
 __all__ = [  # noqa: WPS410
     "game_manager",
     "get_card_from_id",
+    "get_card_json",
+    "get_catalogue_json",
+    "get_catalogue_with_images_json",
     "get_path_card_image",
+    "get_path_card_atlas",
+    "get_path_card_atlas_sheet",
     "exceptions",
     "enums",
     "AbstractCard",
@@ -3,13 +3,27 @@
 import argparse
 import logging
 import os
+from typing import List, Optional
 
+from cyberarena.game_module.build_manifest import BuildManifest
 from cyberarena.game_module.card.library import Library
 from cyberarena.game_module.image_card_generator import (
+    CardImageResult,
+    CardImageTask,
     ImageCardGenerator,
-    is_data_or_image_newer_than_builded_card,
+    build_card_atlas,
+    get_card_image_filenames,
+    get_generation_jobs,
+    is_card_atlas_up_to_date,
+    render_cards_images,
 )
 from cyberarena.game_module.settings import settings
+from cyberarena.game_module.utils import (
+    card_images_lock,
+    check_card_images,
+    setup_card_images,
+    setup_library,
+)
 
 logger = logging.getLogger("cyberarena.game_module")
 FORMAT = (
@@ -70,49 +84,45 @@ def set_logger_for_generation() -> None:
     logger_validator.disabled = True
 
 
-def is_card_must_be_generated(image_file_path: str, output: str) -> bool:
-    """
-    Check if the card must be generated.
-
-    It will check if the card is already generated and if the card is
-    modified since the last generation.
-
-    :param image_file_path: The path to the image file of the card.
-    :param output: The folder where the image is save.
-    :return: True if the card must be generated, False otherwise.
-    """
-    data_file_path = image_file_path.replace(
-        settings.card_image_filename,
-        settings.card_data_filename,
-    )
-    return is_data_or_image_newer_than_builded_card(
-        data_file_path,
-        image_file_path,
-        output,
-    )
-
-
-def generate_and_save_card_images(lib: Library, force: bool) -> None:
+def generate_and_save_card_images(  # noqa: WPS210
+    lib: Library,
+    force: bool,
+    jobs: int,
+) -> List[CardImageResult]:
     """
     Generate and save the card images.
 
     It will generate the card images and save them in the output folder.
+    The cards are rendered with a pool of processes when jobs is more than 1.
 
     :param lib: The library containing the cards.
     :param force: Force the generation of the image.
+    :param jobs: The number of processes used to render the cards.
+    :return: The result of the rendering of each generated card.
     """
     output = ImageCardGenerator.resources.output_folder
-    image_nb = 0
-    for index in lib.keys():
-        image_nb += 1
-        must_be_gnerated = is_card_must_be_generated(
+    manifest = BuildManifest(output)
+    tasks = []
+    cards_hash = {}
+    for image_nb, index in enumerate(sorted(lib.keys()), start=1):
+        cards_hash[index] = manifest.card_hash(
+            lib.get_data_path(index),
             lib.get_img_path(index),
-            os.path.join(
-                output,
-                "{0}.png".format(index),
-            ),
         )
-        if not must_be_gnerated and not force:
+        filename = "{0}.png".format(index)
+        filename_with_values = "{0}_full.png".format(index)
+        is_up_to_date = manifest.is_up_to_date(
+            index,
+            cards_hash[index],
+            [
+                os.path.join(output, variant)
+                for variant in (
+                    get_card_image_filenames(filename)
+                    + get_card_image_filenames(filename_with_values)
+                )
+            ],
+        )
+        if is_up_to_date and not force:
             logger_generator.info(
                 "Skip image for card {0}, {1}/{2}".format(
                     lib[index].name,
@@ -121,23 +131,96 @@ def generate_and_save_card_images(lib: Library, force: bool) -> None:
                 ),
             )
             continue
-        logger_generator.info(
-            "Generate image for card {0}, {1}/{2}".format(
-                lib[index].name,
-                image_nb,
-                len(lib),
+        tasks.append(
+            CardImageTask(
+                card_id=index,
+                card=lib[index],
+                image_path=lib.get_img_path(index),
+                output_folder=output,
+                filename=filename,
+                filename_with_values=filename_with_values,
             ),
         )
-        generator = ImageCardGenerator(
-            lib[index],
-            lib.get_img_path(index),
+
+    logger_generator.info(
+        "Generate {0} images with {1} jobs".format(len(tasks), jobs),
+    )
+    results = []
+    with manifest.recording():
+        for task_nb, result in enumerate(render_cards_images(tasks, jobs), start=1):
+            results.append(result)
+            manifest.update(result.card_id, cards_hash[result.card_id])
+            logger_generator.info(
+                "Generate image for card {0}, {1}/{2} in {3:.2f}s".format(
+                    lib[result.card_id].name,
+                    task_nb,
+                    len(tasks),
+                    result.elapsed,
+                ),
+            )
+    return results
+
+
+def report_resources_usage(results: List[CardImageResult]) -> None:
+    """
+    Report the usage of the resources shared between the card images.
+
+    It shows how many card backgrounds were built and how many were reused.
+    When rendering in parallel, each process builds its own backgrounds.
+
+    :param results: The result of the rendering of each generated card.
+    """
+    reused = sum(1 for result in results if result.background_reused)
+    logger_generator.info(
+        "Card backgrounds: {0} built, {1} reused from cache".format(
+            len(results) - reused,
+            reused,
+        ),
+    )
+
+
+def generate_card_atlases(lib: Library, output: str, force: bool) -> None:
+    """
+    Generate the atlases of the card images.
+
+    An atlas is generated again when the cards of the library changed
+    or when force is True.
+
+    :param lib: The library containing the cards.
+    :param output: The folder containing the card images.
+    :param force: Force the generation of the atlases.
+    """
+    card_ids = sorted(lib.keys())
+    for name, filename in (  # noqa: WPS352
+        (settings.dynamic_atlas, "{0}.png"),
+        (settings.static_atlas, "{0}_full.png"),
+    ):
+        is_up_to_date = is_card_atlas_up_to_date(
+            os.path.join(output, "{0}.json".format(name)),
+            card_ids,
+            settings.card_atlas_max_size,
+        )
+        if is_up_to_date and not force:
+            logger_generator.info("Skip atlas {0}".format(name))
+            continue
+        build_card_atlas(
+            {
+                card_id: os.path.join(output, filename.format(card_id))
+                for card_id in card_ids
+            },
+            output,
+            name,
+            settings.card_atlas_max_size,
         )
-        generator.generate_card()
-        generator.save_image("{0}.png".format(index))
-        generator.save_image_with_values("{0}_full.png".format(index))
+        logger_generator.info("Generate atlas {0}".format(name))
 
 
-def create_image(folder: str, output: str, force: bool) -> None:  # noqa: WPS210
+def create_image(  # noqa: WPS210
+    folder: str,
+    output: str,
+    force: bool,
+    jobs: Optional[int] = None,
+) -> None:
     """
     Create the image of cards.
 
@@ -146,12 +229,14 @@ def create_image(folder: str, output: str, force: bool) -> None:  # noqa: WPS210
     user if he want to create it.
     **Warning**: This function will stop the execution if the output folder
     doesn't exist and wait the user confirmation to create it.
-    **Warning**: It will overwrite every older card image with the same name if data or
-    image is newer than the image card.
+    **Warning**: It will overwrite every card image with the same name if its data,
+    image, font or the generator changed since the last build.
 
     :param folder: The folder containing all the different cards.
     :param output: The folder where the images will be saved.
     :param force: Force the generation of the image.
+    :param jobs: The number of processes used to render the cards,
+        None to use all the CPUs.
     """
     set_logger_for_generation()
     lib = Library(
@@ -179,7 +264,28 @@ def create_image(folder: str, output: str, force: bool) -> None:  # noqa: WPS210
     logger_generator.info("Output folder: {0}".format(output))
 
     ImageCardGenerator.resources.output_folder = output
-    generate_and_save_card_images(lib, force)
+    results = generate_and_save_card_images(lib, force, get_generation_jobs(jobs))
+    report_resources_usage(results)
+    generate_card_atlases(lib, output, force or bool(results))
+
+
+def build_card_images() -> None:
+    """
+    Build the card images used by the server.
+
+    It sets up the library and the card images from the game module settings,
+    like the server does when starting in 'generate' mode.
+    It is meant to be run once at build time (e.g. in the Dockerfile),
+    so the server can start in 'prebuilt' mode without generating anything.
+    """
+    set_logger_for_generation()
+    setup_library()
+    with card_images_lock():
+        setup_card_images()
+    check_card_images()
+    logger_generator.info(
+        "Card images built in {0}".format(settings.card_image_path),
+    )
 
 
 if __name__ == "__main__":
@@ -206,6 +312,12 @@ if __name__ == "__main__":
         help="Create the image of the cards.",
     )
 
+    subparser.add_parser(
+        "build",
+        help="Build the card images used by the server, "
+        "from the GAME_MODULE_* settings.",
+    )
+
     parser.add_argument(
         "-v",
         "--version",
@@ -253,9 +365,22 @@ if __name__ == "__main__":
         action="store_true",
     )
 
+    construct_parser.add_argument(
+        "-j",
+        "--jobs",
+        help="The number of processes used to generate the images "
+        "(default: the number of CPUs).",
+        type=int,
+        required=False,
+        dest="jobs",
+        default=None,
+    )
+
     args = parser.parse_args()
 
     if args.subcommand == "verify":
         verify_library(args.directory)
     elif args.subcommand == "create":
-        create_image(args.directory, args.output, args.force)
+        create_image(args.directory, args.output, args.force, args.jobs)
+    elif args.subcommand == "build":
+        build_card_images()
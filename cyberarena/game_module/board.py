@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from .card import AbstractCard, PlayableCharacterCard
 from .settings import settings
@@ -8,14 +8,30 @@ logger = logging.getLogger("cyberarena.game_module")
 
 
 class Board:
-    """Board Class."""
+    """
+    Board Class.
+
+    Each side maps the id of its cards to the cards, in the order they were
+    deployed. The board also keeps the side and the card of each id,
+    so a card is found and removed in constant time whatever the board size.
+    """
+
+    __slots__ = (
+        "__side1",
+        "__nexus1",
+        "__side2",
+        "__nexus2",
+        "__cards",
+        "__boardSize",
+    )
 
     def __init__(self) -> None:
         """Constructor."""
-        self.__side1: List[PlayableCharacterCard] = []
+        self.__side1: Dict[int, PlayableCharacterCard] = {}
         self.__nexus1: int = settings.nexus_health
-        self.__side2: List[PlayableCharacterCard] = []
+        self.__side2: Dict[int, PlayableCharacterCard] = {}
         self.__nexus2: int = settings.nexus_health
+        self.__cards: Dict[int, Tuple[int, PlayableCharacterCard]] = {}
         self.__boardSize = settings.board_size
 
     def deploy_card(self, card: AbstractCard, side: int) -> None:
@@ -29,24 +45,23 @@ class Board:
             # todo: add support for other cards
             return
 
-        if side == 1:
-            if len(self.__side1) < self.__boardSize:
-                self.__side1.append(card)
-            else:
-                logger.debug("Board is full")
+        board_side = 1 if side == 1 else 2
+        cards = self.__get_side(board_side)
+        if len(cards) >= self.__boardSize:
+            logger.debug("Board is full")
+        elif self.__cards.get(card.id) is not None:
+            logger.debug("Card already on the board")
         else:
-            if len(self.__side2) < self.__boardSize:
-                self.__side2.append(card)
-            else:
-                logger.debug("Board is full")
+            cards[card.id] = card
+            self.__cards[card.id] = (board_side, card)
 
     def show_board(self) -> None:
         """Show the board."""
         logger.debug("Side 1:")
-        for card in self.__side1:
+        for card in self.__side1.values():
             logger.debug(card)
         logger.debug("Side 2:")
-        for card2 in self.__side2:
+        for card2 in self.__side2.values():
             logger.debug(card2)
 
     def attack_card(
@@ -67,43 +82,30 @@ class Board:
             return
         cardatt.attack_card(cardrecv)
         if not cardrecv.is_alive():
-            if side == 1:
-                self.__side1.remove(cardrecv)
-            else:
-                self.__side2.remove(cardrecv)
+            self.__remove_card(cardrecv)
         if not cardatt.is_alive():
-            if side == 1:
-                self.__side2.remove(cardatt)
-            else:
-                self.__side1.remove(cardatt)
+            self.__remove_card(cardatt)
 
-    def attack_nexus(self, idatt: int, side: int) -> None:  # noqa: C901
+    def attack_nexus(self, idatt: int, side: int) -> None:
         """
         Attack the nexus.
 
         :param idatt: Id of the card attacking.
         :param side: Side of the board of the nexus receving damage.
         """
+        card = self.get_card_id(1 if side == 2 else 2, idatt)
+        if card is None:
+            return
+        if card.already_attacked:
+            logger.error("already attacked this turn")
+            return
+        card.already_attacked = True
         if side == 2:
-            for card in self.__side1:
-                if card.id == idatt:
-                    if card.already_attacked:
-                        logger.error("already attacked this turn")
-                        return
-                    self.__nexus2 -= card.ap
-                    card.already_attacked = True
-                    logger.error("nexus1 attacké")
-                    return
+            self.__nexus2 -= card.ap
+            logger.error("nexus1 attacké")
         else:
-            for card2 in self.__side2:
-                if card2.id == idatt:
-                    if card2.already_attacked:
-                        logger.error("already attacked this turn")
-                        return
-                    self.__nexus1 -= card2.ap
-                    card2.already_attacked = True
-                    logger.error("nexus2 attacké")
-                    return
+            self.__nexus1 -= card.ap
+            logger.error("nexus2 attacké")
 
     def get_nexus_health(self, side: int) -> int:
         """
@@ -144,13 +146,10 @@ class Board:
         :param index: Index of the card to get.
         :return: The card.
         """
-        if player == 1:
-            if index > len(self.__side1):
-                return None
-            return self.__side1[index]
-        if index > len(self.__side2):
+        cards = self.__get_side(player)
+        if index >= len(cards):
             return None
-        return self.__side2[index]
+        return list(cards.values())[index]
 
     def get_card_id(self, player: int, id_card: int) -> Optional[PlayableCharacterCard]:
         """
@@ -160,15 +159,16 @@ class Board:
         :param id_card: id of the card to get.
         :return: The card.
         """
-        if player == 1:
-            for card in self.__side1:
-                if card.id == id_card:
-                    return card
-        else:
-            for card2 in self.__side2:
-                if card2.id == id_card:
-                    return card2
-        return None
+        return self.__get_side(player).get(id_card)
+
+    def get_cards(self, side: int) -> List[PlayableCharacterCard]:
+        """
+        Get the cards of a side.
+
+        :param side: Side of the board.
+        :return: The cards of the side, in the order they were deployed.
+        """
+        return list(self.__get_side(side).values())
 
     def end_turn(self, player: int) -> None:
         """
@@ -176,12 +176,8 @@ class Board:
 
         :param player: Player ending the turn.
         """
-        if player == 1:
-            for card in self.__side2:
-                card.end_turn()
-        else:
-            for card2 in self.__side1:
-                card2.end_turn()
+        for card in self.__get_side(2 if player == 1 else 1).values():
+            card.end_turn()
 
     def get_updated_card_stats(self, idcard: int) -> Dict[str, Union[str, int]]:
         """
@@ -190,10 +186,28 @@ class Board:
         :param idcard: Id of the card to get the stats from.
         :return: The updated stats.
         """
-        for card in self.__side1:
-            if card.id == idcard:
-                return card.to_dict()
-        for card2 in self.__side2:
-            if card2.id == idcard:
-                return card2.to_dict()
-        return {}
+        placed = self.__cards.get(idcard)
+        if placed is None:
+            return {}
+        _, card = placed
+        return card.to_dict()
+
+    def __get_side(self, side: int) -> Dict[int, PlayableCharacterCard]:
+        """
+        Get the cards of a side.
+
+        :param side: Side of the board.
+        :return: The cards of the side by id.
+        """
+        if side == 1:
+            return self.__side1
+        return self.__side2
+
+    def __remove_card(self, card: PlayableCharacterCard) -> None:
+        """
+        Remove a card from the board.
+
+        :param card: Card to remove.
+        """
+        side, _ = self.__cards.pop(card.id)
+        del self.__get_side(side)[card.id]  # noqa: WPS420
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional
+
+from .settings import settings
+
+logger = logging.getLogger("cyberarena.game_module.image_generator")
+
+# Must be increased each time the rendering of the cards changes,
+# so every card image is builded again.
+GENERATOR_VERSION = 2
+
+# Size in bytes of the chunks read to hash a file
+HASH_CHUNK_SIZE = 65536
+
+
+def hash_file(filename: str) -> str:
+    """
+    Hash the content of a file.
+
+    :param filename: The file to hash.
+    :return: The sha256 hexdigest of the file content.
+    """
+    sha = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):  # noqa: WPS426
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class BuildManifest(object):
+    """
+    Manifest of the builded card images.
+
+    It stores for each card a hash of everything used to build its images:
+    the data file, the image file, the font and the generator version.
+    Unlike modification times, the hashes survive a git checkout or a copy
+    in a docker image, so only the cards which really changed are builded again.
+    """
+
+    def __init__(self, folder: str, filename: Optional[str] = None) -> None:
+        """
+        Load the manifest of a folder of builded card images.
+
+        If the manifest does not exist or is not valid, it is considered empty.
+
+        :param folder: The folder containing the builded card images.
+        :param filename: The filename of the manifest in the folder.
+        """
+        self._path = os.path.join(
+            folder,
+            filename or settings.card_image_manifest_filename,
+        )
+        self._font_hash: Optional[str] = None
+        self._cards: Dict[str, str] = {}
+        self._updated = False
+        try:
+            with open(self._path, "r") as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            logger.warning(f"The manifest '{self._path}' is not valid, it is ignored.")
+            return
+        if manifest.get("version") == GENERATOR_VERSION:
+            self._cards = manifest.get("cards", {})
+
+    @property
+    def path(self) -> str:
+        """
+        Getter for the path of the manifest.
+
+        :return: path of the manifest.
+        """
+        return self._path
+
+    def card_hash(self, data_filename: str, image_filename: str) -> str:
+        """
+        Hash the sources of a card.
+
+        :param data_filename: The data file of the card.
+        :param image_filename: The image file of the card.
+        :return: The hash of the sources of the card.
+        """
+        if self._font_hash is None:
+            self._font_hash = hash_file(settings.font_card_path)
+        sha = hashlib.sha256()
+        for part in (  # noqa: WPS352
+            str(GENERATOR_VERSION),
+            str(settings.font_big_size),
+            str(settings.font_normal_size),
+            str(settings.card_gradient_blur),
+            str(settings.card_image_thumb_width),
+            str(settings.card_image_medium_width),
+            str(settings.card_image_webp_quality),
+            self._font_hash,
+            hash_file(data_filename),
+            hash_file(image_filename),
+        ):
+            sha.update(part.encode())
+            sha.update(b"\0")
+        return sha.hexdigest()
+
+    def is_up_to_date(
+        self,
+        card_id: int,
+        card_hash: str,
+        builded_filenames: Iterable[str],
+    ) -> bool:
+        """
+        Check if the builded images of a card are up to date.
+
+        :param card_id: The id of the card.
+        :param card_hash: The hash of the current sources of the card.
+        :param builded_filenames: The builded images of the card.
+        :return: True if the images were builded from the same sources and exist.
+        """
+        if self._cards.get(str(card_id)) != card_hash:
+            return False
+        return all(os.path.exists(filename) for filename in builded_filenames)
+
+    def update(self, card_id: int, card_hash: str) -> None:
+        """
+        Record the sources used to build the images of a card.
+
+        :param card_id: The id of the card.
+        :param card_hash: The hash of the sources of the card.
+        """
+        self._cards[str(card_id)] = card_hash
+        self._updated = True
+
+    @contextmanager
+    def recording(self) -> Iterator["BuildManifest"]:
+        """
+        Record the cards builded in the block.
+
+        The manifest is saved at the end of the block if a card was recorded,
+        even if the block fails, so the cards already builded are kept.
+
+        :yield: The manifest.
+        """
+        try:
+            yield self
+        finally:
+            if self._updated:
+                self.save()
+
+    def save(self) -> None:
+        """Save the manifest, the file is replaced atomically."""
+        tmp_path = "{0}.{1}.tmp".format(self._path, os.getpid())
+        with open(tmp_path, "w") as file:
+            json.dump(
+                {"version": GENERATOR_VERSION, "cards": self._cards},
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, self._path)
@@ -9,6 +9,7 @@ from .constructor import (
 from .factory import factory_card
 from .library import Library as LibraryCard
 from .playable_character import PlayableCharacterCard
+from .template import CardState, CardTemplate
 
 __all__ = [  # noqa: WPS410
     "AbstractCard",
@@ -18,6 +19,8 @@ __all__ = [  # noqa: WPS410
     "PlayableCharacterCard",
     "LibraryCard",
     "AbstractCharacterCard",
+    "CardState",
+    "CardTemplate",
     "factory_card",
     "boost",
 ]
@@ -1,15 +1,23 @@
 import abc
-from typing import Dict, Union
+from typing import Any, Dict, Type, TypeVar, Union
 
 from loguru import logger
 
 from cyberarena.game_module.card.enums import ObjectCardRace, ObjectCardRarity
+from cyberarena.game_module.card.template import CardState, CardStats, CardTemplate
+
+TCard = TypeVar("TCard", bound="AbstractCard")
 
 
 class AbstractCard(metaclass=abc.ABCMeta):
-    """class AbstractCard."""
+    """
+    class AbstractCard.
+
+    A card is made of its template, which is shared by all the instances
+    of the card, and of the state of this instance in a game.
+    """
 
-    id = -1
+    __slots__ = ("_template", "_state")
 
     def __init__(
         self,
@@ -17,6 +25,7 @@ class AbstractCard(metaclass=abc.ABCMeta):
         description: str = "",
         cost: int = 0,
         rarity: ObjectCardRarity = ObjectCardRarity.COMMON,
+        **template_data: Any,
     ) -> None:
         """
         Constructor for AbstractCard.
@@ -25,17 +34,37 @@ class AbstractCard(metaclass=abc.ABCMeta):
         :param description: Description of the card.
         :param cost: Cost of the card.
         :param rarity: Rarity of the card.
+        :param template_data: Other data of the template of the card.
         :raises ValueError: If the name is negative or if the cost is negative.
         """
-        self._name: str = name
-        self._description: str = description
-        self._cost: int = cost
-        self._rarity: ObjectCardRarity = rarity
-        if self._name == "":
+        self._template = CardTemplate(
+            name=name,
+            description=description,
+            cost=cost,
+            rarity=rarity,
+            **template_data,
+        )
+        self._state = CardState(hp=self._template.hp)
+        if name == "":
             raise ValueError("The name of the card cannot be empty.")
-        if self._cost < 0:
+        if cost < 0:
             raise ValueError("The cost of the card cannot be negative.")
 
+    @classmethod
+    def from_template(cls: Type[TCard], template: CardTemplate) -> TCard:
+        """
+        Create a new instance of a card from its template.
+
+        The template is shared and not validated again.
+
+        :param template: The template of the card.
+        :return: The new instance of the card.
+        """
+        card = cls.__new__(cls)
+        card._template = template  # noqa: WPS437
+        card._state = CardState(hp=template.hp)  # noqa: WPS437
+        return card
+
     @abc.abstractmethod
     def __str__(self) -> str:
         """
@@ -60,6 +89,33 @@ class AbstractCard(metaclass=abc.ABCMeta):
             self.rarity,
         )
 
+    @property
+    def template(self) -> CardTemplate:
+        """
+        Getter for template.
+
+        :return: template.
+        """
+        return self._template
+
+    @property
+    def id(self) -> int:  # noqa: WPS125
+        """
+        Getter for the id of the instance of the card in the game.
+
+        :return: id.
+        """
+        return self._state.id
+
+    @id.setter
+    def id(self, card_id: int) -> None:  # noqa: WPS125
+        """
+        Setter for the id of the instance of the card in the game.
+
+        :param card_id: id.
+        """
+        self._state.id = card_id
+
     @property
     def name(self) -> str:
         """
@@ -67,7 +123,7 @@ class AbstractCard(metaclass=abc.ABCMeta):
 
         :return: name.
         """
-        return self._name
+        return self._template.name
 
     @property
     def description(self) -> str:
@@ -76,7 +132,7 @@ class AbstractCard(metaclass=abc.ABCMeta):
 
         :return: description.
         """
-        return self._description
+        return self._template.description
 
     @property
     def cost(self) -> int:
@@ -85,7 +141,7 @@ class AbstractCard(metaclass=abc.ABCMeta):
 
         :return: cost.
         """
-        return self._cost
+        return self._template.cost
 
     @property
     def rarity(self) -> ObjectCardRarity:
@@ -94,7 +150,7 @@ class AbstractCard(metaclass=abc.ABCMeta):
 
         :return: rarity.
         """
-        return self._rarity
+        return self._template.rarity
 
     @abc.abstractmethod
     def to_dict(self) -> Dict[str, Union[str, int]]:
@@ -104,6 +160,8 @@ class AbstractCard(metaclass=abc.ABCMeta):
 class AbstractCharacterCard(AbstractCard, metaclass=abc.ABCMeta):
     """class AbstractCharacterCard."""
 
+    __slots__ = ()
+
     def __init__(  # noqa: WPS211
         self,
         name: str,
@@ -114,6 +172,7 @@ class AbstractCharacterCard(AbstractCard, metaclass=abc.ABCMeta):
         cost: int = 0,
         rarity: ObjectCardRarity = ObjectCardRarity.COMMON,
         race: ObjectCardRace = ObjectCardRace.HUMAN,
+        **template_data: Any,
     ) -> None:
         """
         Constructor for AbstractCharacterCard.
@@ -126,6 +185,7 @@ class AbstractCharacterCard(AbstractCard, metaclass=abc.ABCMeta):
         :param cost: Cost of the card.
         :param rarity: Rarity of the card.
         :param race: The race of the character.
+        :param template_data: Other data of the template of the card.
         :raises ValueError: If the hp, ap or dp is negative.
         """
         super().__init__(
@@ -133,18 +193,18 @@ class AbstractCharacterCard(AbstractCard, metaclass=abc.ABCMeta):
             description=description,
             cost=cost,
             rarity=rarity,
+            hp=hp,
+            ap=ap,
+            dp=dp,
+            race=race,
+            **template_data,
         )
-        self._hp: int = hp
-        self._ap: int = ap
-        self._dp: int = dp
-        self.already_attacked = False
-        self._race: ObjectCardRace = race
         valuer_error: str = ""
-        if self._hp < 0:
+        if hp < 0:
             valuer_error = "The hp is negative."
-        elif self._ap < 0:
+        elif ap < 0:
             valuer_error = "The ap is negative."
-        elif self._dp < 0:
+        elif dp < 0:
             valuer_error = "The dp is negative."
         if valuer_error:
             raise ValueError(valuer_error)
@@ -182,7 +242,7 @@ class AbstractCharacterCard(AbstractCard, metaclass=abc.ABCMeta):
 
         :return: hp.
         """
-        return self._hp
+        return self._state.hp
 
     @property
     def ap(self) -> int:
@@ -191,7 +251,7 @@ class AbstractCharacterCard(AbstractCard, metaclass=abc.ABCMeta):
 
         :return: ap.
         """
-        return self._ap
+        return self._template.ap
 
     @property
     def dp(self) -> int:
@@ -200,7 +260,7 @@ class AbstractCharacterCard(AbstractCard, metaclass=abc.ABCMeta):
 
         :return: dp.
         """
-        return self._dp
+        return self._template.dp
 
     @property
     def race(self) -> ObjectCardRace:
@@ -209,7 +269,39 @@ class AbstractCharacterCard(AbstractCard, metaclass=abc.ABCMeta):
 
         :return: race.
         """
-        return self._race
+        return self._template.race
+
+    @property
+    def stats(self) -> CardStats:
+        """
+        Getter for the stats of the card with all its effects applied.
+
+        :return: stats.
+        """
+        return CardStats(
+            hp=self._state.hp,
+            ap=self._template.ap,
+            dp=self._template.dp,
+            cost=self._template.cost,
+        )
+
+    @property
+    def already_attacked(self) -> bool:
+        """
+        Getter for already_attacked.
+
+        :return: True if the card already attacked this turn.
+        """
+        return self._state.already_attacked
+
+    @already_attacked.setter
+    def already_attacked(self, already_attacked: bool) -> None:
+        """
+        Setter for already_attacked.
+
+        :param already_attacked: True if the card already attacked this turn.
+        """
+        self._state.already_attacked = already_attacked
 
     def is_alive(self) -> bool:
         """
@@ -250,4 +342,9 @@ class AbstractCharacterCard(AbstractCard, metaclass=abc.ABCMeta):
         logger.error(self.hp)
         logger.error(self.dp)
         if damage > self.dp:
-            self._hp -= damage - self.dp
+            self._state.hp -= damage - self.dp
+            self._invalidate_stats()
+
+    def _invalidate_stats(self) -> None:
+        """Invalidate the stats cached by the effects applied on the card."""
+        self._state.version += 1
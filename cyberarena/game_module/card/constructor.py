@@ -218,6 +218,7 @@ class ConstructorPlayableCharacterCard(ConstructorAbstract):
             ap=ap,
             dp=dp,
             description=description,
+            id_pic=self._card_index,
             rarity=rarity,
             race=race,
         )
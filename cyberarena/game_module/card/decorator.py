@@ -1,11 +1,20 @@
 import abc
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 
 from .base import AbstractCharacterCard
+from .template import CardStats
 
 
 class AbstractDecorator(AbstractCharacterCard, metaclass=abc.ABCMeta):
-    """class AbstractDecorator."""
+    """
+    class AbstractDecorator.
+
+    A decorator shares the template and the state of the card it decorates.
+    It caches the stats of the card with its effect applied, resolved
+    from the stats of the decorated card. The cache is resolved again only
+    when the version of the shared state changes, so reading a stat doesn't
+    walk the decorators whatever their number.
+    """
 
     @abc.abstractmethod
     def __init__(self, card: AbstractCharacterCard) -> None:
@@ -15,6 +24,10 @@ class AbstractDecorator(AbstractCharacterCard, metaclass=abc.ABCMeta):
         :param card: Card to decorate.
         """
         self._card: AbstractCharacterCard = card
+        self._template = card._template  # noqa: WPS437
+        self._state = card._state  # noqa: WPS437
+        self._stats: Optional[CardStats] = None
+        self._stats_version = -1
 
     @abc.abstractmethod
     def __repr__(self) -> str:
@@ -54,6 +67,18 @@ class AbstractDecorator(AbstractCharacterCard, metaclass=abc.ABCMeta):
         """
         return self._card.description
 
+    @property
+    def stats(self) -> CardStats:
+        """
+        Getter for the stats of the card with all its effects applied.
+
+        :return: stats.
+        """
+        if self._stats is None or self._stats_version != self._state.version:
+            self._stats = self._apply_effect(self._card.stats)
+            self._stats_version = self._state.version
+        return self._stats
+
     @property
     def hp(self) -> int:
         """
@@ -61,7 +86,7 @@ class AbstractDecorator(AbstractCharacterCard, metaclass=abc.ABCMeta):
 
         :return: hp.
         """
-        return self._card.hp
+        return self.stats.hp
 
     @property
     def ap(self) -> int:
@@ -70,7 +95,7 @@ class AbstractDecorator(AbstractCharacterCard, metaclass=abc.ABCMeta):
 
         :return: ap.
         """
-        return self._card.ap
+        return self.stats.ap
 
     @property
     def dp(self) -> int:
@@ -79,7 +104,7 @@ class AbstractDecorator(AbstractCharacterCard, metaclass=abc.ABCMeta):
 
         :return: dp.
         """
-        return self._card.dp
+        return self.stats.dp
 
     @property
     def cost(self) -> int:
@@ -88,7 +113,7 @@ class AbstractDecorator(AbstractCharacterCard, metaclass=abc.ABCMeta):
 
         :return: cost.
         """
-        return self._card.cost
+        return self.stats.cost
 
     @property
     def card(self) -> AbstractCharacterCard:
@@ -119,6 +144,15 @@ class AbstractDecorator(AbstractCharacterCard, metaclass=abc.ABCMeta):
         """
         return self._card.to_dict()
 
+    def _apply_effect(self, stats: CardStats) -> CardStats:
+        """
+        Apply the effect of the decorator.
+
+        :param stats: The stats of the decorated card.
+        :return: The stats with the effect applied.
+        """
+        return stats
+
     def _receive_damage(self, damage: int) -> None:  # pragma: no cover
         """
         Receive damage.
@@ -187,15 +221,6 @@ class DecoratorHealthBoost(AbstractDecorator):
             self._hp,
         )
 
-    @property
-    def hp(self) -> int:
-        """
-        Getter for hp.
-
-        :return: hp.
-        """
-        return self.card.hp + self._hp
-
     def refresh_card_reference(self) -> AbstractCharacterCard:
         """
         Return self or self._card if the boost have 0 hp.
@@ -216,6 +241,16 @@ class DecoratorHealthBoost(AbstractDecorator):
         if self._hp < 0:
             self.card._receive_damage(-self._hp)
             self._hp = 0
+        self._invalidate_stats()
+
+    def _apply_effect(self, stats: CardStats) -> CardStats:
+        """
+        Add the health boost.
+
+        :param stats: The stats of the decorated card.
+        :return: The stats with the effect applied.
+        """
+        return stats._replace(hp=stats.hp + self._hp)
 
 
 class DecoratorDefenseBoost(AbstractDecorator):
@@ -243,15 +278,6 @@ class DecoratorDefenseBoost(AbstractDecorator):
             self._dp,
         )
 
-    @property
-    def dp(self) -> int:
-        """
-        Getter for dp.
-
-        :return: dp.
-        """
-        return self._dp + self.card.dp
-
     def refresh_card_reference(self) -> AbstractCharacterCard:
         """
         Return self or self._card if the boost have 0 hp.
@@ -271,6 +297,15 @@ class DecoratorDefenseBoost(AbstractDecorator):
         if self._dp < damage:
             self.card._receive_damage(damage - self._dp)
 
+    def _apply_effect(self, stats: CardStats) -> CardStats:
+        """
+        Add the defense boost.
+
+        :param stats: The stats of the decorated card.
+        :return: The stats with the effect applied.
+        """
+        return stats._replace(dp=self._dp + stats.dp)
+
 
 class DecoratorTemporaryHitDefenseBoost(DecoratorDefenseBoost):
     """
@@ -289,6 +324,7 @@ class DecoratorTemporaryHitDefenseBoost(DecoratorDefenseBoost):
         self._dp -= damage
         if self._dp < 0:
             self._dp = 0
+        self._invalidate_stats()
         self.card._receive_damage(new_damage)
 
 
@@ -328,6 +364,7 @@ class DecoratorTemporaryTurnDefenseBoost(_AbstractTurnDecorator, DecoratorDefens
         super().end_turn()
         if self._turns == 0:
             self._dp = 0
+            self._invalidate_stats()
 
     def refresh_card_reference(self) -> AbstractCharacterCard:
         """
@@ -371,20 +408,12 @@ class DecoratorTemporaryTurnAttackBoost(_AbstractTurnDecorator):
             self._turns,
         )
 
-    @property
-    def ap(self) -> int:
-        """
-        Getter for ap.
-
-        :return: ap.
-        """
-        return self._ap + self.card.ap
-
     def end_turn(self) -> None:
         """End the turn."""
         super().end_turn()
         if self._turns <= 0:
             self._ap = 0
+            self._invalidate_stats()
 
     def refresh_card_reference(self) -> AbstractCharacterCard:
         """
@@ -396,6 +425,15 @@ class DecoratorTemporaryTurnAttackBoost(_AbstractTurnDecorator):
         """
         return self if self._ap > 0 else self.card
 
+    def _apply_effect(self, stats: CardStats) -> CardStats:
+        """
+        Add the attack boost.
+
+        :param stats: The stats of the decorated card.
+        :return: The stats with the effect applied.
+        """
+        return stats._replace(ap=self._ap + stats.ap)
+
 
 class DecoratorCostBoost(AbstractDecorator):
     """class DecoratorPriceBoost."""
@@ -424,15 +462,6 @@ class DecoratorCostBoost(AbstractDecorator):
             self._cost,
         )
 
-    @property
-    def cost(self) -> int:
-        """
-        Getter for price.
-
-        :return: price.
-        """
-        return max(0, self.card.cost - self._cost)
-
     def refresh_card_reference(self) -> AbstractCharacterCard:
         """
         Return self or self._card if the boost have 0 hp.
@@ -443,6 +472,15 @@ class DecoratorCostBoost(AbstractDecorator):
         """
         return self if self._cost > 0 else self.card
 
+    def _apply_effect(self, stats: CardStats) -> CardStats:
+        """
+        Reduce the price of the card.
+
+        :param stats: The stats of the decorated card.
+        :return: The stats with the effect applied.
+        """
+        return stats._replace(cost=max(0, stats.cost - self._cost))
+
 
 class DecoratorTemporaryTurnCostBoost(_AbstractTurnDecorator, DecoratorCostBoost):
     """class DecoratorTemporaryTurnCostBoost.
@@ -484,6 +522,7 @@ class DecoratorTemporaryTurnCostBoost(_AbstractTurnDecorator, DecoratorCostBoost
         super().end_turn()
         if self._turns <= 0:
             self._cost = 0
+            self._invalidate_stats()
 
     def refresh_card_reference(self) -> AbstractCharacterCard:
         """
@@ -1,14 +1,104 @@
+import gzip
+import hashlib
 import logging
 import os
 import typing
 
+import ujson
+
 from ..exceptions import LibraryCardNotFoundError, LibraryFileNotFoundError
-from .base import AbstractCard
+from ..settings import settings
+from .base import AbstractCard, AbstractCharacterCard
 from .factory import factory_card
 
+try:
+    import brotli  # noqa: WPS433
+except ImportError:  # pragma: no cover
+    HAS_BROTLI = False
+else:
+    HAS_BROTLI = True
+
 logger = logging.getLogger("cyberarena.game_module.card_validator")
 
 
+class JsonPayload(typing.NamedTuple):
+    """
+    JSON encoded data with the tag of its content.
+
+    The compressed contents are only built for the big payloads,
+    the brotli one only if the brotli package is installed.
+    """
+
+    content: bytes
+    etag: str
+    content_gzip: typing.Optional[bytes] = None
+    content_brotli: typing.Optional[bytes] = None
+
+
+def hash_content(content: bytes) -> str:
+    """
+    Hash encoded data to tag it.
+
+    :param content: The encoded data.
+    :return: The tag of the data.
+    """
+    return hashlib.sha256(content).hexdigest()[:32]
+
+
+def make_json_payload(
+    data: typing.Any,
+    compress: bool = False,
+    etag: typing.Optional[str] = None,
+) -> JsonPayload:
+    """
+    Encode data in JSON and tag it with the hash of the encoded content.
+
+    :param data: The data to encode.
+    :param compress: If True, compress the encoded data too.
+    :param etag: The tag of the data, if it is not the hash of the content.
+    :return: The encoded data and its tag.
+    """
+    content = ujson.dumps(
+        data,
+        ensure_ascii=False,
+        escape_forward_slashes=False,
+    ).encode()
+    etag = etag or hash_content(content)
+    if not compress:
+        return JsonPayload(content, etag)
+    return JsonPayload(
+        content,
+        etag,
+        content_gzip=gzip.compress(content, compresslevel=9, mtime=0),
+        content_brotli=brotli.compress(content) if HAS_BROTLI else None,
+    )
+
+
+def card_to_json_dict(
+    card_id: int,
+    card: AbstractCard,
+) -> typing.Dict[str, typing.Any]:
+    """
+    Return the data of a card of the library to serialize it.
+
+    :param card_id: The id of the card.
+    :param card: The card.
+    :return: The data of the card.
+    """
+    data: typing.Dict[str, typing.Any] = {
+        "id": card_id,
+        "name": card.name,
+        "description": card.description,
+        "cost": card.cost,
+        "rarity": card.rarity,
+    }
+    if isinstance(card, AbstractCharacterCard):
+        data["damage"] = card.ap
+        data["health"] = card.hp
+        data["defense"] = card.dp
+    return data
+
+
 class Library(object):
     """
     Store all cards in RAM.
@@ -78,8 +168,12 @@ class Library(object):
             raise LibraryFileNotFoundError(
                 f"The library path is not valid: '{path_name}'",
             )
+        self.__library_json: typing.Dict[int, JsonPayload] = {}
+        self.__catalogue_json = make_json_payload([])
+        self.__catalogue_with_images_json = make_json_payload({})
         self.__load_library()
         self.__verify_card_names()
+        self.__serialize_library()
 
     def __iter__(self) -> typing.Iterator[int]:
         """
@@ -152,6 +246,27 @@ class Library(object):
         """
         return self.__library.items()
 
+    def get_library_path(self) -> str:
+        """
+        Get the path the library was loaded from.
+
+        :return: The path of the library.
+        """
+        return self.__library_path
+
+    def create_card(self, card_id: int) -> AbstractCard:
+        """
+        Create a new instance of a card for a game.
+
+        The new instance shares the template of the card of the library,
+        only its state in the game is allocated.
+
+        :param card_id: The id of the card.
+        :return: A new instance of the card.
+        """
+        card = self[card_id]
+        return card.from_template(card.template)
+
     def get_img_path(self, card_id: int) -> str:
         """
         Return the path of the card image.
@@ -171,6 +286,59 @@ class Library(object):
             )
         return self.__library_card_path[card_id]
 
+    def get_data_path(self, card_id: int) -> str:
+        """
+        Return the path of the card data file.
+
+        :param card_id: The id of the card.
+        :return: The path of the card data file.
+        """
+        return os.path.join(
+            os.path.dirname(self.get_img_path(card_id)),
+            self.__default_filename,
+        )
+
+    def get_card_json(self, card_id: int) -> JsonPayload:
+        """
+        Return the data of a card encoded in JSON.
+
+        The cards of the library don't change once loaded,
+        so they are encoded only once, when the library is loaded.
+
+        :param card_id: The id of the card.
+        :raises LibraryCardNotFoundError: If the card is not in the library.
+        :return: The JSON of the card and its tag.
+        """
+        try:
+            return self.__library_json[card_id]
+        except KeyError:
+            logger.error(
+                "The card {0} is not in the library.".format(card_id),
+            )
+            raise LibraryCardNotFoundError(
+                f"The card {card_id} is not in the library.",
+            )
+
+    def get_catalogue_json(self) -> JsonPayload:
+        """
+        Return the data of all the cards encoded in JSON, ordered by id.
+
+        :return: The JSON of the cards and its tag.
+        """
+        return self.__catalogue_json
+
+    def get_catalogue_with_images_json(self) -> JsonPayload:
+        """
+        Return the versioned catalogue of the cards encoded in JSON.
+
+        It contains the data of all the cards with the URLs of their images.
+        Its version, which is also its tag, is the hash of the cards.
+        It is compressed when the library is loaded, it can be sent as is.
+
+        :return: The JSON of the catalogue, its tag and its compressed contents.
+        """
+        return self.__catalogue_with_images_json
+
     @classmethod
     def reset(cls) -> None:
         """Reset the library instance."""
@@ -267,3 +435,26 @@ class Library(object):
                     continue
                 self.__library[card_id] = card
                 self.__library_card_path[card_id] = card_img
+
+    def __serialize_library(self) -> None:
+        """Encode in JSON each card of the library and the whole catalogue."""
+        catalogue = []
+        for card_id in sorted(self.__library):
+            card_data = card_to_json_dict(card_id, self.__library[card_id])
+            self.__library_json[card_id] = make_json_payload(card_data)
+            catalogue.append(card_data)
+        self.__catalogue_json = make_json_payload(catalogue)
+        cards_with_images = [
+            dict(
+                card_data,
+                image=settings.card_image_url.format(card_data["id"]),
+                image_full=settings.card_image_full_url.format(card_data["id"]),
+            )
+            for card_data in catalogue
+        ]
+        version = make_json_payload(cards_with_images).etag
+        self.__catalogue_with_images_json = make_json_payload(
+            {"version": version, "cards": cards_with_images},
+            compress=True,
+            etag=version,
+        )
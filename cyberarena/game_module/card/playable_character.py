@@ -19,6 +19,8 @@ def from_dict(
 class PlayableCharacterCard(AbstractCharacterCard):
     """Card class."""
 
+    __slots__ = ()
+
     def __init__(  # noqa: WPS211
         self,
         name: str,
@@ -55,8 +57,17 @@ class PlayableCharacterCard(AbstractCharacterCard):
             cost=cost,
             rarity=rarity,
             race=race,
+            id_pic=id_pic,
         )
-        self.id_pic = id_pic
+
+    @property
+    def id_pic(self) -> int:
+        """
+        Getter for id_pic.
+
+        :return: id of the picture of the card.
+        """
+        return self._template.id_pic
 
     def __str__(self) -> str:
         """
@@ -0,0 +1,55 @@
+import typing
+
+from .enums import ObjectCardRace, ObjectCardRarity
+
+
+class CardTemplate(typing.NamedTuple):
+    """
+    Data of a card which doesn't change during a game.
+
+    A template can't be modified, so it is shared by all the instances of a card:
+    the card of the library and the cards of every game.
+    """
+
+    name: str
+    description: str = ""
+    cost: int = 0
+    rarity: ObjectCardRarity = ObjectCardRarity.COMMON
+    hp: int = 0
+    ap: int = 0
+    dp: int = 0
+    race: ObjectCardRace = ObjectCardRace.HUMAN
+    id_pic: int = -1
+
+
+class CardStats(typing.NamedTuple):
+    """Stats of a card with all its effects applied."""
+
+    hp: int
+    ap: int
+    dp: int
+    cost: int
+
+
+class CardState(object):
+    """
+    State of an instance of a card during a game.
+
+    The state is shared by the card and all the decorators applied on it.
+    Its version is increased each time the stats of the card or of one of
+    its effects change, so the stats cached by the decorators are resolved again.
+    """
+
+    __slots__ = ("id", "hp", "already_attacked", "version")
+
+    def __init__(self, card_id: int = -1, hp: int = 0) -> None:
+        """
+        Constructor for CardState.
+
+        :param card_id: Id of the instance of the card in the game.
+        :param hp: Current health points of the card.
+        """
+        self.id: int = card_id
+        self.hp: int = hp
+        self.already_attacked: bool = False
+        self.version: int = 0
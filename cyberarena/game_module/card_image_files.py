@@ -0,0 +1,91 @@
+"""
+Names of the files of the card images.
+
+They are used to find the card images without rendering them,
+so this module doesn't need Pillow.
+"""
+import json
+import os
+from typing import List, Tuple
+
+from .settings import CardImageFormat, CardImageSize
+
+
+def get_card_image_variant_filename(
+    filename: str,
+    size: CardImageSize = CardImageSize.FULL,
+    image_format: CardImageFormat = CardImageFormat.PNG,
+) -> str:
+    """
+    Get the filename of a variant of a card image.
+
+    The full size png variant is the card image itself, the others are
+    named after it, e.g. '0_static_thumb.webp' for '0_static.png'.
+
+    :param filename: The filename of the card image.
+    :param size: The size of the variant.
+    :param image_format: The format of the variant.
+    :return: The filename of the variant.
+    """
+    if size == CardImageSize.FULL and image_format == CardImageFormat.PNG:
+        return filename
+    root, _ = os.path.splitext(filename)
+    if size != CardImageSize.FULL:
+        root = "{0}_{1}".format(root, size.value)
+    return "{0}.{1}".format(root, image_format.value)
+
+
+def get_card_image_variants() -> List[Tuple[CardImageSize, CardImageFormat]]:
+    """
+    Get the sizes and formats of the variants of a card image.
+
+    :return: The size and format of each variant, the full size png first.
+    """
+    return [
+        (size, image_format)
+        for size in (CardImageSize.FULL, CardImageSize.MEDIUM, CardImageSize.THUMB)
+        for image_format in (CardImageFormat.PNG, CardImageFormat.WEBP)
+    ]
+
+
+def get_card_image_filenames(filename: str) -> List[str]:
+    """
+    Get the filenames of all the variants of a card image.
+
+    :param filename: The filename of the card image.
+    :return: The filenames of the variants, the card image first.
+    """
+    return [
+        get_card_image_variant_filename(filename, size, image_format)
+        for size, image_format in get_card_image_variants()
+    ]
+
+
+def is_card_atlas_up_to_date(
+    index_path: str,
+    card_ids: List[int],
+    max_size: int,
+) -> bool:
+    """
+    Check if an atlas was built with the cards and the size given.
+
+    :param index_path: The path of the index of the atlas.
+    :param card_ids: The ids of the cards which must be in the atlas.
+    :param max_size: The maximum width and height of a sheet.
+    :return: True if the index and all the sheets of the atlas exist
+        and are built from these cards with this size.
+    """
+    try:
+        with open(index_path, "r") as file:
+            index = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+        return False
+    if index.get("max_size") != max_size:
+        return False
+    if sorted(int(card_id) for card_id in index.get("cards", {})) != sorted(card_ids):
+        return False
+    folder = os.path.dirname(index_path)
+    return all(
+        os.path.exists(os.path.join(folder, sheet["filename"]))
+        for sheet in index.get("sheets", [])
+    )
@@ -1,28 +1,34 @@
-import json
 import os
 import random
-from fnmatch import fnmatch
 from typing import List, Optional
 
 from loguru import logger
 
-from .card import AbstractCard, PlayableCharacterCard
-from .card.playable_character import from_dict
+from .card import AbstractCard, LibraryCard, PlayableCharacterCard
+from .exceptions import LibraryPathError
 from .settings import settings
 
 
 class Deck(object):
     """Deck Class."""
 
-    def __init__(self, test: bool = False) -> None:
+    __slots__ = ("__deck", "__deckSize")
+
+    def __init__(
+        self,
+        test: bool = False,
+        rng: Optional[random.Random] = None,
+    ) -> None:
         """
         Constructor.
 
         :param test: True if it's a test, False otherwise.
+        :param rng: The random generator of the game, used to shuffle the deck.
         """
         self.__deck: List[AbstractCard] = []
         self.__deckSize = settings.deck_size
-        self.__init_deck(test)
+        # Not for security: shuffling is only seeded to replay a game
+        self.__init_deck(rng or random.Random(), test)  # noqa: S311
 
     def use_card(self, card: AbstractCard, mana: int, currid: int) -> AbstractCard:
         """
@@ -57,44 +63,34 @@ class Deck(object):
         """
         return len(self.__deck)
 
-    def __init_deck(self, test: bool = False) -> None:  # noqa: C901
+    def __init_deck(self, rng: random.Random, test: bool = False) -> None:
         """
         Initialize the deck.
 
+        The cards are copied from the library, so creating a deck
+        doesn't read any file.
+
+        :param rng: The random generator used to shuffle the deck.
         :param test: True if the deck is in test mode, False otherwise.
+        :raises LibraryPathError: If the library was loaded from another path
+            than settings.card_path.
         """
-        # Le chemin du répertoire contenant les fichiers json
-        path = settings.card_path
-
-        # Une liste vide pour stocker les données des fichiers json
-        data_list = []
-
-        # On parcourt tous les répertoires et sous-répertoires du chemin
-        for dirpath, _dirnames, filenames in os.walk(path):
-            # On parcourt tous les fichiers du répertoire courant
-            for file in filenames:
-                # On vérifie si le fichier se nomme data.json
-                if fnmatch(file, "data.json"):
-                    # On construit le chemin complet du fichier
-                    file_path = os.path.join(dirpath, file)
-                    # On ouvre le fichier en mode lecture
-                    with open(file_path) as f:
-                        # On charge le contenu du fichier comme un objet Python
-                        data = json.load(f)
-                        data = {k: v for k, v in data.items() if k != "card_type"}
-                        data = {
-                            k if k != "id" else "id_pic": v for k, v in data.items()
-                        }
-
-                        # On ajoute l'objet à la liste
-                        data_list.append(data)
-
-        # On affiche la liste des données récupérées
-        for i in range(0, 13):
-            card = from_dict(data_list[i])
-            self.__deck.append(card)
-            card2 = from_dict(data_list[i])
-            self.__deck.append(card2)
-        random.shuffle(self.__deck)
+        library = LibraryCard(
+            settings.card_path,
+            settings.card_data_filename,
+            settings.card_image_filename,
+        )
+        library_path = library.get_library_path()
+        if os.path.abspath(library_path) != os.path.abspath(settings.card_path):
+            raise LibraryPathError(
+                "The library is loaded from '{0}' instead of '{1}'".format(
+                    library_path,
+                    settings.card_path,
+                ),
+            )
+        for card_id in sorted(library.keys())[:13]:  # noqa: WPS432
+            self.__deck.append(library.create_card(card_id))
+            self.__deck.append(library.create_card(card_id))
+        rng.shuffle(self.__deck)
         logger.error("Deck size: ")
         logger.error(len(self.__deck))
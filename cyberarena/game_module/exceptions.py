@@ -16,3 +16,11 @@ class LibraryFileNotFoundError(LibraryError, FileNotFoundError):
 
 class LibraryCardNotFoundError(LibraryError, KeyError):
     """Exception for library for card not found."""
+
+
+class LibraryPathError(LibraryError):
+    """Exception for library loaded from another path than the expected one."""
+
+
+class CardImagesNotBuiltError(CyberArenaGameModuleError):
+    """Exception for card images missing when they must be prebuilt."""
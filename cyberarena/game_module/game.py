@@ -1,5 +1,7 @@
 import logging
-from typing import Dict, Optional, Union
+import random
+import secrets
+from typing import Any, Dict, Optional, Union
 
 from .board import Board
 from .card import AbstractCard, PlayableCharacterCard
@@ -7,15 +9,55 @@ from .player import Player
 
 logger = logging.getLogger("cyberarena.game_module")
 
+# Number of bits of the seed of a game
+SEED_BITS = 64
+
+
+def new_seed() -> int:
+    """
+    Draw a new seed for a game.
+
+    The seed doesn't come from the global random generator,
+    so seeding it doesn't make every game the same.
+
+    :return: The seed.
+    """
+    return secrets.randbits(SEED_BITS)
+
 
 class Game:
     """Game Class."""
 
-    def __init__(self, p1: Player, p2: Player) -> None:
+    __slots__ = (
+        "player1",
+        "player2",
+        "turn",
+        "__board",
+        "id",
+        "p1connected",
+        "p2connected",
+        "__seed",
+        "__rng",
+    )
+
+    def __init__(
+        self,
+        p1: Player,
+        p2: Player,
+        seed: int,
+        rng: random.Random,
+    ) -> None:
         """Constructor.
 
+        Everything random in the game uses ``rng``, so the game can be
+        replayed from its seed only if the players were created with
+        the same generator, as done by ``GameManager.create_game``.
+
         :param p1: Player 1.
         :param p2: Player 2.
+        :param seed: Seed of the game.
+        :param rng: The random generator created from the seed,
+            already used to shuffle the decks of the players.
         """
         self.player1 = p1
         self.player2 = p2
@@ -25,6 +67,26 @@ class Game:
         self.id = -1
         self.p1connected = False
         self.p2connected = False
+        self.__seed = seed
+        self.__rng = rng
+
+    @property
+    def seed(self) -> int:
+        """
+        Getter for the seed of the game.
+
+        :return: The seed.
+        """
+        return self.__seed
+
+    @property
+    def rng(self) -> random.Random:
+        """
+        Getter for the random generator of the game.
+
+        :return: The random generator.
+        """
+        return self.__rng
 
     def __contains__(self, id_player: int) -> bool:
         """
@@ -259,6 +321,33 @@ class Game:
         """
         return self.id
 
+    def get_state(self, player: Player) -> Dict[str, Any]:
+        """
+        Get the state of the game seen by a player.
+
+        It has everything a client needs to display the game,
+        e.g. when it missed some messages.
+
+        :param player: The player.
+        :return: The state of the game.
+        """
+        side, other_side = (1, 2) if player == self.player1 else (2, 1)
+        other = self.player2 if player == self.player1 else self.player1
+        turn_player = self.player1 if self.check_turn(self.player1) else self.player2
+        return {
+            "id_player": turn_player.id,
+            "mana": player.get_mana(),
+            "mana_max": player.mana_max_turn,
+            "myhealth": self.__board.get_nexus_health(side),
+            "ennemyhealth": self.__board.get_nexus_health(other_side),
+            "hand": [card.to_dict() for card in player.get_hand().get_hand()],
+            "ennemy_hand_size": len(other.get_hand()),
+            "board": [card.to_dict() for card in self.__board.get_cards(side)],
+            "ennemy_board": [
+                card.to_dict() for card in self.__board.get_cards(other_side)
+            ],
+        }
+
     def get_updated_card_stats(self, idcard: int) -> Dict[str, Union[str, int]]:
         """
         Get the updated card stats.
@@ -1,11 +1,12 @@
-from typing import Dict, List, Optional, Union
+import random
+from typing import Any, Dict, List, Optional, Union
 
 from loguru import logger
 
 from . import AbstractCard
 from .card import LibraryCard
 from .exceptions import GameNotFoundError
-from .game import Game
+from .game import Game, new_seed
 from .player import Player
 from .settings import settings
 
@@ -15,8 +16,9 @@ class GameManager:
 
     def __init__(self) -> None:
         """Constructor."""
-        self.__games: List[Game] = []
-        self.__players: List[Player] = []
+        self.__games: Dict[int, Game] = {}
+        # Index of the games played by each player, the last one is the most recent
+        self.__games_by_player: Dict[int, List[int]] = {}
         self.idgames = 0
 
     @staticmethod
@@ -28,25 +30,36 @@ class GameManager:
             settings.card_image_filename,
         )
 
-    def create_game(self, p1id: int, p2id: int, test: bool = False) -> Game:
+    def create_game(
+        self,
+        p1id: int,
+        p2id: int,
+        test: bool = False,
+        seed: Optional[int] = None,
+    ) -> Game:
         """
         Create a game.
 
         :param p1id: Player 1 id.
         :param p2id: Player 2 id.
         :param test: Test mode.
+        :param seed: Seed of the game to replay it, a new one is drawn if not given.
         :return: The game created.
         """
-        p1 = Player("", test)
-        p2 = Player("", test)
+        if seed is None:
+            seed = new_seed()
+        # Seeded on purpose: the same seed must replay the same game
+        rng = random.Random(seed)  # noqa: S311
+        p1 = Player("", test, rng)
+        p2 = Player("", test, rng)
         p1.id = p1id
         p2.id = p2id
-        self.__players.append(p1)
-        self.__players.append(p2)
-        game = Game(p1, p2)
+        game = Game(p1, p2, seed, rng)
         game.id = self.idgames
         self.idgames += 1
-        self.__games.append(game)
+        self.__games[game.id] = game
+        self.__games_by_player.setdefault(p1id, []).append(game.id)
+        self.__games_by_player.setdefault(p2id, []).append(game.id)
         return game
 
     def __contains__(self, id_game: int) -> bool:
@@ -57,10 +70,7 @@ class GameManager:
 
         :return: True if player is in the game, False otherwise.
         """
-        for game in self.__games:
-            if game.id == id_game:
-                return True
-        return False
+        return id_game in self.__games
 
     def __len__(self) -> int:
         """
@@ -78,10 +88,10 @@ class GameManager:
         :return: The game.
         :raises GameNotFoundError: If the game is not found.
         """
-        for game in self.__games:
-            if game.id == id_game:
-                return game
-        raise GameNotFoundError("Game not found")
+        try:
+            return self.__games[id_game]
+        except KeyError:
+            raise GameNotFoundError("Game not found")
 
     def get_game(self, id_game: int) -> Optional[Game]:
         """
@@ -102,11 +112,16 @@ class GameManager:
         :param id_game: Id of the game.
         :return: True if the game has been ended, False otherwise.
         """
-        for game in self.__games:
-            if game.id == id_game:
-                self.__games.remove(game)
-                return True
-        return False
+        game = self.__games.pop(id_game, None)
+        if game is None:
+            return False
+        for player_id in (game.player1.id, game.player2.id):
+            games_of_player = self.__games_by_player.get(player_id, [])
+            if id_game in games_of_player:
+                games_of_player.remove(id_game)
+            if not games_of_player:
+                self.__games_by_player.pop(player_id, None)
+        return True
 
     def find_game(self, id_game: int) -> Optional[Game]:
         """
@@ -115,10 +130,7 @@ class GameManager:
         :param id_game: Id of the game.
         :return: The game.
         """
-        for game in self.__games:
-            if game.id == id_game:
-                return game
-        return None
+        return self.__games.get(id_game)
 
     def find_player(self, id_player: int) -> int:
         """
@@ -127,11 +139,9 @@ class GameManager:
         :param id_player: Id of the player.
         :return: The id of the game current played.
         """
-        for game in reversed(self.__games):
-            if game.player1.id == id_player:
-                return game.id
-            if game.player2.id == id_player:
-                return game.id
+        games_of_player = self.__games_by_player.get(id_player)
+        if games_of_player:
+            return games_of_player[-1]
         return -1
 
     def draw_card(
@@ -326,5 +336,21 @@ class GameManager:
             return game.get_updated_card_stats(idcard)
         return {}
 
+    def get_game_state(self, idgame: int, idplayer: int) -> Dict[str, Any]:
+        """
+        Get the state of a game seen by a player.
+
+        :param idgame: Id of the game.
+        :param idplayer: Id of the player.
+        :return: The state of the game, empty if the player is not in the game.
+        """
+        game = self.find_game(idgame)
+        if game:
+            if game.player1.id == idplayer:
+                return game.get_state(game.player1)
+            if game.player2.id == idplayer:
+                return game.get_state(game.player2)
+        return {}
+
 
 game_manager = GameManager()
@@ -1,5 +1,6 @@
 import logging
-from typing import List, Optional
+import random
+from typing import Dict, List, Optional
 
 from .card import AbstractCard, PlayableCharacterCard
 from .deck import Deck
@@ -8,16 +9,27 @@ logger = logging.getLogger("cyberarena.game_module")
 
 
 class Hand:
-    """Hand Class."""
+    """
+    Hand Class.
 
-    def __init__(self, test: bool = False) -> None:
+    The cards are stored by id, in the order they were drawn.
+    """
+
+    __slots__ = ("__hand", "__Deck")
+
+    def __init__(
+        self,
+        test: bool = False,
+        rng: Optional[random.Random] = None,
+    ) -> None:
         """
         Constructor.
 
         :param test: True if it's a test, False otherwise.
+        :param rng: The random generator of the game.
         """
-        self.__hand: List[AbstractCard] = []
-        self.__Deck = Deck(test)
+        self.__hand: Dict[int, AbstractCard] = {}
+        self.__Deck = Deck(test, rng)
 
     def __len__(self) -> int:
         """
@@ -39,7 +51,7 @@ class Hand:
             card.id = idcard
             logger.debug(card.name)
             logger.debug(card.id)
-            self.__hand.append(card)
+            self.__hand[card.id] = card
         else:
             logger.debug("Deck is empty")
             return None
@@ -54,7 +66,7 @@ class Hand:
         :return: True if the card is used, False otherwise.
         """
         if card.cost <= mana:
-            self.__hand.remove(card)
+            del self.__hand[card.id]  # noqa: WPS420
             return card
         return PlayableCharacterCard("None", 0, 0, 0, 0)
 
@@ -66,9 +78,9 @@ class Hand:
         :param mana: mana of the player.
         :return: True if the card is used, False otherwise.
         """
-        card = self.__hand[index]
-        if self.__hand[index].cost <= mana:
-            self.__hand.remove(self.__hand[index])
+        card = self.get_hand()[index]
+        if card.cost <= mana:
+            del self.__hand[card.id]  # noqa: WPS420
             return card
         return PlayableCharacterCard("None", 0, 0, 0, 0)
 
@@ -81,13 +93,7 @@ class Hand:
         """
         logger.error("get_card_id")
         logger.error("size of hand = %d", len(self.__hand))
-        for card in self.__hand:
-            logger.error("card.id = %d", card.id)
-
-        for card in self.__hand:
-            if card.id == idcard:
-                return card
-        return None
+        return self.__hand.get(idcard)
 
     def cheat_add_card(self, card: AbstractCard, idcard: int) -> None:
         """
@@ -97,15 +103,15 @@ class Hand:
         :param idcard: ID of the card.
         """
         card.id = idcard
-        self.__hand.append(card)
+        self.__hand[idcard] = card
 
     def get_hand(self) -> List[AbstractCard]:
         """
         Get the hand.
 
-        :return: The hand.
+        :return: The cards of the hand, in the order they were drawn.
         """
-        return self.__hand
+        return list(self.__hand.values())
 
     def get_deck(self) -> Deck:
         """
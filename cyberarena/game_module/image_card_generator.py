@@ -1,86 +1,171 @@
 # pragma: no cover
 # flake8: noqa
+import json
 import logging
 import os
-from typing import List, Tuple, Union
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from weakref import WeakKeyDictionary
 
 from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
 from .card.base import AbstractCard, AbstractCharacterCard
 from .card.enums import ObjectCardRace, ObjectCardRarity
-from .settings import settings
+from .card_image_files import (
+    get_card_image_filenames,
+    get_card_image_variant_filename,
+    get_card_image_variants,
+    is_card_atlas_up_to_date,
+)
+from .settings import CardImageFormat, CardImageSize, settings
 
 logger = logging.getLogger("cyberarena.game_module.image_generator")
 
 
+class TextWidthCache(object):
+    """
+    Cache of the widths of the words written with a font.
+
+    The width of a line is the sum of the advances of its words and spaces,
+    plus the overhang of its last glyph, so the lines can be broken
+    without measuring them again and again.
+    """
+
+    def __init__(self, font: ImageFont.FreeTypeFont) -> None:
+        """
+        Constructor.
+
+        :param font: The font used to write the words.
+        """
+        self._font = font
+        self.space_advance: float = font.getlength(" ")
+        self._words: Dict[str, Tuple[float, float]] = {}
+
+    def get_word_widths(self, word: str) -> Tuple[float, float]:
+        """
+        Get the widths of a word written after a space.
+
+        :param word: The word.
+        :return: The advance of the word, to place the next one,
+            and its extent after the space, to know if it fits.
+        """
+        widths = self._words.get(word)
+        if widths is None:
+            widths = (
+                self._font.getlength(word),
+                self._font.getbbox(" " + word)[2] - self.space_advance,
+            )
+            self._words[word] = widths
+        return widths
+
+
+_text_width_caches: "WeakKeyDictionary[ImageFont.FreeTypeFont, TextWidthCache]" = (
+    WeakKeyDictionary()
+)
+
+
+def get_text_width_cache(font: ImageFont.FreeTypeFont) -> TextWidthCache:
+    """
+    Get the cache of the widths of the words written with a font.
+
+    :param font: The font.
+    :return: The cache of the font, created on first use.
+    """
+    cache = _text_width_caches.get(font)
+    if cache is None:
+        cache = TextWidthCache(font)
+        _text_width_caches[font] = cache
+    return cache
+
+
 def get_text_list_fit_width(
     text: Union[str, List[str]],
     width: int,
-    font: ImageFont.ImageFont,
+    font: ImageFont.FreeTypeFont,
 ) -> List[str]:
     """
     Get a list of text that fit the width.
 
     Each element of the list is a line of text that fit the width.
+    The lines are broken in a single pass over the words,
+    with the widths of the words cached for the font.
 
     :param text: The text to split.
     :param font: The font used to draw the text.
     :param width: The width of the text.
     :return: A list of text that fit the width.
     """
+    cache = get_text_width_cache(font)
+    paragraphs = text if isinstance(text, list) else [text]
     text_list = []
-    if isinstance(text, list):
-        for i, line in enumerate(text):
-            text_list.extend(get_text_list_fit_width(line, width, font))
-        return text_list
-    text = text.split("\n")
-    if len(text) > 1:
-        return get_text_list_fit_width(text, width, font)
-    text = text[0]
-    text_list.append("")
-    for word in text.split(" "):
-        if font.getsize(text_list[-1] + " " + word)[0] <= width:
-            text_list[-1] += " " + word
-        else:
-            text_list.append(word)
+    for paragraph in paragraphs:
+        for line in paragraph.split("\n"):
+            # The first line of a paragraph starts with a space
+            words = [""]
+            line_advance = 0.0
+            for word in line.split(" "):
+                advance, extent = cache.get_word_widths(word)
+                if line_advance + cache.space_advance + extent <= width:
+                    words.append(word)
+                    line_advance += cache.space_advance + advance
+                else:
+                    text_list.append(" ".join(words))
+                    words = [word]
+                    line_advance = advance
+            text_list.append(" ".join(words))
     return text_list
 
 
-def is_data_or_image_newer_than_builded_card(
-    data_filename: str,
-    image_filename: str,
-    builded_card_filename: str,
-) -> bool:
+class lazy_resource(object):  # noqa: N801
     """
-    Check if the data or the image is newer than the builded card.
+    Resource of the card images built on first use, then shared.
 
-    :param data_filename: The data filename.
-    :param image_filename: The image filename.
-    :param builded_card_filename: The builded card filename.
-    :return: True if the data or the image is newer than the builded card, False otherwise.
-    :raises FileNotFoundError: If the data or the image file is not found.
+    It decorates a function building the resource from the class.
+    The resource is built on the first access, from the class or an instance,
+    and then stored on the class in place of the decorator.
     """
-    if not os.path.exists(builded_card_filename):
-        logger.debug(
-            f"The builded card '{builded_card_filename}' does not exist. "
-            "The card will be builded.",
-        )
-        return True
-    try:
-        data_time = os.path.getmtime(data_filename)
-        image_time = os.path.getmtime(image_filename)
-        builded_card_time = os.path.getmtime(builded_card_filename)
-    except FileNotFoundError as error:
-        logger.error(error)
-        raise error
-    logger.debug(
-        f"Data time: {data_time}, image time: {image_time}, "
-        f"builded card time: {builded_card_time}"
-        "\n"
-        f"Data path: {data_filename}, image path: {image_filename}, "
-        f"builded card path: {builded_card_filename}",
-    )
-    return data_time > builded_card_time or image_time > builded_card_time
+
+    def __init__(self, build: Callable[[Any], Any]) -> None:
+        """
+        Constructor.
+
+        :param build: The function building the resource from the class.
+        """
+        self._build = build
+        self._name = build.__name__
+        self.__doc__ = build.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        """
+        Get the name of the resource in the class.
+
+        :param owner: The class of the resource.
+        :param name: The name of the resource.
+        """
+        self._name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        """
+        Build the resource and store it on the class.
+
+        :param instance: The instance the resource is got from, if any.
+        :param owner: The class the resource is got from.
+        :return: The resource.
+        """
+        value = self._build(owner)
+        setattr(owner, self._name, value)
+        return value
 
 
 class ImageCardGeneratorResources(object):
@@ -137,29 +222,8 @@ class ImageCardGeneratorResources(object):
     STAT_DIVIDER_VERTICAL_SHIFT = 35
     STAT_STROKE_WIDTH = 8
 
-    BASE_CARD_SHAPE = Image.new(
-        "RGBA",
-        (WIDTH, HEIGHT),
-        (255, 255, 255, 0),
-    )
-
-    MAIN_IMAGE_MASK = Image.new(
-        "RGBA",
-        (MAIN_IMAGE_WIDTH, MAIN_IMAGE_HEIGHT),
-        (255, 255, 255, 0),
-    )
-
-    NAME_BACKGROUND = Image.new(
-        "RGBA",
-        (NAME_WIDTH, NAME_HEIGHT),
-        (255, 255, 255, 0),
-    )
-
     FONT_PATH = settings.font_card_path
 
-    BIG_TEXT_FONT = ImageFont.truetype(FONT_PATH, TEXT_BIG_SIZE)
-    MEDIUM_TEXT_FONT = ImageFont.truetype(FONT_PATH, TEXT_NORMAL_SIZE)
-
     DESCRIPTION_POSITION = (
         int((WIDTH - MAIN_IMAGE_WIDTH) / 2),
         MAIN_IMAGE_POSITION_Y + MAIN_IMAGE_HEIGHT + 50 + STATS_HEIGHT + 50,
@@ -167,11 +231,6 @@ class ImageCardGeneratorResources(object):
 
     DESCRIPTION_WIDTH = MAIN_IMAGE_WIDTH
     DESCRIPTION_HEIGHT = 230
-    DESCRIPTION_BACKGROUND = Image.new(
-        "RGBA",
-        (DESCRIPTION_WIDTH, DESCRIPTION_HEIGHT),
-        (255, 255, 255, 0),
-    )
     DESCRIPTION_PADDING = 25
 
     DIAMOND_POSITION = (
@@ -180,11 +239,6 @@ class ImageCardGeneratorResources(object):
     )
     DIAMOND_GRAD = [(0, (255, 255, 255)), (0.5, (255, 204, 204)), (1, (255, 51, 51))]
     COST_SYMBOL_SIZE = 70
-    DIAMOND_COST_SYMBOL = Image.new(
-        "RGBA",
-        (COST_SYMBOL_SIZE, COST_SYMBOL_SIZE),
-        (255, 255, 255, 0),
-    )
 
     RARITY_SYMBOL_SIZE = 50
     RARITY_SYMBOL_BORDER_WIDTH = 2
@@ -194,143 +248,150 @@ class ImageCardGeneratorResources(object):
         HEIGHT - RARITY_SYMBOL_SIZE - 20,
     )
 
-    RARITY_SYMBOL_GOLD_HEXAGON = Image.new(
-        "RGBA",
-        (RARITY_SYMBOL_SIZE, RARITY_SYMBOL_SIZE),
-        (255, 255, 255, 0),
-    )
-    RARITY_SYMBOL_VIOLET_SQUARE = Image.new(
-        "RGBA",
-        (RARITY_SYMBOL_SIZE, RARITY_SYMBOL_SIZE),
-        (255, 255, 255, 0),
-    )
-    RARITY_SYMBOL_GREEN_TRIANGLE = Image.new(
-        "RGBA",
-        (RARITY_SYMBOL_SIZE, RARITY_SYMBOL_SIZE),
-        (255, 255, 255, 0),
-    )
-    RARITY_SYMBOL_GREY_CIRCLE = Image.new(
-        "RGBA",
-        (RARITY_SYMBOL_SIZE, RARITY_SYMBOL_SIZE),
-        (255, 255, 255, 0),
-    )
-
-    SYMBOL_BY_RARITY = {
-        ObjectCardRarity.COMMON: RARITY_SYMBOL_GREY_CIRCLE,
-        ObjectCardRarity.RARE: RARITY_SYMBOL_GREEN_TRIANGLE,
-        ObjectCardRarity.EPIC: RARITY_SYMBOL_VIOLET_SQUARE,
-        ObjectCardRarity.LEGENDARY: RARITY_SYMBOL_GOLD_HEXAGON,
-    }
-
-    def __init__(self) -> None:
-        """Init the ImageCardGeneratorResources class."""
-        self._output_folder: str = ""
-        image_base_rounded_corners_draw = ImageDraw.Draw(
-            self.BASE_CARD_SHAPE,
-        )
-        image_base_rounded_corners_draw.rounded_rectangle(
-            (0, 0, self.WIDTH, self.HEIGHT),
-            self.RADIUS_CORNER,
+    # The fonts and the images below are only built when a card is rendered
+    # for the first time, so importing the game module stays cheap.
+
+    @lazy_resource
+    def BIG_TEXT_FONT(cls) -> ImageFont.FreeTypeFont:
+        """Font of the big texts, like the name and the stats."""
+        return ImageFont.truetype(cls.FONT_PATH, cls.TEXT_BIG_SIZE)
+
+    @lazy_resource
+    def MEDIUM_TEXT_FONT(cls) -> ImageFont.FreeTypeFont:
+        """Font of the description."""
+        return ImageFont.truetype(cls.FONT_PATH, cls.TEXT_NORMAL_SIZE)
+
+    @lazy_resource
+    def BASE_CARD_SHAPE(cls) -> Image.Image:
+        """Mask of the card with its rounded corners."""
+        image = Image.new("RGBA", (cls.WIDTH, cls.HEIGHT), (255, 255, 255, 0))
+        ImageDraw.Draw(image).rounded_rectangle(
+            (0, 0, cls.WIDTH, cls.HEIGHT),
+            cls.RADIUS_CORNER,
             fill=(255, 255, 255, 255),
         )
+        return image
 
-        image_main_base_rounded_corners_draw = ImageDraw.Draw(
-            self.MAIN_IMAGE_MASK,
+    @lazy_resource
+    def MAIN_IMAGE_MASK(cls) -> Image.Image:
+        """Mask of the main image with its rounded corners."""
+        image = Image.new(
+            "RGBA",
+            (cls.MAIN_IMAGE_WIDTH, cls.MAIN_IMAGE_HEIGHT),
+            (255, 255, 255, 0),
         )
-        image_main_base_rounded_corners_draw.rounded_rectangle(
-            (
-                0,
-                0,
-                self.MAIN_IMAGE_WIDTH,
-                self.MAIN_IMAGE_HEIGHT,
-            ),
-            self.MAIN_IMAGE_RADIUS_CORNER,
+        ImageDraw.Draw(image).rounded_rectangle(
+            (0, 0, cls.MAIN_IMAGE_WIDTH, cls.MAIN_IMAGE_HEIGHT),
+            cls.MAIN_IMAGE_RADIUS_CORNER,
             fill=(255, 255, 255, 255),
         )
-
-        background_text_encart_draw = ImageDraw.Draw(
-            self.NAME_BACKGROUND,
-        )
-        background_text_encart_draw.rounded_rectangle(
-            (0, 0, self.NAME_WIDTH, self.NAME_HEIGHT),
-            self.MAIN_IMAGE_RADIUS_CORNER,
+        return image
+
+    @lazy_resource
+    def NAME_BACKGROUND(cls) -> Image.Image:
+        """Background of the name of the card."""
+        image = Image.new("RGBA", (cls.NAME_WIDTH, cls.NAME_HEIGHT), (255, 255, 255, 0))
+        ImageDraw.Draw(image).rounded_rectangle(
+            (0, 0, cls.NAME_WIDTH, cls.NAME_HEIGHT),
+            cls.MAIN_IMAGE_RADIUS_CORNER,
             fill=(0, 0, 0, 5),
         )
+        return image
 
-        background_description_encart_draw = ImageDraw.Draw(
-            self.DESCRIPTION_BACKGROUND,
+    @lazy_resource
+    def DESCRIPTION_BACKGROUND(cls) -> Image.Image:
+        """Background of the description of the card."""
+        image = Image.new(
+            "RGBA",
+            (cls.DESCRIPTION_WIDTH, cls.DESCRIPTION_HEIGHT),
+            (255, 255, 255, 0),
         )
-        background_description_encart_draw.rounded_rectangle(
-            (0, 0, self.DESCRIPTION_WIDTH, self.DESCRIPTION_HEIGHT),
-            self.MAIN_IMAGE_RADIUS_CORNER,
+        ImageDraw.Draw(image).rounded_rectangle(
+            (0, 0, cls.DESCRIPTION_WIDTH, cls.DESCRIPTION_HEIGHT),
+            cls.MAIN_IMAGE_RADIUS_CORNER,
             fill=(0, 0, 0, 50),
         )
+        return image
 
-        self.STATS_BACKGROUND = ImageCardGeneratorResources.generate_stats_background()
+    @lazy_resource
+    def STATS_BACKGROUND(cls) -> Image.Image:
+        """Background of the stats of the character cards."""
+        return cls.generate_stats_background()
 
-        # Draw the rarity symbols
-        draw = ImageDraw.Draw(self.RARITY_SYMBOL_GOLD_HEXAGON)
+    @lazy_resource
+    def RARITY_SYMBOL_GOLD_HEXAGON(cls) -> Image.Image:
+        """Symbol of the legendary cards."""
+        image = cls._new_symbol_image(cls.RARITY_SYMBOL_SIZE)
+        draw = ImageDraw.Draw(image)
         draw.polygon(
             (
-                (self.RARITY_SYMBOL_SIZE / 2, 0),
-                (self.RARITY_SYMBOL_SIZE, self.RARITY_SYMBOL_SIZE / 4),
-                (self.RARITY_SYMBOL_SIZE, self.RARITY_SYMBOL_SIZE * 3 / 4),
-                (self.RARITY_SYMBOL_SIZE / 2, self.RARITY_SYMBOL_SIZE),
-                (0, self.RARITY_SYMBOL_SIZE * 3 / 4),
-                (0, self.RARITY_SYMBOL_SIZE / 4),
+                (cls.RARITY_SYMBOL_SIZE / 2, 0),
+                (cls.RARITY_SYMBOL_SIZE, cls.RARITY_SYMBOL_SIZE / 4),
+                (cls.RARITY_SYMBOL_SIZE, cls.RARITY_SYMBOL_SIZE * 3 / 4),
+                (cls.RARITY_SYMBOL_SIZE / 2, cls.RARITY_SYMBOL_SIZE),
+                (0, cls.RARITY_SYMBOL_SIZE * 3 / 4),
+                (0, cls.RARITY_SYMBOL_SIZE / 4),
             ),
             fill=(255, 168, 18, 255),
         )
         draw.polygon(
             (
-                (self.RARITY_SYMBOL_SIZE / 2, 0),
-                (self.RARITY_SYMBOL_SIZE, self.RARITY_SYMBOL_SIZE / 4),
-                (self.RARITY_SYMBOL_SIZE, self.RARITY_SYMBOL_SIZE * 3 / 4),
-                (self.RARITY_SYMBOL_SIZE / 2, self.RARITY_SYMBOL_SIZE),
-                (0, self.RARITY_SYMBOL_SIZE * 3 / 4),
-                (0, self.RARITY_SYMBOL_SIZE / 4),
+                (cls.RARITY_SYMBOL_SIZE / 2, 0),
+                (cls.RARITY_SYMBOL_SIZE, cls.RARITY_SYMBOL_SIZE / 4),
+                (cls.RARITY_SYMBOL_SIZE, cls.RARITY_SYMBOL_SIZE * 3 / 4),
+                (cls.RARITY_SYMBOL_SIZE / 2, cls.RARITY_SYMBOL_SIZE),
+                (0, cls.RARITY_SYMBOL_SIZE * 3 / 4),
+                (0, cls.RARITY_SYMBOL_SIZE / 4),
             ),
-            outline=self.RARITY_SYMBOL_BORDER_COLOR,
-            width=self.RARITY_SYMBOL_BORDER_WIDTH,
+            outline=cls.RARITY_SYMBOL_BORDER_COLOR,
+            width=cls.RARITY_SYMBOL_BORDER_WIDTH,
         )
+        return image
 
-        draw = ImageDraw.Draw(self.RARITY_SYMBOL_VIOLET_SQUARE)
+    @lazy_resource
+    def RARITY_SYMBOL_VIOLET_SQUARE(cls) -> Image.Image:
+        """Symbol of the epic cards."""
+        image = cls._new_symbol_image(cls.RARITY_SYMBOL_SIZE)
+        draw = ImageDraw.Draw(image)
         draw.rectangle(
             (
-                self.RARITY_SYMBOL_BORDER_WIDTH,
-                self.RARITY_SYMBOL_BORDER_WIDTH,
-                self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH,
-                self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH,
+                cls.RARITY_SYMBOL_BORDER_WIDTH,
+                cls.RARITY_SYMBOL_BORDER_WIDTH,
+                cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH,
+                cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH,
             ),
             fill=(138, 43, 226, 255),
         )
         draw.rectangle(
             (
-                self.RARITY_SYMBOL_BORDER_WIDTH / 2,
-                self.RARITY_SYMBOL_BORDER_WIDTH / 2,
-                self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH / 2,
-                self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH / 2,
+                cls.RARITY_SYMBOL_BORDER_WIDTH / 2,
+                cls.RARITY_SYMBOL_BORDER_WIDTH / 2,
+                cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH / 2,
+                cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH / 2,
             ),
-            outline=self.RARITY_SYMBOL_BORDER_COLOR,
-            width=self.RARITY_SYMBOL_BORDER_WIDTH,
+            outline=cls.RARITY_SYMBOL_BORDER_COLOR,
+            width=cls.RARITY_SYMBOL_BORDER_WIDTH,
         )
+        return image
 
-        # draw equilateral triangle
-
-        draw = ImageDraw.Draw(self.RARITY_SYMBOL_GREEN_TRIANGLE)
+    @lazy_resource
+    def RARITY_SYMBOL_GREEN_TRIANGLE(cls) -> Image.Image:
+        """Symbol of the rare cards."""
+        image = cls._new_symbol_image(cls.RARITY_SYMBOL_SIZE)
+        draw = ImageDraw.Draw(image)
         draw.polygon(
             [
                 (
-                    self.RARITY_SYMBOL_BORDER_WIDTH,
-                    self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH,
+                    cls.RARITY_SYMBOL_BORDER_WIDTH,
+                    cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH,
                 ),
                 (
-                    self.RARITY_SYMBOL_SIZE / 2,
-                    self.RARITY_SYMBOL_SIZE * 0.134 + self.RARITY_SYMBOL_BORDER_WIDTH,
+                    cls.RARITY_SYMBOL_SIZE / 2,
+                    cls.RARITY_SYMBOL_SIZE * 0.134 + cls.RARITY_SYMBOL_BORDER_WIDTH,
                 ),
                 (
-                    self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH,
-                    self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH,
+                    cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH,
+                    cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH,
                 ),
             ],
             fill=(0, 128, 0, 255),
@@ -338,105 +399,157 @@ class ImageCardGeneratorResources(object):
         draw.polygon(
             [
                 (
-                    self.RARITY_SYMBOL_BORDER_WIDTH,
-                    self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH,
+                    cls.RARITY_SYMBOL_BORDER_WIDTH,
+                    cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH,
                 ),
                 (
-                    self.RARITY_SYMBOL_SIZE / 2,
-                    self.RARITY_SYMBOL_SIZE * 0.134 + self.RARITY_SYMBOL_BORDER_WIDTH,
+                    cls.RARITY_SYMBOL_SIZE / 2,
+                    cls.RARITY_SYMBOL_SIZE * 0.134 + cls.RARITY_SYMBOL_BORDER_WIDTH,
                 ),
                 (
-                    self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH,
-                    self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH,
+                    cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH,
+                    cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH,
                 ),
             ],
-            outline=self.RARITY_SYMBOL_BORDER_COLOR,
-            width=self.RARITY_SYMBOL_BORDER_WIDTH,
+            outline=cls.RARITY_SYMBOL_BORDER_COLOR,
+            width=cls.RARITY_SYMBOL_BORDER_WIDTH,
         )
+        return image
 
-        draw = ImageDraw.Draw(self.RARITY_SYMBOL_GREY_CIRCLE)
+    @lazy_resource
+    def RARITY_SYMBOL_GREY_CIRCLE(cls) -> Image.Image:
+        """Symbol of the common cards."""
+        image = cls._new_symbol_image(cls.RARITY_SYMBOL_SIZE)
+        draw = ImageDraw.Draw(image)
         draw.ellipse(
             (
-                self.RARITY_SYMBOL_BORDER_WIDTH,
-                self.RARITY_SYMBOL_BORDER_WIDTH,
-                self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH,
-                self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH,
+                cls.RARITY_SYMBOL_BORDER_WIDTH,
+                cls.RARITY_SYMBOL_BORDER_WIDTH,
+                cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH,
+                cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH,
             ),
             fill=(128, 128, 128, 255),
         )
         draw.ellipse(
             (
-                self.RARITY_SYMBOL_BORDER_WIDTH / 2,
-                self.RARITY_SYMBOL_BORDER_WIDTH / 2,
-                self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH / 2,
-                self.RARITY_SYMBOL_SIZE - self.RARITY_SYMBOL_BORDER_WIDTH / 2,
+                cls.RARITY_SYMBOL_BORDER_WIDTH / 2,
+                cls.RARITY_SYMBOL_BORDER_WIDTH / 2,
+                cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH / 2,
+                cls.RARITY_SYMBOL_SIZE - cls.RARITY_SYMBOL_BORDER_WIDTH / 2,
             ),
-            outline=self.RARITY_SYMBOL_BORDER_COLOR,
-            width=self.RARITY_SYMBOL_BORDER_WIDTH,
+            outline=cls.RARITY_SYMBOL_BORDER_COLOR,
+            width=cls.RARITY_SYMBOL_BORDER_WIDTH,
         )
-
-        draw = ImageDraw.Draw(self.DIAMOND_COST_SYMBOL)
+        return image
+
+    @lazy_resource
+    def SYMBOL_BY_RARITY(cls) -> Dict[ObjectCardRarity, Image.Image]:
+        """Symbol of each rarity."""
+        return {
+            ObjectCardRarity.COMMON: cls.RARITY_SYMBOL_GREY_CIRCLE,
+            ObjectCardRarity.RARE: cls.RARITY_SYMBOL_GREEN_TRIANGLE,
+            ObjectCardRarity.EPIC: cls.RARITY_SYMBOL_VIOLET_SQUARE,
+            ObjectCardRarity.LEGENDARY: cls.RARITY_SYMBOL_GOLD_HEXAGON,
+        }
+
+    @lazy_resource
+    def DIAMOND_COST_SYMBOL(cls) -> Image.Image:
+        """Symbol of the cost of the card."""
+        image = cls._new_symbol_image(cls.COST_SYMBOL_SIZE)
+        draw = ImageDraw.Draw(image)
         # fill color 1
         draw.polygon(
             (
-                (self.COST_SYMBOL_SIZE / 4, 0),
-                (0, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE / 5, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE / 3, 0),
+                (cls.COST_SYMBOL_SIZE / 4, 0),
+                (0, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE / 5, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE / 3, 0),
             ),
             fill=(255, 255, 255, 255),
         )
         # fill color 2
         draw.polygon(
             (
-                (self.COST_SYMBOL_SIZE / 5, self.COST_SYMBOL_SIZE / 3),
-                (0, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE / 2, self.COST_SYMBOL_SIZE),
-                (self.COST_SYMBOL_SIZE / 5, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE * 4 / 5, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE * 2 / 3, 0),
-                (self.COST_SYMBOL_SIZE / 3, 0),
-                (self.COST_SYMBOL_SIZE / 5, self.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE / 5, cls.COST_SYMBOL_SIZE / 3),
+                (0, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE / 2, cls.COST_SYMBOL_SIZE),
+                (cls.COST_SYMBOL_SIZE / 5, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE * 4 / 5, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE * 2 / 3, 0),
+                (cls.COST_SYMBOL_SIZE / 3, 0),
+                (cls.COST_SYMBOL_SIZE / 5, cls.COST_SYMBOL_SIZE / 3),
             ),
             fill=(1, 255, 255, 255),
         )
         # fill color 3
         draw.polygon(
             (
-                (self.COST_SYMBOL_SIZE * 4 / 5, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE * 2 / 3, 0),
-                (self.COST_SYMBOL_SIZE * 3 / 4, 0),
-                (self.COST_SYMBOL_SIZE, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE * 4 / 5, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE / 5, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE / 2, self.COST_SYMBOL_SIZE),
-                (self.COST_SYMBOL_SIZE * 4 / 5, self.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE * 4 / 5, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE * 2 / 3, 0),
+                (cls.COST_SYMBOL_SIZE * 3 / 4, 0),
+                (cls.COST_SYMBOL_SIZE, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE * 4 / 5, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE / 5, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE / 2, cls.COST_SYMBOL_SIZE),
+                (cls.COST_SYMBOL_SIZE * 4 / 5, cls.COST_SYMBOL_SIZE / 3),
             ),
             fill=(0, 192, 193, 255),
         )
         # fill color 4
         draw.polygon(
             (
-                (self.COST_SYMBOL_SIZE * 4 / 5, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE / 2, self.COST_SYMBOL_SIZE),
-                (self.COST_SYMBOL_SIZE, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE * 4 / 5, self.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE * 4 / 5, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE / 2, cls.COST_SYMBOL_SIZE),
+                (cls.COST_SYMBOL_SIZE, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE * 4 / 5, cls.COST_SYMBOL_SIZE / 3),
             ),
             fill=(0, 150, 149, 255),
         )
 
         draw.polygon(
             (
-                (self.COST_SYMBOL_SIZE / 2, self.COST_SYMBOL_SIZE),
-                (self.COST_SYMBOL_SIZE, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE * 3 / 4, 0),
-                (self.COST_SYMBOL_SIZE / 4, 0),
-                (0, self.COST_SYMBOL_SIZE / 3),
-                (self.COST_SYMBOL_SIZE / 2, self.COST_SYMBOL_SIZE),
+                (cls.COST_SYMBOL_SIZE / 2, cls.COST_SYMBOL_SIZE),
+                (cls.COST_SYMBOL_SIZE, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE * 3 / 4, 0),
+                (cls.COST_SYMBOL_SIZE / 4, 0),
+                (0, cls.COST_SYMBOL_SIZE / 3),
+                (cls.COST_SYMBOL_SIZE / 2, cls.COST_SYMBOL_SIZE),
             ),
-            outline=self.RARITY_SYMBOL_BORDER_COLOR,
-            width=self.RARITY_SYMBOL_BORDER_WIDTH,
+            outline=cls.RARITY_SYMBOL_BORDER_COLOR,
+            width=cls.RARITY_SYMBOL_BORDER_WIDTH,
         )
+        return image
+
+    def __init__(self) -> None:
+        """Init the ImageCardGeneratorResources class."""
+        self._output_folder: str = ""
+        self._backgrounds: Dict[ObjectCardRace, Image.Image] = {}
+        self.backgrounds_cache_hits = 0
+        self.backgrounds_cache_misses = 0
+
+    @classmethod
+    def preload(cls) -> None:
+        """
+        Build all the fonts and images shared by the cards.
+
+        Called before starting the processes rendering the cards, so they
+        inherit the resources instead of building them again.
+        Also used as initializer of the processes, for the platforms where
+        they don't inherit the memory of their parent.
+        """
+        for name, value in list(vars(cls).items()):
+            if isinstance(value, lazy_resource):
+                getattr(cls, name)
+
+    @classmethod
+    def _new_symbol_image(cls, size: int) -> Image.Image:
+        """
+        Create a transparent image to draw a symbol.
+
+        :param size: The width and height of the symbol.
+        :return: The image of the symbol.
+        """
+        return Image.new("RGBA", (size, size), (255, 255, 255, 0))
 
     @property
     def output_folder(self) -> str:
@@ -462,6 +575,76 @@ class ImageCardGeneratorResources(object):
 
         self._output_folder = output_folder
 
+    def get_background(self, race: ObjectCardRace) -> Image.Image:
+        """
+        Get the background of the cards of a race.
+
+        The background is the gradient of the race composited with the base shape
+        of the card. It is built on first use and then shared by all cards
+        of the same race, so it must be copied before drawing on it.
+
+        :param race: The race of the card.
+        :return: The background of the card.
+        """
+        if race in self._backgrounds:
+            self.backgrounds_cache_hits += 1
+            return self._backgrounds[race]
+        self.backgrounds_cache_misses += 1
+        gradient = self.generate_gradient_two_color(*self.COLORS_BY_RACE[race])
+        background = Image.composite(
+            gradient,
+            self.BASE_CARD_SHAPE,
+            self.BASE_CARD_SHAPE,
+        )
+        self._backgrounds[race] = background
+        return background
+
+    @classmethod
+    def generate_gradient_two_color(
+        cls,
+        start_color: Tuple[int, int, int],
+        end_color: Tuple[int, int, int],
+    ) -> Image.Image:
+        """
+        Generate a linear gradient with 2 colors.
+
+        Create a linear gradient with the first color at the top left
+        and the second color at the bottom right.
+
+        :param start_color: The start color of the gradient.
+        :param end_color: The end color of the gradient.
+        :return: The gradient image.
+        """
+        # The color only depends on x + y, so the whole gradient is a single row
+        # ramp of WIDTH + HEIGHT - 1 colors sheared on the diagonal.
+        size_sum = cls.HEIGHT + cls.WIDTH
+        ramp = Image.new("RGB", (size_sum - 1, 1))
+        ramp.putdata(
+            [
+                (
+                    start_color[0]
+                    + int((end_color[0] - start_color[0]) * (index / size_sum)),
+                    start_color[1]
+                    + int((end_color[1] - start_color[1]) * (index / size_sum)),
+                    start_color[2]
+                    + int((end_color[2] - start_color[2]) * (index / size_sum)),
+                )
+                for index in range(size_sum - 1)
+            ],
+        )
+        # Pixel (x, y) is sampled at its center, so it takes ramp[x + y]
+        gradient = ramp.transform(
+            (cls.WIDTH, cls.HEIGHT),
+            Image.AFFINE,
+            (1, 1, -0.5, 0, 0, 0),
+            resample=Image.NEAREST,
+        )
+        # A linear gradient is almost invariant under the blur, it only
+        # softens the edges of the card.
+        if settings.card_gradient_blur:
+            gradient = gradient.filter(ImageFilter.GaussianBlur(radius=100))
+        return gradient
+
     @classmethod
     def generate_stats_background(cls) -> Image.Image:
         """
@@ -628,6 +811,7 @@ class ImageCardGenerator(object):
             return
         path = os.path.join(ImageCardGenerator.resources.output_folder, filename)
         self._image.save(path)
+        save_card_image_variants(self._image, path)
         logger.info(f"Image saved at {path}")
 
     def save_image_with_values(self, filename: str) -> None:
@@ -653,6 +837,7 @@ class ImageCardGenerator(object):
         self._place_stats_value()  # Only place if it is a character card
         self._write_card_cost()
         self._image.save(path)
+        save_card_image_variants(self._image, path)
         self._image = base_image
         logger.info(f"Image with stats saved at {path}")
 
@@ -666,68 +851,15 @@ class ImageCardGenerator(object):
         It prepare the card with some effects.
         More over it round the corners of the card.
         """
-        # Create the background image of the card depending on the type of the card
-        image = self.resources.BASE_CARD_SHAPE.copy()
+        # The background only depends on the race of the card, it is shared
+        # between all cards of the same race.
+        race = ObjectCardRace.HUMAN
+        if isinstance(self._card, AbstractCharacterCard):
+            race = self._card.race
+        image = self.resources.get_background(race).copy()
         image_draw = ImageDraw.Draw(image)
-        # Generate the gradient background depending on the type of the card
-        gradient = self._generate_gradient()
-        # Blend the gradient image with the base image
-        image = Image.composite(gradient, image, image)
         return image, image_draw
 
-    def _generate_gradient(self) -> Image.Image:
-        """ "
-        Generate the gradient background of the card.
-
-        It generate a linear gradient with 2 colors depending on the type of the card.
-        :return: The background image with the gradient.
-        """
-        if isinstance(self._card, AbstractCharacterCard):
-            return self._generate_random_gradient_two_color(
-                *self.resources.COLORS_BY_RACE[self._card.race]  # type: ignore
-            )
-
-        return self._generate_random_gradient_two_color(*self.resources.HUMAN_COLORS)
-
-    def _generate_random_gradient_two_color(
-        self,
-        start_color: Tuple[int, int, int],
-        end_color: Tuple[int, int, int],
-    ) -> Image:
-        """
-        Generate a linear gradient with 2 colors.
-
-        Create a linear gradient with the first color at the top left
-        and the second color at the bottom right.
-
-        :param start_color: The start color of the gradient.
-        :param end_color: The end color of the gradient.
-        :return: The gradient image.
-        """
-        gradient = Image.new("RGB", (self.resources.WIDTH, self.resources.HEIGHT))
-        for x in range(self.resources.WIDTH):
-            for y in range(self.resources.HEIGHT):
-                color_nuance = (
-                    start_color[0]
-                    + int(
-                        (end_color[0] - start_color[0])
-                        * ((y + x) / (self.resources.HEIGHT + self.resources.WIDTH)),
-                    ),
-                    start_color[1]
-                    + int(
-                        (end_color[1] - start_color[1])
-                        * ((y + x) / (self.resources.HEIGHT + self.resources.WIDTH)),
-                    ),
-                    start_color[2]
-                    + int(
-                        (end_color[2] - start_color[2])
-                        * ((y + x) / (self.resources.HEIGHT + self.resources.WIDTH)),
-                    ),
-                )
-                gradient.putpixel((x, y), color_nuance)
-        gradient = gradient.filter(ImageFilter.GaussianBlur(radius=100))
-        return gradient
-
     def _place_main_image(self) -> None:
         """
         Place the main image of the card on the image.
@@ -980,3 +1112,209 @@ class ImageCardGenerator(object):
             stroke_width=self.resources.BIG_TEXT_STROKE_WIDTH,
             stroke_fill=self.resources.TEXT_STROKE_COLOR,
         )
+
+
+def get_card_image_width(size: CardImageSize) -> int:
+    """
+    Get the width of the card images of a size.
+
+    :param size: The size of the images.
+    :return: The width in pixels.
+    """
+    if size == CardImageSize.THUMB:
+        return settings.card_image_thumb_width
+    if size == CardImageSize.MEDIUM:
+        return settings.card_image_medium_width
+    return ImageCardGeneratorResources.WIDTH
+
+
+def save_card_image_variants(image: Image.Image, path: str) -> None:
+    """
+    Save the other size and format variants of a card image saved at path.
+
+    :param image: The card image at its full size.
+    :param path: The path where the card image is saved.
+    """
+    resized = {}
+    for size, image_format in get_card_image_variants()[1:]:
+        if size not in resized:
+            width = get_card_image_width(size)
+            resized[size] = image
+            if width != image.width:
+                resized[size] = image.resize(
+                    (width, round(image.height * width / image.width)),
+                    Image.LANCZOS,
+                )
+        resized[size].save(
+            get_card_image_variant_filename(path, size, image_format),
+            quality=settings.card_image_webp_quality,
+        )
+
+
+class CardImageTask(NamedTuple):
+    """All that is needed to render and save the images of a card."""
+
+    card_id: int
+    card: AbstractCard
+    image_path: str
+    output_folder: str
+    filename: str
+    filename_with_values: str
+
+
+class CardImageResult(NamedTuple):
+    """Result of the rendering of the images of a card."""
+
+    card_id: int
+    elapsed: float
+    background_reused: bool
+
+
+def get_generation_jobs(jobs: Optional[int] = None) -> int:
+    """
+    Get the number of processes used to generate the card images.
+
+    :param jobs: The number of processes asked, None to use all the CPUs.
+    :return: The number of processes to use, at least 1.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def render_card_images(task: CardImageTask) -> CardImageResult:
+    """
+    Render and save the images of a card.
+
+    It saves the image without values and the image with values of the card.
+    It is executed in the worker processes when generating in parallel,
+    so it must only rely on the task.
+
+    :param task: The card to render and where to save its images.
+    :return: The time spent to render the card.
+    """
+    start = time.perf_counter()
+    resources = ImageCardGenerator.resources
+    backgrounds_built = resources.backgrounds_cache_misses
+    resources.output_folder = task.output_folder
+    generator = ImageCardGenerator(task.card, task.image_path)
+    generator.generate_card()
+    generator.save_image(task.filename)
+    generator.save_image_with_values(task.filename_with_values)
+    return CardImageResult(
+        card_id=task.card_id,
+        elapsed=time.perf_counter() - start,
+        background_reused=resources.backgrounds_cache_misses == backgrounds_built,
+    )
+
+
+def render_cards_images(
+    tasks: List[CardImageTask],
+    jobs: int = 1,
+) -> Iterator[CardImageResult]:
+    """
+    Render and save the images of several cards.
+
+    With more than one job, the cards are rendered in a process pool.
+    The shared resources are built before starting the processes,
+    so they inherit them without pickling them.
+    The results are always given in the order of the tasks and the images
+    don't depend on the number of jobs.
+
+    :param tasks: The cards to render.
+    :param jobs: The number of processes to use.
+    :yield: The result of each task, in the order of the tasks.
+    """
+    if jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield render_card_images(task)
+        return
+    ImageCardGeneratorResources.preload()
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(tasks)),
+        initializer=ImageCardGeneratorResources.preload,
+    ) as executor:
+        yield from executor.map(render_card_images, tasks)
+
+
+def get_atlas_grid(max_size: int) -> Tuple[int, int]:
+    """
+    Get how many cards fit in a sheet of an atlas.
+
+    :param max_size: The maximum width and height of a sheet.
+    :return: The number of columns and rows of cards in a sheet, at least 1.
+    """
+    return (
+        max(1, max_size // ImageCardGeneratorResources.WIDTH),
+        max(1, max_size // ImageCardGeneratorResources.HEIGHT),
+    )
+
+
+def build_card_atlas(
+    images: Dict[int, str],
+    output_folder: str,
+    name: str,
+    max_size: int,
+) -> Dict[str, Any]:
+    """
+    Pack the images of the cards into the sheets of an atlas.
+
+    The cards are placed in a grid, ordered by id, in as many sheets
+    of at most max_size x max_size as needed.
+    The sheets are saved as '<name>_<sheet>.png' and the index of the atlas,
+    giving the sheet and the position of each card, as '<name>.json'.
+
+    :param images: The path of the image of each card, by card id.
+    :param output_folder: The folder where to save the atlas.
+    :param name: The name of the atlas.
+    :param max_size: The maximum width and height of a sheet.
+    :return: The index of the atlas.
+    """
+    width = ImageCardGeneratorResources.WIDTH
+    height = ImageCardGeneratorResources.HEIGHT
+    columns, rows = get_atlas_grid(max_size)
+    card_ids = sorted(images)
+    cards_per_sheet = columns * rows
+    index: Dict[str, Any] = {
+        "max_size": max_size,
+        "card_width": width,
+        "card_height": height,
+        "sheets": [],
+        "cards": {},
+    }
+    for sheet_nb, first in enumerate(range(0, len(card_ids), cards_per_sheet)):
+        sheet_ids = card_ids[first : first + cards_per_sheet]
+        sheet_columns = min(columns, len(sheet_ids))
+        sheet_rows = (len(sheet_ids) + columns - 1) // columns
+        sheet = Image.new(
+            "RGBA",
+            (sheet_columns * width, sheet_rows * height),
+            (0, 0, 0, 0),
+        )
+        for position, card_id in enumerate(sheet_ids):
+            x = (position % columns) * width
+            y = (position // columns) * height
+            with Image.open(images[card_id]) as card_image:
+                sheet.paste(card_image.convert("RGBA"), (x, y))
+            index["cards"][str(card_id)] = {
+                "sheet": sheet_nb,
+                "x": x,
+                "y": y,
+                "width": width,
+                "height": height,
+            }
+        filename = "{0}_{1}.png".format(name, sheet_nb)
+        sheet.save(os.path.join(output_folder, filename))
+        index["sheets"].append(
+            {"filename": filename, "width": sheet.width, "height": sheet.height},
+        )
+    with open(os.path.join(output_folder, "{0}.json".format(name)), "w") as file:
+        json.dump(index, file, indent=2)
+    logger.info(
+        "Atlas {0} built with {1} cards in {2} sheets".format(
+            name,
+            len(card_ids),
+            len(index["sheets"]),
+        ),
+    )
+    return index
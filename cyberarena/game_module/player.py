@@ -1,3 +1,4 @@
+import random
 from typing import Optional
 
 from loguru import logger
@@ -11,17 +12,33 @@ from .settings import settings
 class Player:
     """Player Class."""
 
-    id = -1
-
-    def __init__(self, name: str = "", test: bool = False) -> None:
+    __slots__ = (
+        "id",
+        "name",
+        "__hand",
+        "life",
+        "mana",
+        "mana_max_turn",
+        "mana_max",
+        "idcardcurr",
+    )
+
+    def __init__(
+        self,
+        name: str = "",
+        test: bool = False,
+        rng: Optional[random.Random] = None,
+    ) -> None:
         """
         Constructor.
 
         :param name: Name of the player.
         :param test: True if the game is in test mode, False otherwise.
+        :param rng: The random generator of the game.
         """
+        self.id = -1
         self.name = name
-        self.__hand = Hand(test)
+        self.__hand = Hand(test, rng)
         self.life = 20
         self.mana = settings.mana_initial
         self.mana_max_turn = settings.mana_initial
@@ -136,5 +153,5 @@ class Player:
 
     def display_hand(self) -> None:
         """Display the hand."""
-        for i in range(0, len(self.__hand)):
-            logger.error(self.__hand.get_hand()[i].to_dict())
+        for card in self.__hand.get_hand():
+            logger.error(card.to_dict())
@@ -1,6 +1,33 @@
+import enum
+from typing import Optional
+
 from pydantic import BaseSettings
 
 
+class CardImageMode(str, enum.Enum):  # noqa: WPS600
+    """How the card images are set up when the game module starts."""
+
+    # Generate the missing or outdated images, one process at a time
+    GENERATE = "generate"
+    # Only use images builded before, with 'python -m cyberarena.game_module build'
+    PREBUILT = "prebuilt"
+
+
+class CardImageSize(str, enum.Enum):  # noqa: WPS600
+    """Sizes of the card images, the full one is the size of the rendering."""
+
+    THUMB = "thumb"
+    MEDIUM = "medium"
+    FULL = "full"
+
+
+class CardImageFormat(str, enum.Enum):  # noqa: WPS600
+    """Formats of the card images."""
+
+    PNG = "png"
+    WEBP = "webp"
+
+
 class Settings(BaseSettings):
     """
     Application settings.
@@ -18,8 +45,22 @@ class Settings(BaseSettings):
     mana_increase_turn: int = 2
 
     card_image_path: str = "cyberarena/static/img/cards"
+    card_image_manifest_filename: str = "manifest.json"
+    card_image_lock_filename: str = ".lock"
+    card_image_mode: CardImageMode = CardImageMode.GENERATE
     static_image: str = "{0}_static.png"
     dynamic_image: str = "{0}_dynamic.png"
+    # Widths of the smaller variants of the card images
+    card_image_thumb_width: int = 184
+    card_image_medium_width: int = 367
+    card_image_webp_quality: int = 80
+    # Atlases packing the card images in sheets of at most max size pixels
+    static_atlas: str = "atlas_static"
+    dynamic_atlas: str = "atlas_dynamic"
+    card_atlas_max_size: int = 4096
+    # URLs of the card images given to the clients in the catalogue
+    card_image_url: str = "/api/game/card/{0}/image"
+    card_image_full_url: str = "/api/game/card/{0}/imagefull"
     card_path: str = "./cyberarena/data/cards"
     card_data_filename: str = "data.json"
     card_image_filename: str = "card.png"
@@ -27,6 +68,9 @@ class Settings(BaseSettings):
     font_card_path: str = "./cyberarena/data/fonts/Valorax-lg25V.otf"
     font_big_size: int = 36
     font_normal_size: int = 20
+    card_gradient_blur: bool = False
+    # Processes used to generate the card images, None to use all the CPUs
+    card_image_jobs: Optional[int] = None
 
     class Config:
         env_file = ".env"
@@ -1,13 +1,21 @@
+import logging
 import os
+from contextlib import contextmanager
+from typing import Iterator
 
+from .build_manifest import BuildManifest
 from .card import AbstractCard, LibraryCard
-from .card.library import Library
-from .deck import Deck
-from .image_card_generator import (
-    ImageCardGenerator,
-    is_data_or_image_newer_than_builded_card,
+from .card.library import JsonPayload, Library
+from .card_image_files import (
+    get_card_image_filenames,
+    get_card_image_variant_filename,
+    is_card_atlas_up_to_date,
 )
-from .settings import settings
+from .deck import Deck
+from .exceptions import CardImagesNotBuiltError
+from .settings import CardImageFormat, CardImageMode, CardImageSize, settings
+
+logger = logging.getLogger("cyberarena.game_module.image_generator")
 
 
 def get_card_from_id(id_card: int) -> AbstractCard:
@@ -22,22 +30,79 @@ def get_card_from_id(id_card: int) -> AbstractCard:
     return lib[id_card]
 
 
-def get_path_card_image(card_id: int, static: bool = False) -> str:
+def get_path_card_atlas(static: bool = False) -> str:
+    """
+    Get the path of the index of the atlas of the card images.
+
+    :param static: If True, return the atlas of the cards with static stats.
+    :return: The path of the index of the atlas.
+    """
+    name = settings.static_atlas if static else settings.dynamic_atlas
+    return os.path.join(settings.card_image_path, "{0}.json".format(name))
+
+
+def get_path_card_atlas_sheet(sheet: int, static: bool = False) -> str:
+    """
+    Get the path of a sheet of the atlas of the card images.
+
+    :param sheet: The number of the sheet.
+    :param static: If True, return the atlas of the cards with static stats.
+    :return: The path of the sheet.
+    """
+    name = settings.static_atlas if static else settings.dynamic_atlas
+    return os.path.join(settings.card_image_path, "{0}_{1}.png".format(name, sheet))
+
+
+def get_card_json(card_id: int) -> JsonPayload:
+    """
+    Get the data of a card encoded in JSON.
+
+    :param card_id: ID of the card.  # noqa: DAR003
+    :return: The JSON of the card and its tag.
+    :raise LibraryCardNotFoundError: If the card is not in the library.
+    """
+    return Library().get_card_json(card_id)
+
+
+def get_catalogue_json() -> JsonPayload:
+    """
+    Get the data of all the cards of the library encoded in JSON.
+
+    :return: The JSON of the cards and its tag.
+    """
+    return Library().get_catalogue_json()
+
+
+def get_catalogue_with_images_json() -> JsonPayload:
+    """
+    Get the versioned catalogue of the cards, with the URLs of their images.
+
+    :return: The JSON of the catalogue, its tag and its compressed contents.
+    """
+    return Library().get_catalogue_with_images_json()
+
+
+def get_path_card_image(
+    card_id: int,
+    static: bool = False,
+    size: CardImageSize = CardImageSize.FULL,
+    image_format: CardImageFormat = CardImageFormat.PNG,
+) -> str:
     """
     Get the path of the card image.
 
     :param card_id: ID of the card.
     :param static: If True, return the path of card with static stats.
+    :param size: The size of the image.
+    :param image_format: The format of the image.
     :return: The path of the card image.
     """
+    filename = settings.dynamic_image.format(card_id)
     if static:
-        return os.path.join(
-            settings.card_image_path,
-            settings.static_image.format(card_id),
-        )
+        filename = settings.static_image.format(card_id)
     return os.path.join(
         settings.card_image_path,
-        settings.dynamic_image.format(card_id),
+        get_card_image_variant_filename(filename, size, image_format),
     )
 
 
@@ -45,26 +110,31 @@ def update_card_image(card_id: int) -> None:
     """
     Update the image of a card.
 
+    The image is only builded again if the sources of the card changed.
+
     :param card_id: ID of the card.
     """
+    # Pillow is only imported when rendering
+    from .image_card_generator import ImageCardGenerator  # noqa: WPS433
+
     lib = Library()
-    card = get_card_from_id(card_id)
-    data_file_path = lib.get_img_path(card_id).replace(
-        settings.card_image_filename,
-        settings.card_data_filename,
-    )
-    builded_card_filename = os.path.join(
-        settings.card_image_path,
-        settings.static_image.format(card_id),
-    )
-    if is_data_or_image_newer_than_builded_card(  # noqa: WPS337
-        data_file_path,
+    manifest = BuildManifest(settings.card_image_path)
+    card_hash = manifest.card_hash(
+        lib.get_data_path(card_id),
         lib.get_img_path(card_id),
-        builded_card_filename,
-    ):
-        icg = ImageCardGenerator(card, lib.get_img_path(card_id))
-        icg.generate_card()
-        icg.save_image_with_values(settings.dynamic_image.format(card_id))
+    )
+    builded_filenames = get_card_image_filenames(
+        get_path_card_image(card_id),
+    ) + get_card_image_filenames(get_path_card_image(card_id, static=True))
+    if manifest.is_up_to_date(card_id, card_hash, builded_filenames):
+        return
+    icg = ImageCardGenerator(lib[card_id], lib.get_img_path(card_id))
+    icg.resources.output_folder = settings.card_image_path
+    icg.generate_card()
+    icg.save_image(settings.dynamic_image.format(card_id))
+    icg.save_image_with_values(settings.static_image.format(card_id))
+    manifest.update(card_id, card_hash)
+    manifest.save()
 
 
 def setup_library() -> None:
@@ -81,42 +151,172 @@ def setup_card_images() -> None:  # noqa: WPS210
     Set up the card images.
 
     It generates the card images from the card data.
+    Only the cards whose sources changed since the last build, according to
+    the build manifest, are generated again.
+    The cards are rendered in parallel with settings.card_image_jobs processes.
     """
+    # Pillow is only imported when rendering
+    from .image_card_generator import (  # noqa: WPS433
+        CardImageTask,
+        get_generation_jobs,
+        render_cards_images,
+    )
+
     if not os.path.exists(settings.card_image_path):
         os.makedirs(settings.card_image_path)
     lib = Library()
-    for card_id in Library().keys():
-        card = get_card_from_id(card_id)
-        data_file_path = lib.get_img_path(card_id).replace(
-            settings.card_image_filename,
-            settings.card_data_filename,
+    manifest = BuildManifest(settings.card_image_path)
+    tasks = []
+    cards_hash = {}
+    for card_id in sorted(lib.keys()):
+        cards_hash[card_id] = manifest.card_hash(
+            lib.get_data_path(card_id),
+            lib.get_img_path(card_id),
         )
-        builded_card_filename = os.path.join(
-            settings.card_image_path,
-            settings.static_image.format(card_id),
+        filename = settings.dynamic_image.format(card_id)
+        filename_with_values = settings.static_image.format(card_id)
+        is_up_to_date = manifest.is_up_to_date(
+            card_id,
+            cards_hash[card_id],
+            [
+                os.path.join(settings.card_image_path, variant)
+                for variant in (
+                    get_card_image_filenames(filename)
+                    + get_card_image_filenames(filename_with_values)
+                )
+            ],
         )
-        if os.path.exists(builded_card_filename):
+        if is_up_to_date:
             continue
-        icg = ImageCardGenerator(card, lib.get_img_path(card_id))
-        icg.resources.output_folder = settings.card_image_path
-        icg.generate_card()
-        if is_data_or_image_newer_than_builded_card(  # noqa: WPS337
-            data_file_path,
-            lib.get_img_path(card_id),
-            builded_card_filename,
-        ):
-            icg.save_image_with_values(settings.static_image.format(card_id))
-            icg.save_image(settings.dynamic_image.format(card_id))
+        tasks.append(
+            CardImageTask(
+                card_id=card_id,
+                card=lib[card_id],
+                image_path=lib.get_img_path(card_id),
+                output_folder=settings.card_image_path,
+                filename=filename,
+                filename_with_values=filename_with_values,
+            ),
+        )
+    jobs = get_generation_jobs(settings.card_image_jobs)
+    with manifest.recording():
+        for result in render_cards_images(tasks, jobs):
+            manifest.update(result.card_id, cards_hash[result.card_id])
+            logger.info(
+                "Card image {0} generated in {1:.2f}s".format(
+                    result.card_id,
+                    result.elapsed,
+                ),
+            )
+    setup_card_atlases(force=bool(tasks))
+
+
+def setup_card_atlases(force: bool = False) -> None:
+    """
+    Set up the atlases of the card images.
+
+    The atlases are built again if they are not built from the cards
+    of the library or if the images changed.
+
+    :param force: Build the atlases even if they look up to date.
+    """
+    # Pillow is only imported when rendering
+    from .image_card_generator import build_card_atlas  # noqa: WPS433
+
+    card_ids = sorted(Library().keys())
+    for static in (False, True):
+        index_path = get_path_card_atlas(static)
+        is_up_to_date = is_card_atlas_up_to_date(
+            index_path,
+            card_ids,
+            settings.card_atlas_max_size,
+        )
+        if is_up_to_date and not force:
+            continue
+        build_card_atlas(
+            {card_id: get_path_card_image(card_id, static) for card_id in card_ids},
+            settings.card_image_path,
+            settings.static_atlas if static else settings.dynamic_atlas,
+            settings.card_atlas_max_size,
+        )
+
+
+def check_card_images() -> None:
+    """
+    Check all the card images and their atlases are already built.
+
+    :raises CardImagesNotBuiltError: If an image of a card or an atlas is missing.
+    """
+    card_ids = sorted(Library().keys())
+    missing = [
+        filename
+        for card_id in card_ids
+        for filename in (
+            get_card_image_filenames(get_path_card_image(card_id))
+            + get_card_image_filenames(get_path_card_image(card_id, static=True))
+        )
+        if not os.path.exists(filename)
+    ]
+    missing.extend(
+        get_path_card_atlas(static)
+        for static in (False, True)
+        if not is_card_atlas_up_to_date(
+            get_path_card_atlas(static),
+            card_ids,
+            settings.card_atlas_max_size,
+        )
+    )
+    if missing:
+        raise CardImagesNotBuiltError(
+            "{0} card images are missing, build them with "
+            "'python -m cyberarena.game_module build': {1}".format(
+                len(missing),
+                ", ".join(missing),
+            ),
+        )
+
+
+@contextmanager
+def card_images_lock() -> Iterator[None]:
+    """
+    Lock the card images folder.
+
+    Only one process at a time can hold the lock, the others wait for it.
+    So when several workers start together, the first one generates the images
+    and the next ones find them up to date.
+
+    :yield: When the lock is held.
+    """
+    import fcntl  # noqa: WPS433
+
+    if not os.path.exists(settings.card_image_path):
+        os.makedirs(settings.card_image_path, exist_ok=True)
+    lock_path = os.path.join(
+        settings.card_image_path,
+        settings.card_image_lock_filename,
+    )
+    with open(lock_path, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
 
 def setup_game_module() -> None:
     """
     Initialize the game module.
 
-    It load the cards in the library and it generates cards images from it.
+    It load the cards in the library and set up the cards images from it.
+    Depending on settings.card_image_mode, the images are generated
+    or must have been built before.
     """
     setup_library()
-    setup_card_images()
+    if settings.card_image_mode == CardImageMode.PREBUILT:
+        check_card_images()
+        return
+    with card_images_lock():
+        setup_card_images()
 
 
 def create_deck() -> Deck:
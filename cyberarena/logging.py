@@ -3,7 +3,6 @@ import sys
 from typing import Any, Union
 
 from loguru import logger
-from opentelemetry.trace import INVALID_SPAN, INVALID_SPAN_CONTEXT, get_current_span
 
 from cyberarena.settings import settings
 
@@ -42,6 +41,29 @@ class InterceptHandler(logging.Handler):
         )
 
 
+def add_trace_information(record: dict[str, Any]) -> None:  # pragma: no cover
+    """
+    Adds the ids of the current span to the record.
+
+    Opentelemetry is only imported when it is enabled,
+    without it there is never a current span.
+
+    :param record: record information.
+    """
+    from opentelemetry.trace import (  # noqa: WPS433
+        INVALID_SPAN,
+        INVALID_SPAN_CONTEXT,
+        get_current_span,
+    )
+
+    span = get_current_span()
+    if span != INVALID_SPAN:
+        span_context = span.get_span_context()
+        if span_context != INVALID_SPAN_CONTEXT:
+            record["extra"]["span_id"] = format(span_context.span_id, "016x")
+            record["extra"]["trace_id"] = format(span_context.trace_id, "032x")
+
+
 def record_formatter(record: dict[str, Any]) -> str:  # pragma: no cover
     """
     Formats the record.
@@ -61,14 +83,10 @@ def record_formatter(record: dict[str, Any]) -> str:  # pragma: no cover
         "- <level>{message}</level>\n"
     )
 
-    span = get_current_span()
     record["extra"]["span_id"] = 0
     record["extra"]["trace_id"] = 0
-    if span != INVALID_SPAN:
-        span_context = span.get_span_context()
-        if span_context != INVALID_SPAN_CONTEXT:
-            record["extra"]["span_id"] = format(span_context.span_id, "016x")
-            record["extra"]["trace_id"] = format(span_context.trace_id, "032x")
+    if settings.opentelemetry_endpoint:
+        add_trace_information(record)
 
     if record["exception"]:
         log_format = f"{log_format}{{exception}}"
@@ -3,7 +3,7 @@ from pathlib import Path
 from tempfile import gettempdir
 from typing import Optional
 
-from pydantic import BaseSettings
+from pydantic import BaseSettings, PositiveInt
 from yarl import URL
 
 TEMP_DIR = Path(gettempdir())
@@ -20,6 +20,15 @@ class LogLevel(str, enum.Enum):  # noqa: WPS600
     FATAL = "FATAL"
 
 
+class WebsocketOverflowPolicy(str, enum.Enum):  # noqa: WPS600
+    """What to do when the queue of messages of a game websocket is full."""
+
+    # Drop the queued messages and send the state of the game instead
+    RESYNC = "resync"
+    # Close the websocket
+    DISCONNECT = "disconnect"
+
+
 class Settings(BaseSettings):
     """
     Application settings.
@@ -63,6 +72,14 @@ class Settings(BaseSettings):
 
     daily_coin_reward: int = 10
 
+    # Seconds the clients can cache the data of the cards
+    card_cache_max_age: int = 3600
+
+    # Messages waiting to be sent to a game websocket before its queue is full,
+    # it must be positive as a queue of size 0 would be unbounded
+    websocket_queue_size: PositiveInt = 64
+    websocket_overflow_policy: WebsocketOverflowPolicy = WebsocketOverflowPolicy.RESYNC
+
     @property
     def db_url(self) -> URL:
         """
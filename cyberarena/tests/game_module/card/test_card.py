@@ -47,3 +47,32 @@ async def test_card_negative_defense() -> None:
     """Test card."""
     with pytest.raises(ValueError):
         PlayableCharacterCard("Cyber-Heisenberg", 1, 1, 1, dp=-1)
+
+
+@pytest.mark.anyio
+async def test_card_from_template() -> None:
+    """Test the instances of a card share its template but not their state."""
+    card = PlayableCharacterCard("Cyber-Heisenberg", 1, 3, 2, dp=1, id_pic=4)
+    instance1 = card.from_template(card.template)
+    instance2 = card.from_template(card.template)
+    assert isinstance(instance1, PlayableCharacterCard)
+    assert instance1.template is card.template
+    assert instance2.template is card.template
+    instance1.id = 7
+    instance2.attack_card(instance1)
+    assert instance1.to_dict() == dict(card.to_dict(), id=7, health=2)
+    assert instance2.already_attacked
+    assert not instance1.already_attacked
+    assert not card.already_attacked
+    assert (card.id, card.hp) == (-1, 3)
+    assert instance2.id_pic == 4
+
+
+@pytest.mark.anyio
+async def test_card_template_immutable() -> None:
+    """Test the template of a card can't be modified."""
+    card = PlayableCharacterCard("Cyber-Heisenberg", 1, 1, 1)
+    with pytest.raises(AttributeError):
+        card.template.hp = 10
+    with pytest.raises(AttributeError):
+        card.ap = 10
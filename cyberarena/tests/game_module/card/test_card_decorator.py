@@ -1,7 +1,15 @@
 # flake8: noqa
+import random
+from typing import Callable, List
+
 import pytest
 
-from cyberarena.game_module.card import PlayableCharacterCard, boost
+from cyberarena.game_module.card import (
+    AbstractCharacterCard,
+    PlayableCharacterCard,
+    boost,
+)
+from cyberarena.game_module.card.template import CardStats
 
 
 @pytest.fixture
@@ -436,3 +444,93 @@ async def test_card_decorator_temporary_turn_cost_boost_end_turn(
     assert new_card.dp == 0
     assert new_card.is_alive() is True
     assert new_card.refresh_card_reference() == default_card
+
+
+######################################################################
+#                 TESTS CARD DECORATOR CACHED STATS                  #
+######################################################################
+
+
+def chain_stats(card: AbstractCharacterCard) -> CardStats:
+    """Resolve the stats of a card by walking all its decorators."""
+    if not isinstance(card, boost.AbstractDecorator):
+        return CardStats(card.hp, card.ap, card.dp, card.cost)
+    stats = chain_stats(card.card)
+    if isinstance(card, boost.DecoratorHealthBoost):
+        return stats._replace(hp=stats.hp + card._hp)
+    if isinstance(card, boost.DecoratorDefenseBoost):
+        return stats._replace(dp=stats.dp + card._dp)
+    if isinstance(card, boost.DecoratorTemporaryTurnAttackBoost):
+        return stats._replace(ap=stats.ap + card._ap)
+    if isinstance(card, boost.DecoratorCostBoost):
+        return stats._replace(cost=max(0, stats.cost - card._cost))
+    return stats
+
+
+DECORATORS: List[
+    Callable[[AbstractCharacterCard, random.Random], AbstractCharacterCard]
+] = [
+    lambda card, rng: boost.DecoratorHealthBoost(card, rng.randint(0, 5)),
+    lambda card, rng: boost.DecoratorDefenseBoost(card, rng.randint(0, 3)),
+    lambda card, rng: boost.DecoratorTemporaryHitDefenseBoost(card, rng.randint(0, 5)),
+    lambda card, rng: boost.DecoratorTemporaryTurnDefenseBoost(
+        card, rng.randint(0, 5), rng.randint(1, 3)
+    ),
+    lambda card, rng: boost.DecoratorTemporaryTurnAttackBoost(
+        card, rng.randint(0, 5), rng.randint(1, 3)
+    ),
+    lambda card, rng: boost.DecoratorCostBoost(card, rng.randint(0, 2)),
+    lambda card, rng: boost.DecoratorTemporaryTurnCostBoost(
+        card, rng.randint(0, 3), rng.randint(1, 3)
+    ),
+]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("seed", range(20))
+async def test_card_decorator_cached_stats_same_as_chain(seed: int) -> None:
+    """Test the cached stats are the stats resolved by walking the decorators."""
+    rng = random.Random(seed)
+    card: AbstractCharacterCard = PlayableCharacterCard("Cyber-Heisenberg", 4, 50, 2)
+    for _ in range(40):
+        action = rng.randrange(4)
+        if action == 0:
+            card = rng.choice(DECORATORS)(card, rng)
+        elif action == 1:
+            attacker = PlayableCharacterCard("Attacker", 1, 100, rng.randint(0, 6))
+            attacker.attack_card(card)
+        elif action == 2:
+            card.end_turn()
+        elif isinstance(card, boost.AbstractDecorator):
+            card = card.refresh_card_reference()
+        assert card.stats == chain_stats(card)
+        assert (card.hp, card.ap, card.dp, card.cost) == chain_stats(card)
+
+
+@pytest.mark.anyio
+async def test_card_decorator_cached_stats_not_resolved_again(
+    default_card: PlayableCharacterCard,
+) -> None:
+    """Test the stats of stacked decorators are only resolved after a change."""
+    card: AbstractCharacterCard = default_card
+    for _ in range(100):
+        card = boost.DecoratorTemporaryTurnAttackBoost(card, 1, 1)
+    stats = card.stats
+    assert stats.ap == 101
+    assert card.stats is stats
+    card.end_turn()
+    assert card.stats is not stats
+    assert card.stats == chain_stats(card)
+
+
+@pytest.mark.anyio
+async def test_card_decorator_shares_state(
+    default_card: PlayableCharacterCard,
+) -> None:
+    """Test a decorator has the id and the state of the card it decorates."""
+    default_card.id = 3
+    new_card = boost.DecoratorHealthBoost(default_card, 10)
+    assert new_card.id == 3
+    assert new_card.name == default_card.name
+    new_card.already_attacked = True
+    assert default_card.already_attacked
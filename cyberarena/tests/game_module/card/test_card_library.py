@@ -1,9 +1,11 @@
 # flake8: noqa
+import gzip
 import json
 import os
 import shutil
 from typing import Any, Dict
 
+import brotli
 import pytest
 
 from cyberarena.game_module.card import LibraryCard
@@ -162,3 +164,71 @@ async def test_get_image_path_not_exist() -> None:
 
 
 # TODO: make test (ex: if type is not written, file not exist etc.)
+
+
+@pytest.mark.anyio
+async def test_get_card_json() -> None:
+    library = LibraryCard(CARD_PATH)
+    payload = library.get_card_json(0)
+    assert json.loads(payload.content) == {
+        "id": 0,
+        "name": "Cyber-Heisenberg",
+        "description": "A long description for the lore... #NotImplemented",
+        "cost": 10,
+        "rarity": "legendary",
+        "damage": 13,
+        "health": 11,
+        "defense": 12,
+    }
+    assert library.get_card_json(0) is payload
+
+
+@pytest.mark.anyio
+async def test_get_card_json_not_exist() -> None:
+    library = LibraryCard(CARD_PATH)
+    with pytest.raises(LibraryCardNotFoundError):
+        library.get_card_json(1)
+
+
+@pytest.mark.anyio
+async def test_get_catalogue_json() -> None:
+    library = LibraryCard(CARD_PATH)
+    catalogue = json.loads(library.get_catalogue_json().content)
+    assert catalogue == [json.loads(library.get_card_json(0).content)]
+
+
+@pytest.mark.anyio
+async def test_json_etag_changes_with_content(
+    second_test_card: Dict[str, Any],
+) -> None:
+    library = LibraryCard(CARD_PATH)
+    etag = library.get_catalogue_json().etag
+    LibraryCard.reset()
+    second_test_card["id"] = 1
+    second_test_card["name"] = "Cyber-Pinkman"
+    with open(os.path.join(CARD_PATH, "ihiesenberg", "data.json"), "w") as file:
+        json.dump(second_test_card, file)
+    library = LibraryCard(CARD_PATH)
+    assert library.get_card_json(0).etag != library.get_card_json(1).etag
+    assert library.get_catalogue_json().etag != etag
+
+
+@pytest.mark.anyio
+async def test_get_catalogue_with_images_json() -> None:
+    library = LibraryCard(CARD_PATH)
+    payload = library.get_catalogue_with_images_json()
+    catalogue = json.loads(payload.content)
+    assert catalogue["version"] == payload.etag
+    assert len(catalogue["cards"]) == 1
+    card = catalogue["cards"][0]
+    assert card["image"] == "/api/game/card/0/image"
+    assert card["image_full"] == "/api/game/card/0/imagefull"
+    del card["image"], card["image_full"]
+    assert card == json.loads(library.get_card_json(0).content)
+
+
+@pytest.mark.anyio
+async def test_get_catalogue_with_images_json_compressed() -> None:
+    payload = LibraryCard(CARD_PATH).get_catalogue_with_images_json()
+    assert gzip.decompress(payload.content_gzip) == payload.content
+    assert brotli.decompress(payload.content_brotli) == payload.content
@@ -1,5 +1,6 @@
 # flake8: noqa
 import pytest
+from pytest import MonkeyPatch
 
 from cyberarena.game_module.board import Board
 from cyberarena.game_module.card.playable_character import PlayableCharacterCard
@@ -32,3 +33,79 @@ async def test_board_deploy_card_side2() -> None:
     board.deploy_card(card, 2)
     assert board.get_board_size() == 1
     assert board.get_card_debug(2, 0) == card
+
+
+def new_card(card_id: int, hp: int = 1, ap: int = 1) -> PlayableCharacterCard:
+    card = PlayableCharacterCard("Cyber-Heisenberg", 1, hp, ap, 0, "test")
+    card.id = card_id
+    return card
+
+
+@pytest.mark.anyio
+async def test_board_get_card_id() -> None:
+    """Test the cards are found by id on their side only."""
+    board = Board()
+    card1, card2 = new_card(0), new_card(100)
+    board.deploy_card(card1, 1)
+    board.deploy_card(card2, 2)
+    assert board.get_card_id(1, 0) is card1
+    assert board.get_card_id(2, 100) is card2
+    assert board.get_card_id(2, 0) is None
+    assert board.get_updated_card_stats(100) == card2.to_dict()
+    assert board.get_updated_card_stats(1) == {}
+
+
+@pytest.mark.anyio
+async def test_board_deploy_card_twice() -> None:
+    """Test a card already on the board is not deployed again."""
+    board = Board()
+    card = new_card(0)
+    board.deploy_card(card, 1)
+    board.deploy_card(card, 2)
+    assert board.get_board_size() == 1
+    assert board.get_card_id(2, 0) is None
+
+
+@pytest.mark.anyio
+async def test_board_attack_card_removes_dead_cards() -> None:
+    """Test the dead cards are removed from the board and its index."""
+    board = Board()
+    first, attacker, defender = new_card(0), new_card(1, hp=5, ap=3), new_card(100)
+    for card in (first, attacker):
+        board.deploy_card(card, 1)
+    board.deploy_card(defender, 2)
+    board.attack_card(attacker, defender, 2)
+    assert board.get_card_id(2, 100) is None
+    assert board.get_updated_card_stats(100) == {}
+    assert board.get_card_debug(1, 1) is attacker
+    assert board.get_card_debug(2, 0) is None
+    board.deploy_card(new_card(100), 2)
+    assert board.get_board_size() == 3
+
+
+@pytest.mark.anyio
+async def test_board_attack_nexus() -> None:
+    """Test a card attacks the nexus once a turn."""
+    board = Board()
+    board.deploy_card(new_card(0, ap=3), 1)
+    board.attack_nexus(0, 2)
+    board.attack_nexus(0, 2)
+    assert board.get_nexus_health(2) == settings.nexus_health - 3
+    board.attack_nexus(100, 1)
+    assert board.get_nexus_health(1) == settings.nexus_health
+    board.end_turn(2)
+    board.attack_nexus(0, 2)
+    assert board.get_nexus_health(2) == settings.nexus_health - 6
+
+
+@pytest.mark.anyio
+async def test_board_large(monkeypatch: MonkeyPatch) -> None:
+    """Test a large board keeps the order of the cards and finds them by id."""
+    monkeypatch.setattr(settings, "board_size", 10_000)
+    board = Board()
+    for card_id in range(10_000):
+        board.deploy_card(new_card(card_id), 1)
+    board.deploy_card(new_card(10_000), 1)
+    assert board.get_board_size() == 10_000
+    assert board.get_card_debug(1, 9_999).id == 9_999
+    assert board.get_card_id(1, 5_000).id == 5_000
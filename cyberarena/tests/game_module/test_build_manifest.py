@@ -0,0 +1,165 @@
+# flake8: noqa
+import json
+import os
+import shutil
+from typing import Any
+
+import pytest
+
+from cyberarena.game_module.build_manifest import GENERATOR_VERSION, BuildManifest
+
+CARD_PATH = os.path.join("cyberarena", "tests_data", "cards", "hiesenberg")
+
+
+@pytest.fixture
+def card_folder(tmpdir: Any) -> str:
+    folder = os.path.join(tmpdir, "card")
+    shutil.copytree(CARD_PATH, folder)
+    return folder
+
+
+@pytest.fixture
+def builded_image(tmpdir: Any) -> str:
+    filename = os.path.join(tmpdir, "0.png")
+    with open(filename, "wb") as file:
+        file.write(b"image")
+    return filename
+
+
+def card_hash(manifest: BuildManifest, card_folder: str) -> str:
+    return manifest.card_hash(
+        os.path.join(card_folder, "data.json"),
+        os.path.join(card_folder, "card.png"),
+    )
+
+
+######################################################################
+#                       TESTS BUILD MANIFEST                         #
+######################################################################
+
+
+@pytest.mark.anyio
+async def test_manifest_empty_card_not_up_to_date(
+    tmpdir: Any,
+    card_folder: str,
+    builded_image: str,
+) -> None:
+    """Test a card never builded must be builded."""
+    manifest = BuildManifest(tmpdir)
+    assert not manifest.is_up_to_date(
+        0, card_hash(manifest, card_folder), [builded_image]
+    )
+
+
+@pytest.mark.anyio
+async def test_manifest_saved_card_up_to_date(
+    tmpdir: Any,
+    card_folder: str,
+    builded_image: str,
+) -> None:
+    """Test a builded card is up to date after reloading the manifest."""
+    manifest = BuildManifest(tmpdir)
+    manifest.update(0, card_hash(manifest, card_folder))
+    manifest.save()
+    manifest = BuildManifest(tmpdir)
+    assert manifest.is_up_to_date(0, card_hash(manifest, card_folder), [builded_image])
+
+
+@pytest.mark.anyio
+async def test_manifest_ignore_modification_time(
+    tmpdir: Any,
+    card_folder: str,
+    builded_image: str,
+) -> None:
+    """Test touching the sources of a card doesn't build it again."""
+    manifest = BuildManifest(tmpdir)
+    manifest.update(0, card_hash(manifest, card_folder))
+    os.utime(os.path.join(card_folder, "data.json"))
+    assert manifest.is_up_to_date(0, card_hash(manifest, card_folder), [builded_image])
+
+
+@pytest.mark.anyio
+async def test_manifest_data_changed(
+    tmpdir: Any,
+    card_folder: str,
+    builded_image: str,
+) -> None:
+    """Test a card whose data changed must be builded again."""
+    manifest = BuildManifest(tmpdir)
+    manifest.update(0, card_hash(manifest, card_folder))
+    data_filename = os.path.join(card_folder, "data.json")
+    with open(data_filename, "r") as file:
+        data = json.load(file)
+    data["hp"] += 1
+    with open(data_filename, "w") as file:
+        json.dump(data, file)
+    assert not manifest.is_up_to_date(
+        0, card_hash(manifest, card_folder), [builded_image]
+    )
+
+
+@pytest.mark.anyio
+async def test_manifest_builded_image_missing(
+    tmpdir: Any,
+    card_folder: str,
+    builded_image: str,
+) -> None:
+    """Test a card whose image was removed must be builded again."""
+    manifest = BuildManifest(tmpdir)
+    manifest.update(0, card_hash(manifest, card_folder))
+    os.remove(builded_image)
+    assert not manifest.is_up_to_date(
+        0, card_hash(manifest, card_folder), [builded_image]
+    )
+
+
+@pytest.mark.anyio
+async def test_manifest_other_generator_version(
+    tmpdir: Any,
+    card_folder: str,
+    builded_image: str,
+) -> None:
+    """Test the cards builded by another version of the generator are builded again."""
+    manifest = BuildManifest(tmpdir)
+    current_hash = card_hash(manifest, card_folder)
+    with open(manifest.path, "w") as file:
+        json.dump(
+            {"version": GENERATOR_VERSION - 1, "cards": {"0": current_hash}}, file
+        )
+    manifest = BuildManifest(tmpdir)
+    assert not manifest.is_up_to_date(0, current_hash, [builded_image])
+
+
+@pytest.mark.anyio
+async def test_manifest_invalid_file(tmpdir: Any) -> None:
+    """Test an invalid manifest is considered empty."""
+    with open(os.path.join(tmpdir, "manifest.json"), "w") as file:
+        file.write("{invalid")
+    manifest = BuildManifest(tmpdir)
+    assert not manifest.is_up_to_date(0, "hash", [])
+
+
+@pytest.mark.anyio
+async def test_manifest_recording_saved_on_error(
+    tmpdir: Any,
+    card_folder: str,
+    builded_image: str,
+) -> None:
+    """Test the cards recorded before an error are saved."""
+    manifest = BuildManifest(tmpdir)
+    current_hash = card_hash(manifest, card_folder)
+    with pytest.raises(RuntimeError):
+        with manifest.recording():
+            manifest.update(0, current_hash)
+            raise RuntimeError("render failed")
+    manifest = BuildManifest(tmpdir)
+    assert manifest.is_up_to_date(0, current_hash, [builded_image])
+
+
+@pytest.mark.anyio
+async def test_manifest_recording_nothing_not_saved(tmpdir: Any) -> None:
+    """Test the manifest is not written when no card was recorded."""
+    manifest = BuildManifest(tmpdir)
+    with manifest.recording():
+        pass
+    assert not os.path.exists(manifest.path)
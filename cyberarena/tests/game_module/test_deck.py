@@ -1,10 +1,23 @@
+# flake8: noqa
+import builtins
+import os
+from typing import Any
+
+import pytest
 from loguru import logger
+from pytest import MonkeyPatch
 
 from cyberarena.game_module.card import LibraryCard
 from cyberarena.game_module.deck import Deck
+from cyberarena.game_module.exceptions import LibraryPathError
 from cyberarena.game_module.settings import settings
 
 
+@pytest.fixture(autouse=True)
+def library(card_library: LibraryCard) -> LibraryCard:
+    return card_library
+
+
 def test_verify_creation_with_library() -> None:
     """Test verify creation with library."""
     LibraryCard(
@@ -17,3 +30,53 @@ def test_verify_creation_with_library() -> None:
         card = deck.get_random_card()
         assert card is not None
         logger.error(card.to_dict())
+
+
+@pytest.mark.anyio
+async def test_deck_without_file(monkeypatch: MonkeyPatch) -> None:
+    """Test a deck is created from the library without reading any file."""
+    LibraryCard(
+        settings.card_path,
+        settings.card_data_filename,
+        settings.card_image_filename,
+    )
+
+    def fail(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("A file is read to create a deck")
+
+    monkeypatch.setattr(builtins, "open", fail)
+    monkeypatch.setattr(os, "walk", fail)
+    monkeypatch.setattr(os, "listdir", fail)
+    assert len(Deck()) == 26
+
+
+@pytest.mark.anyio
+async def test_deck_cards_are_copies() -> None:
+    """Test the cards of a deck are new instances of the cards of the library."""
+    library = LibraryCard(
+        settings.card_path,
+        settings.card_data_filename,
+        settings.card_image_filename,
+    )
+    deck = Deck()
+    cards = [deck.get_random_card() for _ in range(len(deck))]
+    templates = list(library.values())
+    for card in cards:
+        assert card is not None
+        assert all(card is not template for template in templates)
+        assert card.name == library[card.id_pic].name
+    card = cards[0]
+    card.id = 42
+    card.already_attacked = True
+    template = library[card.id_pic]
+    assert template.id == -1
+    assert not template.already_attacked
+
+
+@pytest.mark.anyio
+async def test_deck_library_loaded_from_other_path() -> None:
+    """Test a deck is not built from a library of another path."""
+    LibraryCard.reset()
+    LibraryCard(os.path.join("cyberarena", "tests_data", "cards"))
+    with pytest.raises(LibraryPathError):
+        Deck()
@@ -1,8 +1,14 @@
 # flake8: noqa
+import random
+import timeit
+from typing import List
+
 import pytest
+from loguru import logger
 
 from cyberarena.game_module.card import LibraryCard
 from cyberarena.game_module.deck import Deck
+from cyberarena.game_module.game import Game
 from cyberarena.game_module.game_manager import GameManager
 from cyberarena.game_module.settings import settings
 
@@ -13,6 +19,11 @@ LibraryCard(
 )
 
 
+@pytest.fixture(autouse=True)
+def library(card_library: LibraryCard) -> LibraryCard:
+    return card_library
+
+
 @pytest.mark.anyio
 async def test_game_manager() -> None:
     """Test game manager."""
@@ -118,3 +129,144 @@ async def test_game_manager_find_player_multiple_games() -> None:
     assert game_manager.find_player(2) == 0
     assert game_manager.find_player(3) == 1
     assert game_manager.find_player(4) == 1
+
+
+@pytest.mark.anyio
+async def test_game_manager_find_player_after_end_game() -> None:
+    """Tests if the player index is kept consistent when a game ends."""
+    game_manager = GameManager()
+    game1 = game_manager.create_game(1, 2)
+    game2 = game_manager.create_game(1, 3)
+    assert game_manager.find_player(1) == game2.id
+    assert game_manager.end_game(game2.id)
+    assert game_manager.find_player(1) == game1.id
+    assert game_manager.find_player(3) == -1
+    assert game_manager.end_game(game1.id)
+    assert game_manager.find_player(1) == -1
+    assert game_manager.find_player(2) == -1
+    assert len(game_manager) == 0
+
+
+@pytest.mark.parametrize(
+    "games_amount",
+    [
+        1000,
+        pytest.param(10000, marks=pytest.mark.slow),
+        pytest.param(100000, marks=pytest.mark.slow),
+    ],
+)
+def test_game_manager_lookup_benchmark(games_amount: int) -> None:
+    """
+    Benchmark the lookups of the websocket hot path with many games.
+
+    The timings are only logged, asserting on them would make the test
+    depend on the machine load.
+    """
+
+    def lookup_time(game_manager: GameManager) -> float:
+        return min(
+            timeit.repeat(
+                lambda: (
+                    game_manager.find_game(0),
+                    game_manager.find_player(0),
+                    0 in game_manager,
+                ),
+                number=1000,
+                repeat=5,
+            ),
+        )
+
+    small_manager = GameManager()
+    for index in range(10):
+        small_manager.create_game(index * 2, index * 2 + 1)
+    big_manager = GameManager()
+    for index in range(games_amount):
+        big_manager.create_game(index * 2, index * 2 + 1)
+    small = lookup_time(small_manager)
+    big = lookup_time(big_manager)
+    logger.info(
+        f"Lookup time for 10 games: {small}s, for {games_amount} games: {big}s",
+    )
+    last_game = big_manager.find_game(games_amount - 1)
+    assert last_game is not None
+    assert big_manager.find_player(games_amount * 2 - 1) == last_game.id
+    assert len(big_manager) == games_amount
+
+
+######################################################################
+#                       TESTS GAME SEED                              #
+######################################################################
+
+
+def get_deck_names(game: Game) -> List[List[str]]:
+    decks = []
+    for player in (game.player1, game.player2):
+        deck = player.debug_get_deck()
+        decks.append([deck.get_random_card().name for _ in range(len(deck))])
+    return decks
+
+
+@pytest.mark.anyio
+async def test_game_manager_same_seed_same_game() -> None:
+    """Test two games created with the same seed are the same."""
+    game_manager = GameManager()
+    game1 = game_manager.create_game(1, 2, seed=42)
+    game2 = game_manager.create_game(3, 4, seed=42)
+    assert game1.seed == game2.seed == 42
+    assert game1.rng.random() == game2.rng.random()
+    assert get_deck_names(game1) == get_deck_names(game2)
+
+
+@pytest.mark.anyio
+async def test_game_manager_seed_stored() -> None:
+    """Test a game created without seed can be replayed from its seed."""
+    game_manager = GameManager()
+    game = game_manager.create_game(1, 2)
+    replay = game_manager.create_game(3, 4, seed=game.seed)
+    assert get_deck_names(game) == get_deck_names(replay)
+    other_game = game_manager.create_game(5, 6, seed=game.seed + 1)
+    assert get_deck_names(game) != get_deck_names(other_game)
+
+
+@pytest.mark.anyio
+async def test_game_seed_independent_of_global_random() -> None:
+    """Test the games don't use the global random generator."""
+    random.seed(0)
+    game_manager = GameManager()
+    game1 = game_manager.create_game(1, 2)
+    random.seed(0)
+    game2 = game_manager.create_game(3, 4)
+    assert game1.seed != game2.seed
+    random.seed(0)
+    state = random.getstate()
+    game_manager.create_game(5, 6, seed=7)
+    assert random.getstate() == state
+
+
+######################################################################
+#                       TESTS GAME STATE                             #
+######################################################################
+
+
+@pytest.mark.anyio
+async def test_game_manager_get_game_state() -> None:
+    """Test the state of a game seen by each player."""
+    game_manager = GameManager()
+    game = game_manager.create_game(1, 2, seed=42)
+    for _ in range(3):
+        game.draw_card(game.player1, force=True)
+    game.draw_card(game.player2, force=True)
+    state = game_manager.get_game_state(game.id, 1)
+    assert state["id_player"] == game_manager.get_turn(game.id)
+    assert state["mana"] == game_manager.get_mana(game.id, 1)
+    assert state["mana_max"] == game_manager.get_mana_max(game.id, 1)
+    assert state["myhealth"] == game_manager.get_nexus_health(game.id, 1)
+    assert state["ennemyhealth"] == game_manager.get_nexus_health(game.id, 1, True)
+    assert [card["id"] for card in state["hand"]] == [
+        card.id for card in game.player1.get_hand().get_hand()
+    ]
+    assert state["ennemy_hand_size"] == 1
+    assert state["board"] == state["ennemy_board"] == []
+    assert len(game_manager.get_game_state(game.id, 2)["hand"]) == 1
+    assert game_manager.get_game_state(game.id, 3) == {}
+    assert game_manager.get_game_state(game.id + 1, 1) == {}
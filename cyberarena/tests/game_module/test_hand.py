@@ -1 +1,32 @@
 # flake8: noqa
+import pytest
+
+from cyberarena.game_module.card.playable_character import PlayableCharacterCard
+from cyberarena.game_module.hand import Hand
+
+
+@pytest.mark.anyio
+async def test_hand_get_card_id() -> None:
+    """Test the cards drawn are found by id and kept in the order drawn."""
+    hand = Hand()
+    cards = [hand.get_random_card(card_id) for card_id in (3, 1, 2)]
+    assert hand.get_hand() == cards
+    for card in cards:
+        assert hand.get_card_id(card.id) is card
+    assert hand.get_card_id(0) is None
+
+
+@pytest.mark.anyio
+async def test_hand_use_card() -> None:
+    """Test a card used is removed from the hand, the others keep their order."""
+    hand = Hand()
+    for card_id in range(3):
+        hand.cheat_add_card(PlayableCharacterCard("Card", 1, 1, 1), card_id)
+    card = hand.get_card_id(1)
+    assert hand.use_card(card, 0).name == "None"
+    assert len(hand) == 3
+    assert hand.use_card(card, 1) is card
+    assert hand.get_card_id(1) is None
+    assert [card.id for card in hand.get_hand()] == [0, 2]
+    assert hand.use_card_debug(1, 1).id == 2
+    assert [card.id for card in hand.get_hand()] == [0]
@@ -0,0 +1,345 @@
+# flake8: noqa
+import json
+import os
+import timeit
+from typing import Any, List, Tuple, Union
+
+import pytest
+from loguru import logger
+from PIL import Image, ImageChops, ImageFilter, ImageFont, ImageStat
+from pytest import MonkeyPatch
+
+from cyberarena.game_module.card import PlayableCharacterCard
+from cyberarena.game_module.card.enums import ObjectCardRace
+from cyberarena.game_module.image_card_generator import (
+    CardImageTask,
+    ImageCardGenerator,
+    ImageCardGeneratorResources,
+    build_card_atlas,
+    get_card_image_filenames,
+    get_card_image_variant_filename,
+    get_text_list_fit_width,
+    get_text_width_cache,
+    is_card_atlas_up_to_date,
+    render_cards_images,
+)
+from cyberarena.game_module.settings import CardImageFormat, CardImageSize, settings
+
+CARD_IMAGE_PATH = os.path.join(
+    "cyberarena", "tests_data", "cards", "hiesenberg", "card.png"
+)
+
+
+@pytest.fixture
+def generator() -> ImageCardGenerator:
+    card = PlayableCharacterCard("Cyber-Heisenberg", 1, 1, 1, 0, "test")
+    return ImageCardGenerator(card, CARD_IMAGE_PATH)
+
+
+def legacy_gradient(
+    start_color: Tuple[int, int, int],
+    end_color: Tuple[int, int, int],
+) -> Image.Image:
+    """Gradient as it was built pixel by pixel before being vectorized."""
+    width = ImageCardGeneratorResources.WIDTH
+    height = ImageCardGeneratorResources.HEIGHT
+    gradient = Image.new("RGB", (width, height))
+    for x in range(width):
+        for y in range(height):
+            gradient.putpixel(
+                (x, y),
+                tuple(
+                    start_color[i]
+                    + int(
+                        (end_color[i] - start_color[i]) * ((y + x) / (height + width))
+                    )
+                    for i in range(3)
+                ),
+            )
+    return gradient.filter(ImageFilter.GaussianBlur(radius=100))
+
+
+def legacy_text_list_fit_width(
+    text: Union[str, List[str]],
+    width: int,
+    font: ImageFont.FreeTypeFont,
+) -> List[str]:
+    """Text wrapping as it was done by measuring the whole line for each word."""
+    text_list = []
+    if isinstance(text, list):
+        for line in text:
+            text_list.extend(legacy_text_list_fit_width(line, width, font))
+        return text_list
+    text = text.split("\n")
+    if len(text) > 1:
+        return legacy_text_list_fit_width(text, width, font)
+    text = text[0]
+    text_list.append("")
+    for word in text.split(" "):
+        if font.getsize(text_list[-1] + " " + word)[0] <= width:
+            text_list[-1] += " " + word
+        else:
+            text_list.append(word)
+    return text_list
+
+
+def get_descriptions() -> List[str]:
+    """Get the descriptions of the real cards."""
+    descriptions = []
+    for folder in sorted(os.listdir(settings.card_path)):
+        filename = os.path.join(settings.card_path, folder, settings.card_data_filename)
+        if os.path.isfile(filename):
+            with open(filename, "r") as file:
+                descriptions.append(json.load(file).get("description", ""))
+    return descriptions
+
+
+DESCRIPTION_WIDTH = (
+    ImageCardGeneratorResources.DESCRIPTION_WIDTH
+    - 2 * ImageCardGeneratorResources.DESCRIPTION_PADDING
+)
+
+
+######################################################################
+#                    TESTS IMAGE CARD GENERATOR                      #
+######################################################################
+
+
+@pytest.mark.anyio
+async def test_gradient_with_blur_is_same_as_legacy(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """Test the gradient is pixel identical to the legacy one when blurred."""
+    monkeypatch.setattr(settings, "card_gradient_blur", True)
+    colors = ImageCardGeneratorResources.HUMAN_COLORS
+    gradient = ImageCardGeneratorResources.generate_gradient_two_color(*colors)
+    diff = ImageChops.difference(gradient, legacy_gradient(*colors))
+    assert diff.getbbox() is None
+
+
+@pytest.mark.anyio
+async def test_gradient_without_blur_is_close_to_legacy(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """Test skipping the blur only changes slightly the gradient."""
+    monkeypatch.setattr(settings, "card_gradient_blur", False)
+    colors = ImageCardGeneratorResources.ROBOT_COLORS
+    gradient = ImageCardGeneratorResources.generate_gradient_two_color(*colors)
+    diff = ImageChops.difference(gradient, legacy_gradient(*colors))
+    assert all(high <= 16 for _, high in diff.getextrema())
+    assert all(mean < 2 for mean in ImageStat.Stat(diff).mean)
+
+
+@pytest.mark.anyio
+async def test_background_is_built_once_per_race() -> None:
+    """Test the background of a race is shared by all the cards of this race."""
+    resources = ImageCardGeneratorResources()
+    human = resources.get_background(ObjectCardRace.HUMAN)
+    assert resources.get_background(ObjectCardRace.HUMAN) is human
+    assert resources.get_background(ObjectCardRace.ROBOT) is not human
+    assert resources.backgrounds_cache_misses == 2
+    assert resources.backgrounds_cache_hits == 1
+
+
+@pytest.mark.anyio
+async def test_generator_does_not_modify_shared_background(
+    generator: ImageCardGenerator,
+) -> None:
+    """Test generating a card keeps the shared background untouched."""
+    background = ImageCardGenerator.resources.get_background(ObjectCardRace.HUMAN)
+    before = background.copy()
+    generator.generate_card()
+    assert ImageChops.difference(background, before).getbbox() is None
+
+
+@pytest.mark.anyio
+async def test_render_cards_images_same_output_with_any_jobs(tmpdir: Any) -> None:
+    """Test the images don't depend on the number of processes rendering them."""
+    cards = [
+        PlayableCharacterCard("Cyber-Heisenberg", 1, 1, 1, 0, "test"),
+        PlayableCharacterCard(
+            "Cyber-Pinkman", 2, 3, 4, 5, "test", race=ObjectCardRace.ROBOT
+        ),
+        PlayableCharacterCard(
+            "Cyber-Bane", 5, 4, 3, 2, "test", race=ObjectCardRace.ALIEN
+        ),
+    ]
+    outputs = {}
+    for jobs in (1, 2):
+        output = os.path.join(tmpdir, str(jobs))
+        os.mkdir(output)
+        tasks = [
+            CardImageTask(
+                card_id=card_id,
+                card=card,
+                image_path=CARD_IMAGE_PATH,
+                output_folder=output,
+                filename=f"{card_id}.png",
+                filename_with_values=f"{card_id}_full.png",
+            )
+            for card_id, card in enumerate(cards)
+        ]
+        results = list(render_cards_images(tasks, jobs))
+        assert [result.card_id for result in results] == [0, 1, 2]
+        outputs[jobs] = output
+    for filename in os.listdir(outputs[1]):
+        serial = Image.open(os.path.join(outputs[1], filename))
+        parallel = Image.open(os.path.join(outputs[2], filename))
+        assert ImageChops.difference(serial, parallel).getbbox() is None
+
+
+@pytest.mark.anyio
+async def test_build_card_atlas(tmpdir: Any) -> None:
+    """Test the cards are packed in sheets and can be cropped back from them."""
+    width = ImageCardGeneratorResources.WIDTH
+    height = ImageCardGeneratorResources.HEIGHT
+    images = {}
+    for card_id, color in enumerate([(255, 0, 0), (0, 255, 0), (0, 0, 255)]):
+        images[card_id] = os.path.join(tmpdir, f"{card_id}.png")
+        Image.new("RGBA", (width, height), color + (255,)).save(images[card_id])
+    index = build_card_atlas(images, tmpdir, "atlas", width * 2 + 1)
+
+    assert [sheet["filename"] for sheet in index["sheets"]] == [
+        "atlas_0.png",
+        "atlas_1.png",
+    ]
+    assert (index["sheets"][0]["width"], index["sheets"][0]["height"]) == (
+        width * 2,
+        height,
+    )
+    assert index["cards"]["2"] == {
+        "sheet": 1,
+        "x": 0,
+        "y": 0,
+        "width": width,
+        "height": height,
+    }
+    for card_id, path in images.items():
+        position = index["cards"][str(card_id)]
+        sheet = Image.open(os.path.join(tmpdir, f"atlas_{position['sheet']}.png"))
+        card = sheet.crop(
+            (
+                position["x"],
+                position["y"],
+                position["x"] + position["width"],
+                position["y"] + position["height"],
+            ),
+        )
+        assert ImageChops.difference(card, Image.open(path)).getbbox() is None
+
+    index_path = os.path.join(tmpdir, "atlas.json")
+    assert is_card_atlas_up_to_date(index_path, [0, 1, 2], width * 2 + 1)
+    assert not is_card_atlas_up_to_date(index_path, [0, 1], width * 2 + 1)
+    assert not is_card_atlas_up_to_date(index_path, [0, 1, 2], width * 4)
+    os.remove(os.path.join(tmpdir, "atlas_1.png"))
+    assert not is_card_atlas_up_to_date(index_path, [0, 1, 2], width * 2 + 1)
+
+
+@pytest.mark.anyio
+async def test_card_image_variant_filename() -> None:
+    """Test the full size png variant is the card image itself."""
+    assert get_card_image_variant_filename("0_static.png") == "0_static.png"
+    assert (
+        get_card_image_variant_filename(
+            "0_static.png",
+            CardImageSize.THUMB,
+            CardImageFormat.WEBP,
+        )
+        == "0_static_thumb.webp"
+    )
+    assert (
+        get_card_image_variant_filename(
+            "0_static.png",
+            CardImageSize.FULL,
+            CardImageFormat.WEBP,
+        )
+        == "0_static.webp"
+    )
+
+
+@pytest.mark.anyio
+async def test_generator_saves_variants(
+    tmpdir: Any,
+    generator: ImageCardGenerator,
+) -> None:
+    """Test each card image is saved in every size and format."""
+    ImageCardGenerator.resources.output_folder = str(tmpdir)
+    generator.generate_card()
+    generator.save_image("0.png")
+    for filename in get_card_image_filenames("0.png"):
+        with Image.open(os.path.join(tmpdir, filename)) as image:
+            assert image.format == os.path.splitext(filename)[1][1:].upper()
+            if "_thumb" in filename:
+                assert image.width == settings.card_image_thumb_width
+            elif "_medium" in filename:
+                assert image.width == settings.card_image_medium_width
+            else:
+                assert image.width == ImageCardGeneratorResources.WIDTH
+    thumb = os.path.getsize(os.path.join(tmpdir, "0_thumb.webp"))
+    assert thumb * 10 < os.path.getsize(os.path.join(tmpdir, "0.png"))
+
+
+@pytest.mark.anyio
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+async def test_text_wrapping_same_as_legacy() -> None:
+    """Test the cached widths break the lines exactly like measuring them."""
+    font = ImageCardGeneratorResources.MEDIUM_TEXT_FONT
+    texts = get_descriptions() + [
+        "A first paragraph.\nA second  one, with two spaces.",
+        ["A list of", "paragraphs\nwith a new line"],
+        "Averyveryveryveryveryveryveryveryveryveryveryveryverylongword at start",
+        " ".join(get_descriptions()) * 3,
+    ]
+    for width in (DESCRIPTION_WIDTH, 120, 10):
+        for text in texts:
+            assert get_text_list_fit_width(
+                text, width, font
+            ) == legacy_text_list_fit_width(text, width, font)
+
+
+@pytest.mark.anyio
+async def test_text_width_cache_per_font() -> None:
+    """Test each font has its own cache of word widths."""
+    medium = ImageCardGeneratorResources.MEDIUM_TEXT_FONT
+    big = ImageCardGeneratorResources.BIG_TEXT_FONT
+    assert get_text_width_cache(medium) is get_text_width_cache(medium)
+    assert get_text_width_cache(medium) is not get_text_width_cache(big)
+    assert get_text_width_cache(medium).space_advance == medium.getlength(" ")
+
+
+@pytest.mark.anyio
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+async def test_text_wrapping_benchmark() -> None:
+    """Benchmark the text wrapping over the descriptions of the real cards."""
+    font = ImageCardGeneratorResources.MEDIUM_TEXT_FONT
+    descriptions = get_descriptions()
+    long_description = " ".join(descriptions) * 5
+
+    def wrap_all(wrap: Any, texts: List[str]) -> None:
+        for text in texts:
+            wrap(text, DESCRIPTION_WIDTH, font)
+
+    for name, texts in (("cards", descriptions), ("long", [long_description])):
+        legacy = min(
+            timeit.repeat(
+                lambda: wrap_all(legacy_text_list_fit_width, texts),
+                number=5,
+                repeat=3,
+            ),
+        )
+        cached = min(
+            timeit.repeat(
+                lambda: wrap_all(get_text_list_fit_width, texts),
+                number=5,
+                repeat=3,
+            ),
+        )
+        logger.info(
+            "Text wrapping of {0} descriptions: legacy {1:.2f}ms, "
+            "cached {2:.2f}ms ({3:.1f}x)".format(
+                name,
+                legacy * 1000 / 5,
+                cached * 1000 / 5,
+                legacy / cached,
+            ),
+        )
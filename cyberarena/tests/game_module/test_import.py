@@ -0,0 +1,69 @@
+# flake8: noqa
+import pytest
+from loguru import logger
+
+from cyberarena.tests.utils import get_import_times, run_python
+
+######################################################################
+#                       TESTS IMPORT GAME MODULE                     #
+######################################################################
+
+
+@pytest.mark.anyio
+async def test_import_game_module_does_not_render() -> None:
+    """Test importing the game module doesn't import Pillow nor the renderer."""
+    result = run_python(
+        "import sys\n"
+        "import cyberarena.game_module\n"
+        "print('PIL' in sys.modules)\n"
+        "print('cyberarena.game_module.image_card_generator' in sys.modules)\n",
+    )
+    assert result.stdout.split() == ["False", "False"]
+
+
+@pytest.mark.anyio
+async def test_resources_built_on_first_use() -> None:
+    """Test the fonts and symbols are only built on first use or preload."""
+    result = run_python(
+        "from cyberarena.game_module.image_card_generator import (\n"
+        "    ImageCardGeneratorResources as R,\n"
+        ")\n"
+        "print(type(vars(R)['BIG_TEXT_FONT']).__name__)\n"
+        "print(type(R.SYMBOL_BY_RARITY).__name__)\n"
+        "print(type(vars(R)['RARITY_SYMBOL_GOLD_HEXAGON']).__name__)\n"
+        "R.preload()\n"
+        "print(type(vars(R)['BIG_TEXT_FONT']).__name__)\n",
+    )
+    assert result.stdout.split() == [
+        "lazy_resource",
+        "dict",
+        "Image",
+        "FreeTypeFont",
+    ]
+
+
+@pytest.mark.anyio
+async def test_import_time_benchmark() -> None:
+    """Benchmark the import of the game module against loading the renderer."""
+    result = run_python(
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "import cyberarena.game_module\n"
+        "imported = time.perf_counter()\n"
+        "from cyberarena.game_module.image_card_generator import (\n"
+        "    ImageCardGeneratorResources,\n"
+        ")\n"
+        "ImageCardGeneratorResources.preload()\n"
+        "print(imported - start, time.perf_counter() - imported)\n",
+    )
+    imported, renderer = (float(elapsed) for elapsed in result.stdout.split())
+    logger.info(
+        "Import of cyberarena.game_module: {0:.1f}ms, "
+        "loading the renderer and its resources: {1:.1f}ms more".format(
+            imported * 1000,
+            renderer * 1000,
+        ),
+    )
+    times = get_import_times("cyberarena.game_module")
+    assert "PIL" not in times
+    assert "cyberarena.game_module.image_card_generator" not in times
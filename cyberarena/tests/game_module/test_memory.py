@@ -0,0 +1,72 @@
+# flake8: noqa
+import tracemalloc
+
+import pytest
+from loguru import logger
+
+from cyberarena.game_module.card import LibraryCard
+from cyberarena.game_module.game import Game
+from cyberarena.game_module.game_manager import GameManager
+from cyberarena.web.api.game.utils import Ticket
+
+# Memory allowed for a game with 5 cards drawn by each player, in bytes.
+# It was about 10kB per game before the game objects had __slots__,
+# the random generator of each game then added about 2.5kB.
+GAME_MEMORY_BUDGET = 12000
+
+
+@pytest.fixture
+def library(card_library: LibraryCard) -> LibraryCard:
+    return card_library
+
+
+def create_game(game_manager: GameManager, game_id: int) -> Game:
+    game = game_manager.create_game(game_id * 2, game_id * 2 + 1)
+    for _ in range(5):
+        game.draw_card(game.player1, force=True)
+        game.draw_card(game.player2, force=True)
+    return game
+
+
+def get_memory_per_game(games_count: int) -> float:
+    """Get the memory allocated for each game, in bytes."""
+    game_manager = GameManager()
+    tracemalloc.start()
+    try:
+        games = [create_game(game_manager, game_id) for game_id in range(games_count)]
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(games) == games_count
+    return allocated / games_count
+
+
+######################################################################
+#                       TESTS MEMORY OF THE GAMES                    #
+######################################################################
+
+
+@pytest.mark.anyio
+async def test_game_objects_without_dict(library: LibraryCard) -> None:
+    """Test the objects of a game have no __dict__."""
+    game = create_game(GameManager(), 0)
+    hand = game.player1.get_hand()
+    objects = [
+        game,
+        game.player1,
+        hand,
+        hand.get_deck(),
+        game.get_board(),
+        Ticket(0, 0),
+        *hand.get_hand(),
+    ]
+    for game_object in objects:
+        assert not hasattr(game_object, "__dict__"), type(game_object).__name__
+
+
+@pytest.mark.anyio
+async def test_game_memory_benchmark(library: LibraryCard) -> None:
+    """Benchmark the memory used by each active game."""
+    memory = get_memory_per_game(1000)
+    logger.info("Memory per active game: {0:.0f} bytes".format(memory))
+    assert memory < GAME_MEMORY_BUDGET
@@ -0,0 +1,91 @@
+# flake8: noqa
+import os
+from typing import Any, Iterator
+
+import pytest
+from pytest import MonkeyPatch
+
+from cyberarena.game_module.card.library import Library
+from cyberarena.game_module.exceptions import CardImagesNotBuiltError
+from cyberarena.game_module.settings import CardImageMode, settings
+from cyberarena.game_module.utils import (
+    card_images_lock,
+    get_path_card_atlas,
+    get_path_card_image,
+    setup_game_module,
+)
+
+CARDS_PATH = os.path.join("cyberarena", "tests_data", "cards")
+
+
+@pytest.fixture
+def card_settings(tmpdir: Any, monkeypatch: MonkeyPatch) -> Iterator[str]:
+    """Set up the game module with the test cards and an empty images folder."""
+    output = os.path.join(tmpdir, "cards")
+    monkeypatch.setattr(settings, "card_path", CARDS_PATH)
+    monkeypatch.setattr(settings, "card_image_path", output)
+    monkeypatch.setattr(settings, "card_image_jobs", 1)
+    Library.reset()
+    yield output
+    Library.reset()
+
+
+######################################################################
+#                       TESTS SETUP GAME MODULE                      #
+######################################################################
+
+
+@pytest.mark.anyio
+async def test_setup_prebuilt_fails_without_images(
+    card_settings: str,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """Test the prebuilt mode fails fast when the images are not built."""
+    monkeypatch.setattr(settings, "card_image_mode", CardImageMode.PREBUILT)
+    with pytest.raises(CardImagesNotBuiltError):
+        setup_game_module()
+    assert not os.path.exists(card_settings)
+
+
+@pytest.mark.anyio
+async def test_setup_generate_then_prebuilt(
+    card_settings: str,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """Test the prebuilt mode uses the images built in generate mode."""
+    monkeypatch.setattr(settings, "card_image_mode", CardImageMode.GENERATE)
+    setup_game_module()
+    for card_id in Library().keys():
+        assert os.path.exists(get_path_card_image(card_id))
+        assert os.path.exists(get_path_card_image(card_id, static=True))
+    assert os.path.exists(get_path_card_atlas())
+    assert os.path.exists(get_path_card_atlas(static=True))
+
+    monkeypatch.setattr(settings, "card_image_mode", CardImageMode.PREBUILT)
+    Library.reset()
+    setup_game_module()
+
+
+@pytest.mark.anyio
+async def test_card_images_lock_creates_folder(card_settings: str) -> None:
+    """Test the lock can be taken before the images folder exists."""
+    with card_images_lock():
+        assert os.path.exists(
+            os.path.join(card_settings, settings.card_image_lock_filename),
+        )
+    with card_images_lock():
+        pass
+
+
+@pytest.mark.anyio
+async def test_setup_prebuilt_fails_without_atlas(
+    card_settings: str,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """Test the prebuilt mode fails when an atlas is missing."""
+    setup_game_module()
+    os.remove(get_path_card_atlas(static=True))
+    monkeypatch.setattr(settings, "card_image_mode", CardImageMode.PREBUILT)
+    Library.reset()
+    with pytest.raises(CardImagesNotBuiltError):
+        setup_game_module()
@@ -0,0 +1,785 @@
+# flake8: noqa
+import asyncio
+import json
+import timeit
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import msgpack
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from loguru import logger
+from pydantic import ValidationError
+from pytest import MonkeyPatch
+from starlette import status
+from starlette.websockets import WebSocketDisconnect
+
+from cyberarena import game_module as gamem
+from cyberarena.game_module.card import LibraryCard
+from cyberarena.game_module.card.library import make_json_payload
+from cyberarena.game_module.settings import CardImageFormat, CardImageSize
+from cyberarena.settings import Settings, WebsocketOverflowPolicy, settings
+from cyberarena.web.api.game import utils as game_utils
+from cyberarena.web.api.game.enums import WebsocketProtocol
+from cyberarena.web.api.game.utils import (
+    GameActor,
+    WebsocketGameManager,
+    accepted_values,
+    decode_message_msgpack,
+    encode_events_msgpack,
+    encode_message,
+    encode_message_msgpack,
+    etag_matches,
+    json_payload_response,
+    negotiate_image_format,
+    negotiate_websocket_protocol,
+)
+
+
+@pytest.fixture(autouse=True)
+def library(card_library: LibraryCard) -> LibraryCard:
+    return card_library
+
+
+@pytest.mark.anyio
+async def test_get_card_data(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    """Test the data of a card is the precomputed JSON with an ETag."""
+    card_id = min(LibraryCard().keys())
+    url = fastapi_app.url_path_for("get_card", card_id=card_id)
+    response = await client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == LibraryCard().get_card_json(card_id).content
+    assert response.json()["id"] == card_id
+    assert response.headers["etag"]
+    assert "max-age" in response.headers["cache-control"]
+
+
+@pytest.mark.anyio
+async def test_get_card_data_not_modified(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test the data of a card is not sent again when the client has it."""
+    card_id = min(LibraryCard().keys())
+    url = fastapi_app.url_path_for("get_card", card_id=card_id)
+    etag = (await client.get(url)).headers["etag"]
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not response.content
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.anyio
+async def test_get_card_data_not_found(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test the data of a card which doesn't exist."""
+    url = fastapi_app.url_path_for("get_card", card_id=max(LibraryCard().keys()) + 1)
+    response = await client.get(url)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_get_cards(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    """Test all the cards are sent in one response, ordered by id."""
+    url = fastapi_app.url_path_for("get_cards")
+    response = await client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    cards = response.json()
+    assert [card["id"] for card in cards] == sorted(LibraryCard().keys())
+    for card in cards:
+        assert card == json.loads(LibraryCard().get_card_json(card["id"]).content)
+
+
+@pytest.mark.anyio
+async def test_get_catalogue(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    """Test the catalogue has all the cards and the URLs of their images."""
+    url = fastapi_app.url_path_for("get_catalogue")
+    response = await client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    catalogue = response.json()
+    assert [card["id"] for card in catalogue["cards"]] == sorted(LibraryCard().keys())
+    for card in catalogue["cards"]:
+        image = await client.get(card["image"])
+        assert image.status_code == status.HTTP_200_OK
+
+    response = await client.get(
+        url, headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    response = await client.get(
+        url,
+        headers={"If-None-Match": '"{0}"'.format(catalogue["version"])},
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.anyio
+async def test_etag_matches() -> None:
+    assert etag_matches("abc", '"abc"')
+    assert etag_matches("abc", 'W/"abc-gzip"')
+    assert etag_matches("abc", '"def", "abc-br"')
+    assert etag_matches("abc", "*")
+    assert not etag_matches("abc", '"def"')
+    assert not etag_matches("abc", None)
+
+
+@pytest.mark.anyio
+async def test_accepted_values() -> None:
+    assert accepted_values("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert accepted_values("br;q=0, GZIP;q=0.5") == {"gzip"}
+    assert accepted_values(None) == set()
+
+
+@pytest.mark.anyio
+async def test_negotiate_image_format() -> None:
+    accept = "image/avif,image/webp,image/apng,*/*;q=0.8"
+    assert negotiate_image_format(accept) == CardImageFormat.WEBP
+    assert negotiate_image_format("image/webp;q=0, */*") == CardImageFormat.PNG
+    assert negotiate_image_format(None) == CardImageFormat.PNG
+
+
+@pytest.mark.anyio
+async def test_json_payload_response_encoding() -> None:
+    payload = make_json_payload({"cards": []}, compress=True)
+    response = json_payload_response(payload, accept_encoding="gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.body == payload.content_gzip
+    response = json_payload_response(payload, accept_encoding="identity")
+    assert "content-encoding" not in response.headers
+    assert response.body == payload.content
+    response = json_payload_response(
+        make_json_payload({"cards": []}),
+        accept_encoding="gzip",
+    )
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.anyio
+async def test_get_card_image_size_and_format(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test the size and the format of a card image can be chosen."""
+    card_id = min(LibraryCard().keys())
+    url = fastapi_app.url_path_for("get_card_image_fulfilled", card_id=card_id)
+    full = await client.get(url)
+    assert full.headers["content-type"] == "image/png"
+    thumb = await client.get(
+        url,
+        params={"size": CardImageSize.THUMB.value},
+        headers={"Accept": "image/webp,*/*"},
+    )
+    assert thumb.status_code == status.HTTP_200_OK
+    assert thumb.headers["content-type"] == "image/webp"
+    assert "Accept" in thumb.headers["vary"]
+    assert len(thumb.content) * 10 < len(full.content)
+
+
+######################################################################
+#                       TESTS GAME WEBSOCKETS                        #
+######################################################################
+
+
+class FakeWebSocket(object):
+    """Websocket of a client which records the messages it receives."""
+
+    def __init__(
+        self,
+        blocked: Optional[asyncio.Event] = None,
+        subprotocols: Tuple[str, ...] = (),
+    ) -> None:
+        self.messages: List[Dict[str, Any]] = []
+        self.sizes: List[int] = []
+        self.blocked = blocked
+        self.close_code: Optional[int] = None
+        self.scope = {"subprotocols": list(subprotocols)}
+        self.subprotocol: Optional[str] = None
+
+    async def accept(self, subprotocol: Optional[str] = None) -> None:
+        self.subprotocol = subprotocol
+
+    async def close(self, code: int = status.WS_1000_NORMAL_CLOSURE) -> None:
+        if self.blocked is not None:
+            await self.blocked.wait()
+        self.close_code = code
+
+    async def send_text(self, message: str) -> None:
+        if self.blocked is not None:
+            await self.blocked.wait()
+        self.messages.append(json.loads(message))
+        self.sizes.append(len(message.encode()))
+
+    async def send_bytes(self, message: bytes) -> None:
+        if self.blocked is not None:
+            await self.blocked.wait()
+        self.messages.append(game_utils.decode_message_msgpack(message))
+        self.sizes.append(len(message))
+
+
+class DisconnectedWebSocket(FakeWebSocket):
+    """Websocket of a client which left the game."""
+
+    async def send_text(self, message: str) -> None:
+        raise WebSocketDisconnect()
+
+
+async def connect_players(
+    manager: WebsocketGameManager,
+    *websockets: FakeWebSocket,
+    batch: Tuple[bool, ...] = (False, False, False),
+) -> int:
+    game = gamem.game_manager.create_game(1, 2)
+    for user_id, websocket, batched in zip((1, 2, 1), websockets, batch):
+        await manager.connect(websocket, game.id, user_id, batched)
+    await manager.flush(game.id)
+    return game.id
+
+
+async def disconnect_players(
+    manager: WebsocketGameManager,
+    game_id: int,
+    *websockets: FakeWebSocket,
+) -> None:
+    for websocket in websockets:
+        await manager.disconnect(websocket, game_id)
+
+
+async def run_writers() -> None:
+    """Let the writers of the websockets send their queued messages."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def get_begin_game_messages_count() -> int:
+    """Get the number of messages a player receives when the game begins."""
+    return 2 + 2 * gamem.get_starting_cards_amount()
+
+
+async def broadcast_end_games(
+    manager: WebsocketGameManager,
+    game_id: int,
+    count: int,
+) -> None:
+    for winner in range(count):
+        await manager.game_broadcast(
+            game_id,
+            {"type": "end_game", "winner": winner},
+            None,
+        )
+        await run_writers()
+
+
+@pytest.mark.anyio
+async def test_websocket_begin_game() -> None:
+    """Test both players receive the beginning of the game and their cards."""
+    manager = WebsocketGameManager()
+    player1, player2 = FakeWebSocket(), FakeWebSocket()
+    game_id = await connect_players(manager, player1, player2)
+    for websocket in (player1, player2):
+        types = [message["type"] for message in websocket.messages]
+        assert types[:2] == ["begin_game", "get_turn"]
+        cards = [m["card"] for m in websocket.messages if m["type"] == "draw_card"]
+        assert len(cards) == gamem.get_starting_cards_amount()
+        assert types.count("draw_card_private") == gamem.get_starting_cards_amount()
+        assert all(card["name"] for card in cards)
+    await disconnect_players(manager, game_id, player1, player2)
+
+
+@pytest.mark.anyio
+async def test_websocket_broadcast_encoded_once(monkeypatch: MonkeyPatch) -> None:
+    """Test a message is encoded once whatever the number of recipients."""
+    manager = WebsocketGameManager()
+    websockets = [FakeWebSocket() for _ in range(3)]
+    game_id = await connect_players(manager, *websockets)
+    encoded: List[Dict[str, Any]] = []
+
+    def encode_message(data: Dict[str, Any]) -> str:
+        encoded.append(data)
+        return json.dumps(data)
+
+    monkeypatch.setattr(game_utils, "encode_message", encode_message)
+    await manager.game_broadcast(game_id, {"type": "end_game"}, None)
+    await manager.flush(game_id)
+    assert encoded == [{"type": "end_game"}]
+    for websocket in websockets:
+        assert websocket.messages[-1] == {"type": "end_game"}
+    await disconnect_players(manager, game_id, *websockets)
+
+
+@pytest.mark.anyio
+async def test_websocket_slow_client_does_not_delay_others() -> None:
+    """Test a client receives a message while another one is still receiving it."""
+    manager = WebsocketGameManager()
+    blocked = asyncio.Event()
+    slow, fast = FakeWebSocket(), FakeWebSocket()
+    game_id = await connect_players(manager, slow, fast)
+    slow.blocked = blocked
+    await manager.game_broadcast(game_id, {"type": "end_game"}, None)
+    await run_writers()
+    assert fast.messages[-1] == {"type": "end_game"}
+    assert slow.messages[-1] != {"type": "end_game"}
+    assert manager.get_metrics()["queued_messages"] == 0
+    blocked.set()
+    await manager.flush(game_id)
+    assert slow.messages[-1] == {"type": "end_game"}
+    await disconnect_players(manager, game_id, slow, fast)
+
+
+@pytest.mark.anyio
+async def test_websocket_queue_full_resync(monkeypatch: MonkeyPatch) -> None:
+    """Test a client whose queue is full receives the state of the game instead."""
+    queue_size = get_begin_game_messages_count()
+    monkeypatch.setattr(settings, "websocket_queue_size", queue_size)
+    monkeypatch.setattr(
+        settings,
+        "websocket_overflow_policy",
+        WebsocketOverflowPolicy.RESYNC,
+    )
+    manager = WebsocketGameManager()
+    blocked = asyncio.Event()
+    slow, fast = FakeWebSocket(), FakeWebSocket()
+    game_id = await connect_players(manager, slow, fast)
+    slow.blocked = blocked
+    await broadcast_end_games(manager, game_id, 1)
+    await broadcast_end_games(manager, game_id, queue_size + 1)
+    metrics = manager.get_metrics()
+    assert metrics["resyncs"] == 1
+    assert metrics["dropped_messages"] == queue_size + 1
+    assert metrics["max_queue_depth"] == 1
+    assert metrics["max_queue_depth_reached"] == queue_size
+    blocked.set()
+    await manager.flush(game_id)
+    assert [message["type"] for message in slow.messages[-2:]] == [
+        "end_game",
+        "resync",
+    ]
+    state = slow.messages[-1]["state"]
+    assert state == json.loads(
+        json.dumps(gamem.game_manager.get_game_state(game_id, 1)),
+    )
+    assert len(state["hand"]) == gamem.get_starting_cards_amount()
+    winners = [0, *range(queue_size + 1)]
+    assert [message.get("winner") for message in fast.messages[-len(winners) :]] == (
+        winners
+    )
+    assert manager.get_metrics()["queued_messages"] == 0
+    await disconnect_players(manager, game_id, slow, fast)
+
+
+@pytest.mark.anyio
+async def test_websocket_queue_full_disconnect(monkeypatch: MonkeyPatch) -> None:
+    """Test a client whose queue is full is disconnected."""
+    queue_size = get_begin_game_messages_count()
+    monkeypatch.setattr(settings, "websocket_queue_size", queue_size)
+    monkeypatch.setattr(
+        settings,
+        "websocket_overflow_policy",
+        WebsocketOverflowPolicy.DISCONNECT,
+    )
+    manager = WebsocketGameManager()
+    slow, fast = FakeWebSocket(), FakeWebSocket()
+    game_id = await connect_players(manager, slow, fast)
+    slow.blocked = asyncio.Event()
+    await broadcast_end_games(manager, game_id, queue_size + 2)
+    assert slow.close_code is None
+    assert fast.close_code is None
+    metrics = manager.get_metrics()
+    assert metrics["websockets"] == 1
+    assert metrics["overflow_disconnects"] == 1
+    assert metrics["dropped_messages"] == queue_size + 1
+    await manager.flush(game_id)
+    winners = list(range(queue_size + 2))
+    assert [message.get("winner") for message in fast.messages[-len(winners) :]] == (
+        winners
+    )
+    slow.blocked.set()
+    await run_writers()
+    assert slow.close_code == status.WS_1008_POLICY_VIOLATION
+    await disconnect_players(manager, game_id, fast)
+
+
+@pytest.mark.anyio
+async def test_websocket_metrics_need_login(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+) -> None:
+    """Test the websocket metrics are not shown to anonymous users."""
+    response = await client.get(fastapi_app.url_path_for("get_websocket_metrics"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.anyio
+async def test_websocket_queue_size_positive() -> None:
+    """Test a queue size of 0, which would be unbounded, is refused."""
+    with pytest.raises(ValidationError):
+        Settings(websocket_queue_size=0)
+
+
+@pytest.mark.anyio
+async def test_websocket_client_left() -> None:
+    """Test a client is disconnected when a message can't be sent to it."""
+    manager = WebsocketGameManager()
+    player1, player2 = FakeWebSocket(), FakeWebSocket()
+    game_id = await connect_players(manager, player1, player2)
+    left = DisconnectedWebSocket()
+    await manager.connect(left, game_id, 1)
+    await broadcast_end_games(manager, game_id, 1)
+    await manager.flush(game_id)
+    assert manager.get_metrics()["websockets"] == 2
+    assert (
+        player1.messages[-1]
+        == player2.messages[-1]
+        == {
+            "type": "end_game",
+            "winner": 0,
+        }
+    )
+    await disconnect_players(manager, game_id, player1, player2)
+
+
+@pytest.mark.anyio
+async def test_websocket_batch_begin_game() -> None:
+    """Test a player in batch mode receives the game in one initial state."""
+    manager = WebsocketGameManager()
+    player1, player2 = FakeWebSocket(), FakeWebSocket()
+    game_id = await connect_players(manager, player1, player2, batch=(True, True))
+    for user_id, websocket in ((1, player1), (2, player2)):
+        assert [message["type"] for message in websocket.messages] == [
+            "initial_state",
+        ]
+        state = websocket.messages[0]["state"]
+        assert state == json.loads(
+            json.dumps(gamem.game_manager.get_game_state(game_id, user_id)),
+        )
+        assert len(state["hand"]) == gamem.get_starting_cards_amount()
+        assert state["ennemy_hand_size"] == gamem.get_starting_cards_amount()
+    await disconnect_players(manager, game_id, player1, player2)
+
+
+@pytest.mark.anyio
+async def test_websocket_batch_mixed_modes() -> None:
+    """Test a player not in batch mode still receives the beginning messages."""
+    manager = WebsocketGameManager()
+    batched, legacy = FakeWebSocket(), FakeWebSocket()
+    game_id = await connect_players(manager, batched, legacy, batch=(True, False))
+    assert len(batched.messages) == 1
+    assert len(legacy.messages) == get_begin_game_messages_count()
+    hand = [m["card"]["id"] for m in legacy.messages if m["type"] == "draw_card"]
+    state = gamem.game_manager.get_game_state(game_id, 2)
+    assert hand == [card["id"] for card in state["hand"]]
+    assert len(batched.messages[0]["state"]["hand"]) == len(hand)
+    await disconnect_players(manager, game_id, batched, legacy)
+
+
+@pytest.mark.anyio
+async def test_websocket_begin_game_with_overflow(monkeypatch: MonkeyPatch) -> None:
+    """Test the starting cards are drawn when a websocket is disconnected."""
+    monkeypatch.setattr(settings, "websocket_queue_size", 2)
+    monkeypatch.setattr(
+        settings,
+        "websocket_overflow_policy",
+        WebsocketOverflowPolicy.DISCONNECT,
+    )
+    manager = WebsocketGameManager()
+    legacy, batched = FakeWebSocket(), FakeWebSocket()
+    game_id = await connect_players(manager, legacy, batched, batch=(False, True))
+    await run_writers()
+    assert legacy.close_code == status.WS_1008_POLICY_VIOLATION
+    assert [message["type"] for message in batched.messages] == ["initial_state"]
+    state = batched.messages[0]["state"]
+    assert len(state["hand"]) == gamem.get_starting_cards_amount()
+    await disconnect_players(manager, game_id, batched)
+
+
+@pytest.mark.anyio
+async def test_websocket_batch_events() -> None:
+    """Test the messages queued together are sent in one events message."""
+    manager = WebsocketGameManager()
+    batched, legacy = FakeWebSocket(), FakeWebSocket()
+    game_id = await connect_players(manager, batched, legacy, batch=(True, False))
+    for winner in range(3):
+        await manager.game_broadcast(
+            game_id,
+            {"type": "end_game", "winner": winner},
+            None,
+        )
+    await manager.flush(game_id)
+    events = [{"type": "end_game", "winner": winner} for winner in range(3)]
+    assert batched.messages[1:] == [{"type": "events", "events": events}]
+    assert legacy.messages[-3:] == events
+    await broadcast_end_games(manager, game_id, 1)
+    assert batched.messages[-1] == {"type": "end_game", "winner": 0}
+    await disconnect_players(manager, game_id, batched, legacy)
+
+
+######################################################################
+#                       TESTS GAME ACTORS                            #
+######################################################################
+
+
+def record_command(events: List[str], name: str) -> Callable[[], Awaitable[None]]:
+    async def command() -> None:
+        events.append(f"{name} start")
+        await asyncio.sleep(0)
+        events.append(f"{name} end")
+
+    return command
+
+
+@pytest.mark.anyio
+async def test_game_actor_runs_commands_one_at_a_time() -> None:
+    """Test the commands of a game don't interleave, but the games run together."""
+    events: List[str] = []
+    game1, game2 = GameActor(), GameActor()
+    game1.start()
+    game2.start()
+    await asyncio.gather(
+        game1.submit(record_command(events, "a")),
+        game1.submit(record_command(events, "b")),
+        game2.submit(record_command(events, "c")),
+    )
+    game1_events = [event for event in events if event[0] in "ab"]
+    assert game1_events == ["a start", "a end", "b start", "b end"]
+    assert events.index("c start") < events.index("a end")
+    await game1.close()
+    await game2.close()
+
+
+@pytest.mark.anyio
+async def test_game_actor_error() -> None:
+    """Test the error of a command is raised to its submitter only."""
+    events: List[str] = []
+    actor = GameActor()
+    actor.start()
+
+    async def fail() -> None:
+        raise ValueError("invalid command")
+
+    with pytest.raises(ValueError):
+        await actor.submit(fail)
+    await actor.submit(record_command(events, "a"))
+    assert events == ["a start", "a end"]
+    await actor.close()
+    with pytest.raises(RuntimeError):
+        await actor.submit(record_command(events, "b"))
+
+
+@pytest.mark.anyio
+async def test_game_actor_close_cancels_pending_commands() -> None:
+    """Test the commands not run yet are cancelled when the actor is closed."""
+    events: List[str] = []
+    actor = GameActor()
+    actor.start()
+    pending = asyncio.create_task(actor.submit(record_command(events, "a")))
+    await asyncio.sleep(0)
+    await actor.close()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert events == []
+
+
+@pytest.mark.anyio
+async def test_game_actor_submitter_cancelled() -> None:
+    """Test the actor still runs commands after a submitter is cancelled."""
+    events: List[str] = []
+    actor = GameActor()
+    actor.start()
+    running = asyncio.Event()
+    resume = asyncio.Event()
+
+    async def wait() -> None:
+        running.set()
+        await resume.wait()
+
+    submitter = asyncio.create_task(actor.submit(wait))
+    await running.wait()
+    submitter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await submitter
+    resume.set()
+    await asyncio.wait_for(actor.submit(record_command(events, "a")), timeout=1)
+    assert events == ["a start", "a end"]
+    await actor.close()
+
+
+@pytest.mark.anyio
+async def test_game_actor_close_cancels_running_command() -> None:
+    """Test the submitter of the running command is released when it is closed."""
+    actor = GameActor()
+    actor.start()
+    running = asyncio.Event()
+
+    async def sleep() -> None:
+        running.set()
+        await asyncio.sleep(10)
+
+    submitter = asyncio.create_task(actor.submit(sleep))
+    await running.wait()
+    await asyncio.wait_for(actor.close(), timeout=1)
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(submitter, timeout=1)
+
+
+@pytest.mark.anyio
+async def test_websocket_messages_of_a_game_serialized() -> None:
+    """Test the messages received for a game are run one at a time."""
+    manager = WebsocketGameManager()
+    player1, player2 = FakeWebSocket(), FakeWebSocket()
+    game_id = await connect_players(manager, player1, player2)
+    events: List[str] = []
+
+    async def next_turn(game_id: int, websocket: FakeWebSocket) -> None:
+        await record_command(events, "end_turn")()
+
+    async def attack(game_id: int, websocket: FakeWebSocket, data: Any) -> None:
+        await record_command(events, "attack")()
+
+    manager.next_turn = next_turn  # type: ignore
+    manager.attack = attack  # type: ignore
+    await asyncio.gather(
+        manager.receive(player1, {"type": "end_turn"}, game_id, 1),
+        manager.receive(player2, {"type": "attack"}, game_id, 2),
+    )
+    assert events == ["end_turn start", "end_turn end", "attack start", "attack end"]
+    assert manager.get_metrics()["games"] == 1
+    await disconnect_players(manager, game_id, player1, player2)
+    assert manager.get_metrics()["games"] == 0
+
+
+######################################################################
+#                       TESTS MESSAGEPACK PROTOCOL                   #
+######################################################################
+
+MATCH_SEED = 42
+MATCH_TURNS = 12
+
+
+async def play_match(
+    manager: WebsocketGameManager,
+    player1: FakeWebSocket,
+    player2: FakeWebSocket,
+) -> None:
+    """Play a match where each player deploys its cards and attacks the nexus."""
+    game = gamem.game_manager.create_game(1, 2, seed=MATCH_SEED)
+    websockets = {1: player1, 2: player2}
+    for user_id, websocket in websockets.items():
+        await manager.connect(websocket, game.id, user_id)
+    for _ in range(MATCH_TURNS):
+        user_id = gamem.game_manager.get_turn(game.id)
+        websocket = websockets[user_id]
+        state = gamem.game_manager.get_game_state(game.id, user_id)
+        for card in state["board"]:
+            data = {"type": "attack_nexus", "id_card": card["id"]}
+            await manager.receive(websocket, data, game.id, user_id)
+        for card in state["hand"]:
+            data = {"type": "deploy_card", "id_card": card["id"]}
+            await manager.receive(websocket, data, game.id, user_id)
+        await manager.receive(websocket, {"type": "get_mana"}, game.id, user_id)
+        await manager.receive(websocket, {"type": "end_turn"}, game.id, user_id)
+    await manager.flush(game.id)
+    await disconnect_players(manager, game.id, player1, player2)
+
+
+@pytest.mark.anyio
+async def test_negotiate_websocket_protocol() -> None:
+    msgpack_protocol = WebsocketProtocol.MSGPACK
+    json_protocol = WebsocketProtocol.JSON
+    subprotocols = [json_protocol.value, msgpack_protocol.value]
+    assert negotiate_websocket_protocol(subprotocols) == msgpack_protocol
+    assert negotiate_websocket_protocol([json_protocol.value]) == json_protocol
+    assert negotiate_websocket_protocol(["chat"]) is None
+    assert negotiate_websocket_protocol([]) is None
+
+
+@pytest.mark.anyio
+async def test_msgpack_messages() -> None:
+    """Test the messages are encoded with the code of their type."""
+    data = {"type": "attack", "card1": {"id": 3, "hp": 2}, "card2": 4}
+    content = encode_message_msgpack(data)
+    assert msgpack.unpackb(content)["type"] == 6
+    assert decode_message_msgpack(content) == data
+    assert len(content) < len(encode_message(data))
+    events = encode_events_msgpack([content, encode_message_msgpack(data)])
+    assert msgpack.unpackb(events) == {
+        "type": 0,
+        "events": [msgpack.unpackb(content)] * 2,
+    }
+
+
+@pytest.mark.anyio
+async def test_msgpack_unknown_type_ignored() -> None:
+    """Test a message of an unknown type code is ignored like in JSON."""
+    data = decode_message_msgpack(msgpack.packb({"type": 999, "id_card": 1}))
+    assert data == {"type": 999, "id_card": 1}
+    manager = WebsocketGameManager()
+    player1, player2 = FakeWebSocket(), FakeWebSocket()
+    game_id = await connect_players(manager, player1, player2)
+    received = len(player1.messages)
+    await manager.receive(player1, data, game_id, 1)
+    await manager.flush(game_id)
+    assert len(player1.messages) == received
+    await disconnect_players(manager, game_id, player1, player2)
+
+
+@pytest.mark.anyio
+async def test_websocket_msgpack_same_messages() -> None:
+    """Test a match sends the same messages with MessagePack as with JSON."""
+    json_players = FakeWebSocket(), FakeWebSocket()
+    await play_match(WebsocketGameManager(), *json_players)
+    subprotocols = (WebsocketProtocol.JSON.value, WebsocketProtocol.MSGPACK.value)
+    msgpack_players = (
+        FakeWebSocket(subprotocols=subprotocols),
+        FakeWebSocket(subprotocols=subprotocols),
+    )
+    await play_match(WebsocketGameManager(), *msgpack_players)
+    for json_player, msgpack_player in zip(json_players, msgpack_players):
+        assert json_player.subprotocol is None
+        assert msgpack_player.subprotocol == WebsocketProtocol.MSGPACK.value
+        assert msgpack_player.messages == json_player.messages
+        assert sum(msgpack_player.sizes) < sum(json_player.sizes)
+    types = {message["type"] for message in json_players[0].messages}
+    assert {"begin_game", "deploy_card", "get_nexus_health"} <= types
+
+
+@pytest.mark.anyio
+async def test_websocket_protocol_benchmark() -> None:
+    """Benchmark the bytes and the time of the messages of a match per protocol."""
+    players = FakeWebSocket(), FakeWebSocket()
+    await play_match(WebsocketGameManager(), *players)
+    messages = [message for player in players for message in player.messages]
+    results = {}
+    codecs = (
+        ("json", encode_message, json.loads),
+        ("msgpack", encode_message_msgpack, decode_message_msgpack),
+    )
+    for name, encode, decode in codecs:
+        encoded = [encode(message) for message in messages]
+        size = sum(
+            len(content.encode() if isinstance(content, str) else content)
+            for content in encoded
+        )
+        encode_time = min(
+            timeit.repeat(
+                lambda: [encode(message) for message in messages], number=20, repeat=3
+            )
+        )
+        decode_time = min(
+            timeit.repeat(
+                lambda: [decode(content) for content in encoded], number=20, repeat=3
+            )
+        )
+        results[name] = size
+        logger.info(
+            "{0}: {1} messages, {2} bytes, encode {3:.1f}us, decode {4:.1f}us "
+            "per match".format(
+                name,
+                len(messages),
+                size,
+                encode_time / 20 * 1_000_000,
+                decode_time / 20 * 1_000_000,
+            ),
+        )
+    assert results["msgpack"] < results["json"]
@@ -0,0 +1,52 @@
+# flake8: noqa
+import pytest
+from loguru import logger
+
+from cyberarena.tests.utils import get_import_times
+
+# Cumulative import time allowed for the web application, in microseconds.
+# It is generous so the test doesn't fail on a slow machine,
+# but catches a heavy dependency imported again at startup.
+APPLICATION_IMPORT_BUDGET = 2_000_000
+
+LAZY_MODULES = (
+    "PIL",
+    "opentelemetry",
+    "cyberarena.game_module.image_card_generator",
+)
+
+
+def get_application_import_time() -> int:
+    """Get the best cumulative import time of the web application of 3 runs."""
+    return min(
+        get_import_times("cyberarena.web.application")["cyberarena.web.application"]
+        for _ in range(3)
+    )
+
+
+######################################################################
+#                       TESTS IMPORT APPLICATION                     #
+######################################################################
+
+
+@pytest.mark.anyio
+async def test_import_application_lazy_modules() -> None:
+    """Test Pillow and opentelemetry aren't imported with the web application."""
+    times = get_import_times("cyberarena.web.application")
+    for name in LAZY_MODULES:
+        imported = [
+            module
+            for module in times
+            if module == name or module.startswith(f"{name}.")
+        ]
+        assert not imported, name
+
+
+@pytest.mark.anyio
+async def test_import_application_budget() -> None:
+    """Test the web application is imported in its time budget."""
+    elapsed = get_application_import_time()
+    logger.info(
+        "Import of cyberarena.web.application: {0:.1f}ms".format(elapsed / 1000),
+    )
+    assert elapsed < APPLICATION_IMPORT_BUDGET
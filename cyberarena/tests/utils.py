@@ -0,0 +1,26 @@
+# flake8: noqa
+import subprocess
+import sys
+from typing import Dict
+
+
+def run_python(code: str, *options: str) -> subprocess.CompletedProcess:
+    """Run python code in a new interpreter, so nothing is already imported."""
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def get_import_times(module: str) -> Dict[str, int]:
+    """Get the cumulative import time of each module, in microseconds."""
+    result = run_python(f"import {module}", "-X", "importtime")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
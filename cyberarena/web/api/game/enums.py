@@ -8,3 +8,37 @@ class TicketStatus(str, enum.Enum):  # noqa: WPS600
     CLOSED = "closed"
     CANCEL = "cancel"
     DONT_EXIST = "dont_exist"
+
+
+class CardAtlasKind(str, enum.Enum):  # noqa: WPS600
+    """Kind of card images in an atlas, named like the card image endpoints."""
+
+    IMAGE = "image"
+    IMAGE_FULL = "imagefull"
+
+
+class WebsocketProtocol(str, enum.Enum):  # noqa: WPS600
+    """Subprotocols of the game websockets, JSON is used when none is asked."""
+
+    JSON = "cyberarena.json"
+    MSGPACK = "cyberarena.msgpack"
+
+
+class MessageType(enum.IntEnum):
+    """Codes of the types of the game messages sent with MessagePack."""
+
+    EVENTS = 0
+    BEGIN_GAME = 1
+    GET_TURN = 2
+    DRAW_CARD = 3
+    DRAW_CARD_PRIVATE = 4
+    DEPLOY_CARD = 5
+    ATTACK = 6
+    ATTACK_NEXUS = 7
+    GET_MANA = 8
+    GET_NEXUS_HEALTH = 9
+    END_TURN = 10
+    END_GAME = 11
+    RESYNC = 12
+    INITIAL_STATE = 13
+    CLOSE = 14
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -26,3 +26,32 @@ class CardModel(BaseModel):
     health: Optional[int] = None
     defense: Optional[int] = None
     rarity: game_module.enums.ObjectCardRarity
+
+
+class CatalogueCardModel(CardModel):
+    """Card Model in the catalogue, with the URLs of its images."""
+
+    image: str
+    image_full: str
+
+
+class CatalogueModel(BaseModel):
+    """Catalogue Model."""
+
+    version: str
+    cards: List[CatalogueCardModel]
+
+
+class WebsocketMetricsModel(BaseModel):
+    """Metrics of the queues of the game websockets."""
+
+    games: int
+    websockets: int
+    queued_messages: int
+    max_queue_depth: int
+    max_queue_depth_reached: int
+    queue_size: int
+    dropped_messages: int
+    resyncs: int
+    overflow_disconnects: int
+    queued_commands: int
@@ -1,13 +1,43 @@
-from typing import Dict, List, Optional, Union
-
+import asyncio
+import os
+from typing import (  # noqa: WPS235
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import ujson
 from fastapi import HTTPException
 from loguru import logger
 from starlette import status
+from starlette.responses import FileResponse, Response
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
 from cyberarena import game_module as gamem
-from cyberarena.web.api.game.enums import TicketStatus
-from cyberarena.web.api.game.schema import CardModel
+from cyberarena.game_module.card.library import JsonPayload
+from cyberarena.game_module.settings import CardImageFormat, CardImageSize
+from cyberarena.settings import WebsocketOverflowPolicy, settings
+from cyberarena.web.api.game.enums import (
+    CardAtlasKind,
+    MessageType,
+    TicketStatus,
+    WebsocketProtocol,
+)
+
+try:
+    import msgpack  # noqa: WPS433
+except ImportError:  # pragma: no cover
+    HAS_MSGPACK = False
+else:
+    HAS_MSGPACK = True
 
 UnionIntStr = Union[int, str]
 DictStrUnionIntStr = Dict[str, UnionIntStr]
@@ -26,6 +56,8 @@ class YourDaroneNotImplemented(NotImplementedError):
 class Ticket(object):
     """Ticket object."""
 
+    __slots__ = ("status", "ticket_id", "user_id")
+
     def __init__(self, ticket_id: int, user_id: int) -> None:
         """
         Create a ticket.
@@ -209,35 +241,16 @@ def get_game_id(ticket: int) -> int:
     return gamem.game_manager.find_player(ticket)
 
 
-def get_card_data(card_id: int) -> CardModel:
+def get_card_data(card_id: int) -> JsonPayload:
     """
-    Get a CardModel from a card id.
+    Get the JSON of a CardModel from a card id.
 
     :param card_id: The id of the card to get  # noqa: DAR003
-    :return: The CardModel of the card
+    :return: The JSON of the CardModel of the card and its tag
     :raises HTTPException: If the card doesn't exist
     """
     try:
-        card = gamem.get_card_from_id(card_id)
-        if isinstance(card, gamem.AbstractCharacterCard):
-            return CardModel(
-                id=card_id,
-                name=card.name,
-                description=card.description,
-                cost=card.cost,
-                attack=card.ap,
-                defense=card.dp,
-                health=card.hp,
-                rarity=card.rarity,
-            )
-        return CardModel(
-            id=card_id,
-            name=card.name,
-            description=card.description,
-            cost=card.cost,
-            rarity=card.rarity,
-        )
-
+        return gamem.get_card_json(card_id)
     except gamem.exceptions.LibraryCardNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -245,32 +258,599 @@ def get_card_data(card_id: int) -> CardModel:
         )
 
 
-def get_card_path(card_id: int, full_path: bool = False) -> str:
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """
+    Check if an ETag is in the If-None-Match header of a request.
+
+    The tag of any encoding of the resource matches.
+
+    :param etag: The tag of the resource, without quotes and encoding.
+    :param if_none_match: The If-None-Match header of the request.
+    :return: True if the client already has this version of the resource.
+    """
+    if not if_none_match:
+        return False
+    tags = {
+        tag.strip().removeprefix("W/").strip('"').split("-")[0]
+        for tag in if_none_match.split(",")
+    }
+    return "*" in tags or etag in tags
+
+
+def accepted_values(accept: Optional[str]) -> Set[str]:
+    """
+    Get the values accepted by the client in an Accept-* header.
+
+    The values with a quality of 0 are not accepted.
+
+    :param accept: The Accept, Accept-Encoding... header of the request.
+    :return: The accepted values, e.g. the names of the encodings.
+    """
+    values = set()
+    for value in (accept or "").split(","):
+        name, _, params = value.partition(";")
+        quality = params.strip().removeprefix("q=")
+        if name.strip() and quality not in {"0", "0.0", "0.00", "0.000"}:
+            values.add(name.strip().lower())
+    return values
+
+
+def json_payload_response(
+    payload: JsonPayload,
+    if_none_match: Optional[str] = None,
+    accept_encoding: Optional[str] = None,
+) -> Response:
+    """
+    Make a response from JSON already encoded.
+
+    The response can be cached by the client, and it is revalidated with its ETag.
+    If the payload was compressed and the client accepts it, the compressed
+    content is sent, brotli being preferred to gzip.
+
+    :param payload: The encoded JSON and its tag.
+    :param if_none_match: The If-None-Match header of the request.
+    :param accept_encoding: The Accept-Encoding header of the request.
+    :return: The JSON response, or an empty 304 response if the client
+        already has it.
+    """
+    content = payload.content
+    encoding = None
+    encodings = accepted_values(accept_encoding)
+    if payload.content_brotli is not None and "br" in encodings:
+        content, encoding = payload.content_brotli, "br"
+    elif payload.content_gzip is not None and encodings & {"gzip", "*"}:
+        content, encoding = payload.content_gzip, "gzip"
+
+    headers = {
+        "ETag": '"{0}"'.format(
+            payload.etag if encoding is None else f"{payload.etag}-{encoding}",
+        ),
+        "Cache-Control": "public, max-age={0}".format(settings.card_cache_max_age),
+    }
+    if payload.content_gzip is not None:
+        headers["Vary"] = "Accept-Encoding"
+    if etag_matches(payload.etag, if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def negotiate_image_format(accept: Optional[str]) -> CardImageFormat:
+    """
+    Choose the format of a card image from the formats accepted by the client.
+
+    :param accept: The Accept header of the request.
+    :return: WebP if the client accepts it, else PNG.
+    """
+    if "image/webp" in accepted_values(accept):
+        return CardImageFormat.WEBP
+    return CardImageFormat.PNG
+
+
+def get_card_path(
+    card_id: int,
+    full_path: bool = False,
+    size: CardImageSize = CardImageSize.FULL,
+    image_format: CardImageFormat = CardImageFormat.PNG,
+) -> str:
     """
     Get the path of a card.
 
     :param card_id: The id of the card to get the path.
     :param full_path: If True, get the image with stat filled.
+    :param size: The size of the image.
+    :param image_format: The format of the image.
     :return: The path of the card
     """
-    return gamem.get_path_card_image(card_id, full_path)
+    return gamem.get_path_card_image(card_id, full_path, size, image_format)
+
+
+def card_image_response(
+    card_id: int,
+    fulfilled: bool,
+    size: CardImageSize,
+    accept: Optional[str],
+) -> FileResponse:
+    """
+    Make the response of a card image, in the format negotiated with the client.
+
+    :param card_id: The id of the card.
+    :param fulfilled: If True, send the image with stat filled.
+    :param size: The size of the image.
+    :param accept: The Accept header of the request.
+    :return: The image of the card.
+    """
+    image_format = negotiate_image_format(accept)
+    return FileResponse(
+        get_card_path(card_id, fulfilled, size, image_format),
+        media_type="image/{0}".format(image_format.value),
+        headers={"Vary": "Accept"},
+    )
+
+
+def get_card_atlas_path(kind: CardAtlasKind, sheet: Optional[int] = None) -> str:
+    """
+    Get the path of the index or of a sheet of an atlas of card images.
+
+    :param kind: The kind of card images in the atlas.
+    :param sheet: The number of the sheet, None to get the index.
+    :return: The path of the index or of the sheet
+    :raises HTTPException: If the sheet doesn't exist
+    """
+    static = kind == CardAtlasKind.IMAGE_FULL
+    if sheet is None:
+        return gamem.get_path_card_atlas(static)
+    path = gamem.get_path_card_atlas_sheet(sheet, static)
+    if sheet < 0 or not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Atlas sheet not found",
+        )
+    return path
+
+
+def encode_message(data: Mapping[str, Any]) -> str:
+    """
+    Encode a message sent on the websockets of a game.
+
+    :param data: The data of the message.
+    :return: The JSON of the message.
+    """
+    return ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False)
+
+
+def encode_events(messages: List[str]) -> str:
+    """
+    Encode messages already encoded in one events message.
+
+    :param messages: The JSON of the messages.
+    :return: The JSON of the events message.
+    """
+    return '{{"type":"events","events":[{0}]}}'.format(",".join(messages))
+
+
+# Names of the message types by their MessagePack code
+MESSAGE_TYPE_NAMES = {code.value: code.name.lower() for code in MessageType}
+
+
+def encode_message_msgpack(data: Mapping[str, Any]) -> bytes:
+    """
+    Encode a message sent on the websockets of a game with MessagePack.
+
+    The type of the message is sent as its code.
+
+    :param data: The data of the message.
+    :return: The MessagePack of the message.
+    """
+    code = MessageType[data["type"].upper()].value
+    return msgpack.packb({**data, "type": code})
+
+
+def encode_events_msgpack(messages: List[bytes]) -> bytes:
+    """
+    Encode messages already encoded with MessagePack in one events message.
+
+    :param messages: The MessagePack of the messages.
+    :return: The MessagePack of the events message.
+    """
+    packer = msgpack.Packer()
+    return b"".join(
+        [
+            packer.pack_map_header(2),
+            packer.pack("type"),
+            packer.pack(MessageType.EVENTS.value),
+            packer.pack("events"),
+            packer.pack_array_header(len(messages)),
+            *messages,
+        ],
+    )
+
+
+def decode_message_msgpack(content: bytes) -> Dict[str, Any]:
+    """
+    Decode a message received with MessagePack on the websocket of a game.
+
+    An unknown type code is kept as is, so the message is ignored
+    like a JSON message of an unknown type.
+
+    :param content: The MessagePack of the message.
+    :return: The data of the message, with the name of its type.
+    """
+    data = msgpack.unpackb(content)
+    data["type"] = MESSAGE_TYPE_NAMES.get(data["type"], data["type"])
+    return data
+
+
+def negotiate_websocket_protocol(
+    subprotocols: Iterable[str],
+) -> Optional[WebsocketProtocol]:
+    """
+    Choose the protocol of a game websocket among the ones asked by the client.
+
+    MessagePack is only chosen if the msgpack package is installed.
+
+    :param subprotocols: The subprotocols asked by the client.
+    :return: The protocol, None if the client asked none of them.
+    """
+    asked = set(subprotocols)
+    if WebsocketProtocol.MSGPACK.value in asked and HAS_MSGPACK:
+        return WebsocketProtocol.MSGPACK
+    if WebsocketProtocol.JSON.value in asked:
+        return WebsocketProtocol.JSON
+    return None
+
+
+class GameMessage(object):
+    """A message of a game, encoded once for each protocol it is sent with."""
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        """
+        Create a message.
+
+        :param data: The data of the message.
+        """
+        self.data = data
+        self.__encoded: Dict[WebsocketProtocol, Union[str, bytes]] = {}
+
+    def encode(self, protocol: WebsocketProtocol) -> Union[str, bytes]:
+        """
+        Encode the message, the first time it is sent with a protocol.
+
+        :param protocol: The protocol of the websocket.
+        :return: The JSON or the MessagePack of the message.
+        """
+        encoded = self.__encoded.get(protocol)
+        if encoded is None:
+            if protocol == WebsocketProtocol.MSGPACK:
+                encoded = encode_message_msgpack(self.data)
+            else:
+                encoded = encode_message(self.data)
+            self.__encoded[protocol] = encoded
+        return encoded
+
+
+class WebsocketWriter(object):
+    """
+    Send the messages of a websocket from a bounded queue, in its own task.
+
+    Queuing a message never waits for the client,
+    so a slow client only fills its own queue.
+    In batch mode, the messages queued while the previous frame
+    was sent are sent together in one events message.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        queue_size: int,
+        batch: bool = False,
+        protocol: WebsocketProtocol = WebsocketProtocol.JSON,
+    ) -> None:
+        """
+        Create the writer of a websocket.
+
+        :param websocket: The websocket to send the messages to.
+        :param queue_size: The number of messages waiting to be sent
+                           before the queue is full.
+        :param batch: If True, send the queued messages together.
+        :param protocol: The protocol the messages are encoded with.
+        """
+        self.websocket = websocket
+        self.batch = batch
+        self.protocol = protocol
+        self.max_depth = 0
+        self.__queue: "asyncio.Queue[Union[str, bytes]]" = asyncio.Queue(queue_size)
+        self.__task: "Optional[asyncio.Task[None]]" = None
+
+    @property
+    def depth(self) -> int:
+        """
+        Get the number of messages waiting to be sent.
+
+        :return: The number of messages in the queue.
+        """
+        return self.__queue.qsize()
+
+    def start(self, on_error: Callable[[], Awaitable[None]]) -> None:
+        """
+        Start sending the queued messages.
+
+        :param on_error: Called when a message can't be sent to the websocket.
+        """
+        self.__task = asyncio.create_task(self.__run(on_error))
+
+    def put(self, message: GameMessage) -> bool:
+        """
+        Queue a message without waiting.
+
+        :param message: The message.
+        :return: False if the queue is full, and the message is not queued.
+        """
+        try:
+            self.__queue.put_nowait(message.encode(self.protocol))
+        except asyncio.QueueFull:
+            return False
+        self.max_depth = max(self.max_depth, self.depth)
+        return True
+
+    def clear(self) -> int:
+        """
+        Drop the messages waiting to be sent.
+
+        :return: The number of dropped messages.
+        """
+        dropped = 0
+        while not self.__queue.empty():
+            self.__queue.get_nowait()
+            self.__queue.task_done()
+            dropped += 1
+        return dropped
+
+    async def join(self) -> None:
+        """Wait until the queued messages are sent."""
+        await self.__queue.join()
+
+    def abort(self, code: int) -> "asyncio.Task[None]":
+        """
+        Drop the queued messages and close the websocket, in a new task.
+
+        :param code: The code the websocket is closed with.
+        :return: The task closing the websocket.
+        """
+        self.clear()
+        task = self.__task
+        self.__task = None
+        return asyncio.create_task(self.__abort(task, code))
+
+    async def close(self) -> None:
+        """Stop sending the queued messages."""
+        task = self.__task
+        self.__task = None
+        if task is None or task is asyncio.current_task():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            logger.debug("websocket writer stopped")
+
+    async def __abort(self, task: "Optional[asyncio.Task[None]]", code: int) -> None:
+        """
+        Stop sending the queued messages, then close the websocket.
+
+        :param task: The task sending the queued messages.
+        :param code: The code the websocket is closed with.
+        """
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        try:
+            await self.websocket.close(code=code)
+        except (RuntimeError, OSError):
+            logger.error("websocket already closed")
+
+    async def __run(self, on_error: Callable[[], Awaitable[None]]) -> None:
+        """
+        Send the queued messages, one at a time.
+
+        :param on_error: Called when a message can't be sent to the websocket.
+        """
+        while True:
+            messages = [await self.__queue.get()]
+            while self.batch and not self.__queue.empty():
+                messages.append(self.__queue.get_nowait())
+            try:
+                await self.__send_frame(messages)
+            except (WebSocketDisconnect, RuntimeError, OSError):
+                logger.error("disconnect")
+                self.clear()
+                self.__done(len(messages))
+                await on_error()
+                return
+            self.__done(len(messages))
+
+    async def __send_frame(self, messages: List[Union[str, bytes]]) -> None:
+        """
+        Send messages in one frame.
+
+        :param messages: The encoded messages.
+        """
+        if self.protocol == WebsocketProtocol.MSGPACK:
+            frames: List[bytes] = messages  # type: ignore
+            await self.websocket.send_bytes(
+                frames[0] if len(frames) == 1 else encode_events_msgpack(frames),
+            )
+        else:
+            texts: List[str] = messages  # type: ignore
+            await self.websocket.send_text(
+                texts[0] if len(texts) == 1 else encode_events(texts),
+            )
+
+    def __done(self, count: int) -> None:
+        """
+        Mark messages taken from the queue as processed.
+
+        :param count: The number of messages.
+        """
+        for _ in range(count):
+            self.__queue.task_done()
+
+
+Command = Callable[[], Awaitable[None]]
+QueuedCommand = Tuple[Command, "asyncio.Future[None]"]
+
+
+class GameActor(object):
+    """
+    Run the commands of a game one at a time, in the order they are submitted.
+
+    Every game has its own actor, so the commands of a game can't interleave
+    while the commands of different games run concurrently.
+    """
+
+    def __init__(self) -> None:
+        """Create the actor of a game."""
+        self.__queue: "asyncio.Queue[QueuedCommand]" = asyncio.Queue()
+        self.__task: "Optional[asyncio.Task[None]]" = None
+        self.__running: "Optional[asyncio.Future[None]]" = None
+        self.__closed = False
+
+    @property
+    def depth(self) -> int:
+        """
+        Get the number of commands waiting to be run.
+
+        :return: The number of commands in the queue.
+        """
+        return self.__queue.qsize()
+
+    def start(self) -> None:
+        """Start running the submitted commands."""
+        self.__task = asyncio.create_task(self.__run())
+
+    async def submit(self, command: Command) -> None:
+        """
+        Run a command after the commands already submitted.
+
+        :param command: The command to run.
+        :raises RuntimeError: If the actor is closed.
+        """
+        if self.__closed:
+            raise RuntimeError("The game actor is closed")
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self.__queue.put_nowait((command, future))
+        await future
+
+    async def close(self) -> None:
+        """
+        Stop running commands.
+
+        The running command and the commands not run yet are cancelled,
+        unless the actor is closed by the running command itself.
+        """
+        self.__closed = True
+        while not self.__queue.empty():
+            _, future = self.__queue.get_nowait()
+            future.cancel()
+        task = self.__task
+        self.__task = None
+        if task is None or task is asyncio.current_task():
+            return
+        if self.__running is not None:
+            self.__running.cancel()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def __run(self) -> None:
+        """Run the submitted commands, one at a time."""
+        while not self.__closed:
+            command, future = await self.__queue.get()
+            if future.done():
+                continue
+            self.__running = future
+            await self.__run_command(command, future)
+            self.__running = None
+
+    async def __run_command(
+        self,
+        command: Command,
+        future: "asyncio.Future[None]",
+    ) -> None:
+        """
+        Run a command and give its result to its submitter.
+
+        The submitter may have been cancelled while the command was running,
+        the result is then dropped.
+
+        :param command: The command to run.
+        :param future: The future the submitter waits for.
+        :raises asyncio.CancelledError: If the actor is closed while the command runs.
+        """
+        try:
+            await command()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            if not future.done():
+                future.set_exception(error)
+            return
+        if not future.done():
+            future.set_result(None)
 
 
 class WebsocketGameManager(object):
-    """Manage the websocket of the game."""
+    """
+    Manage the websocket of the game.
+
+    A message sent to several websockets is encoded once,
+    then queued for each of them. Every websocket has a bounded queue
+    sent by its own writer, so a slow client doesn't delay the others.
+    When the queue of a websocket is full, it is resynchronized
+    or disconnected, according to the settings.
+
+    The messages received for a game are run by the actor of the game,
+    so they change the game one at a time.
+
+    A websocket connected in batch mode receives the messages sent
+    together in events messages, and the state of the game
+    in one initial state message when the game begins.
+    """
 
     def __init__(self) -> None:
         """Initialize the WebsocketGameManager."""
         self.__websocket_games: Dict[int, List[WebSocket]] = {}
         self.__websocket_to_player: Dict[WebSocket, int] = {}
-
-    async def connect(self, websocket: WebSocket, game_id: int, user_id: int) -> None:
+        self.__writers: Dict[WebSocket, WebsocketWriter] = {}
+        self.__actors: Dict[int, GameActor] = {}
+        self.__waiting_state: Set[WebSocket] = set()
+        self.__closing: "Set[asyncio.Task[None]]" = set()
+        self.dropped_messages = 0
+        self.resyncs = 0
+        self.overflow_disconnects = 0
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        game_id: int,
+        user_id: int,
+        batch: bool = False,
+    ) -> None:
         """
         Connect a websocket to a game.
 
+        The websocket uses the MessagePack protocol if the client asks for it,
+        and JSON otherwise.
+
         :param websocket: The websocket to connect
         :param game_id: The id of the game to connect
         :param user_id: The id of the user to connect
+        :param batch: If True, send the messages together in events messages
         :raises HTTPException: If the user is not in the game
         """
         logger.error("connect")
@@ -293,11 +873,31 @@ class WebsocketGameManager(object):
             self.__websocket_games[game_id] = []
         self.__websocket_games[game_id].append(websocket)
         self.__websocket_to_player[websocket] = user_id
-        await websocket.accept()
+        protocol = negotiate_websocket_protocol(websocket.scope.get("subprotocols", []))
+        await websocket.accept(subprotocol=protocol.value if protocol else None)
+        writer = WebsocketWriter(
+            websocket,
+            settings.websocket_queue_size,
+            batch,
+            protocol or WebsocketProtocol.JSON,
+        )
+        self.__writers[websocket] = writer
+        writer.start(lambda: self.disconnect(websocket, game_id))
+        await self.__get_actor(game_id).submit(
+            lambda: self.__connect_player(game_id, user_id),
+        )
 
-        if gamem.game_manager.connect(game_id, user_id):
-            logger.error("begin game connect")
-            await self.begin_game(game_id)
+    async def read_message(self, websocket: WebSocket) -> Dict[str, Any]:
+        """
+        Wait for a message from a websocket, decoded with its protocol.
+
+        :param websocket: The websocket
+        :return: The data of the message
+        """
+        writer = self.__writers.get(websocket)
+        if writer is not None and writer.protocol == WebsocketProtocol.MSGPACK:
+            return decode_message_msgpack(await websocket.receive_bytes())
+        return await websocket.receive_json()
 
     async def disconnect(self, websocket: WebSocket, game_id: int) -> None:
         """
@@ -312,6 +912,51 @@ class WebsocketGameManager(object):
                 self.__websocket_to_player.pop(websocket)
             if not self.__websocket_games[game_id]:
                 self.__websocket_games.pop(game_id)
+        self.__waiting_state.discard(websocket)
+        writer = self.__writers.pop(websocket, None)
+        if writer is not None:
+            await writer.close()
+        if game_id not in self.__websocket_games:
+            await self.__close_actor(game_id)
+
+    async def flush(self, game_id: int) -> None:
+        """
+        Wait until the messages queued for the websockets of a game are sent.
+
+        :param game_id: The id of the game
+        """
+        await asyncio.gather(
+            *[
+                self.__writers[websocket].join()
+                for websocket in self.__websocket_games.get(game_id, [])
+                if websocket in self.__writers
+            ],
+        )
+
+    def get_metrics(self) -> Dict[str, int]:
+        """
+        Get the metrics of the queues of the websockets.
+
+        :return: The number of games and websockets, the messages waiting
+                 to be sent, the deepest queue, what was done when queues
+                 were full and the commands waiting to be run.
+        """
+        writers = list(self.__writers.values())
+        return {
+            "games": len(self.__actors),
+            "websockets": len(writers),
+            "queued_messages": sum(writer.depth for writer in writers),
+            "max_queue_depth": max((writer.depth for writer in writers), default=0),
+            "max_queue_depth_reached": max(
+                (writer.max_depth for writer in writers),
+                default=0,
+            ),
+            "queue_size": settings.websocket_queue_size,
+            "dropped_messages": self.dropped_messages,
+            "resyncs": self.resyncs,
+            "overflow_disconnects": self.overflow_disconnects,
+            "queued_commands": sum(actor.depth for actor in self.__actors.values()),
+        }
 
     async def game_broadcast(  # noqa: C901
         self,
@@ -332,15 +977,16 @@ class WebsocketGameManager(object):
         """
         if game_id not in self.__websocket_games:
             return
-        for websocket in self.__websocket_games[game_id]:
-            if action == 1 and websocket == player:
-                continue
-            if action == 2 and websocket != player:
-                continue
-            try:
-                await websocket.send_json(data)
-            except WebSocketDisconnect:
-                await self.disconnect(websocket, game_id)
+        message = GameMessage(data)
+        await self.__send_all(
+            game_id,
+            (
+                (websocket, message)
+                for websocket in self.__websocket_games[game_id]
+                if not (action == 1 and websocket == player)
+                and not (action == 2 and websocket != player)
+            ),
+        )
 
     async def game_private_broadcast(
         self,
@@ -359,15 +1005,15 @@ class WebsocketGameManager(object):
         """
         if game_id not in self.__websocket_games:
             return
-        for websocket in self.__websocket_games[game_id]:
-            try:
-                if websocket == target:
-                    await websocket.send_json(data)
-                else:
-                    await websocket.send_json(data_for_other)
-            except WebSocketDisconnect:
-                logger.error("disconnect")
-                await self.disconnect(websocket, game_id)
+        message = GameMessage(data)
+        message_for_other = GameMessage(data_for_other)
+        await self.__send_all(
+            game_id,
+            (
+                (websocket, message if websocket == target else message_for_other)
+                for websocket in self.__websocket_games[game_id]
+            ),
+        )
 
     async def receive(  # noqa: C901
         self,
@@ -379,40 +1025,55 @@ class WebsocketGameManager(object):
         """
         Recieve messages from players' websockets.
 
+        The message is run by the actor of the game,
+        after the messages already received for this game.
+
         :param websocket: The websocket to recieve from
         :param data: The data to recieve
         :param room_id: The id of the room of the player
         :param user_id: The id of the player
         """
-        if data["type"] == "deploy_card":
-            await self.deploy_card(room_id, websocket, data["id_card"], data)
-        elif data["type"] == "draw_card":
-            await self.draw_card(room_id, websocket)
-        elif data["type"] == "end_turn":
-            await self.next_turn(room_id, websocket)
-        elif data["type"] == "attack":
-            await self.attack(room_id, websocket, data)
-        elif data["type"] == "get_mana":
-            await self.get_mana(room_id, websocket)
-        elif data["type"] == "get_nexus_health":
-            await self.get_nexus_health(room_id, websocket)
-        elif data["type"] == "attack_nexus":
-            await self.attack_nexus(room_id, websocket, data["id_card"])  # type: ignore
-        elif data["type"] == "end_game":
-            await self.end_game(room_id, websocket, data["winner"])  # type: ignore
+        await self.__get_actor(room_id).submit(
+            lambda: self.__dispatch(websocket, data, room_id),
+        )
 
     async def begin_game(self, game_id: int) -> None:
         """
         Begin the game.
 
+        The websockets in batch mode receive the state of the game
+        instead of the messages of the beginning.
+
         :param game_id: The id of the game to begin
         """
         logger.error("begin")
-        await self.game_broadcast(game_id, {"type": "begin_game"}, None, 1)
-        await self.get_websocket_turn(game_id)
-        for _ in range(gamem.get_starting_cards_amount()):
-            for websocket in self.__websocket_games[game_id]:
-                await self.draw_card(game_id, websocket, force=True)
+        batched = [
+            websocket
+            for websocket in self.__websocket_games[game_id]
+            if self.__writers[websocket].batch
+        ]
+        self.__waiting_state.update(batched)
+        await self.__send_beginning(game_id)
+        self.__waiting_state.difference_update(batched)
+        await self.__send_all(
+            game_id,
+            (
+                (
+                    websocket,
+                    GameMessage(
+                        {
+                            "type": "initial_state",
+                            "state": gamem.game_manager.get_game_state(
+                                game_id,
+                                self.__websocket_to_player[websocket],
+                            ),
+                        },
+                    ),
+                )
+                for websocket in batched
+                if websocket in self.__websocket_to_player
+            ),
+        )
 
     async def get_websocket_turn(self, game_id: int) -> None:
         """
@@ -422,16 +1083,16 @@ class WebsocketGameManager(object):
         """
         if game_id not in self.__websocket_games:
             return
-        for websocket in self.__websocket_games[game_id]:
-            try:
-                await websocket.send_json(
-                    {
-                        "type": "get_turn",
-                        "id_player": gamem.game_manager.get_turn(game_id),
-                    },
-                )
-            except WebSocketDisconnect:
-                await self.disconnect(websocket, game_id)
+        message = GameMessage(
+            {
+                "type": "get_turn",
+                "id_player": gamem.game_manager.get_turn(game_id),
+            },
+        )
+        await self.__send_all(
+            game_id,
+            ((websocket, message) for websocket in self.__websocket_games[game_id]),
+        )
 
     async def draw_card(
         self,
@@ -502,26 +1163,23 @@ class WebsocketGameManager(object):
         )
 
         if res == -3:
-            await websocket.send_json(
-                {
-                    "type": "deploy_card",
-                    "data": "Card doesn't exist?!",
-                },
+            await self.__send(
+                websocket,
+                GameMessage({"type": "deploy_card", "data": "Card doesn't exist?!"}),
+                game_id,
             )
             logger.error("Card doesn't exist?!")
         elif res == -2:
-            await websocket.send_json(
-                {
-                    "type": "deploy_card",
-                    "data": "Not enough mana",
-                },
+            await self.__send(
+                websocket,
+                GameMessage({"type": "deploy_card", "data": "Not enough mana"}),
+                game_id,
             )
         elif res == -1:
-            await websocket.send_json(
-                {
-                    "type": "deploy_card",
-                    "data": "It's not your turn",
-                },
+            await self.__send(
+                websocket,
+                GameMessage({"type": "deploy_card", "data": "It's not your turn"}),
+                game_id,
             )
         else:
             await self.game_broadcast(
@@ -714,5 +1372,158 @@ class WebsocketGameManager(object):
             1,
         )
 
+    async def __send_beginning(self, game_id: int) -> None:
+        """
+        Send the beginning of a game and draw the starting cards.
+
+        :param game_id: The id of the game
+        """
+        await self.game_broadcast(game_id, {"type": "begin_game"}, None, 1)
+        await self.get_websocket_turn(game_id)
+        players = list(self.__websocket_games.get(game_id, []))
+        for _ in range(gamem.get_starting_cards_amount()):
+            for player in players:
+                # A websocket may be disconnected when its queue is full
+                if player in self.__websocket_to_player:
+                    await self.draw_card(game_id, player, force=True)
+
+    async def __connect_player(self, game_id: int, user_id: int) -> None:
+        """
+        Connect a player to a game, and begin the game if both are connected.
+
+        :param game_id: The id of the game
+        :param user_id: The id of the player
+        """
+        if gamem.game_manager.connect(game_id, user_id):
+            logger.error("begin game connect")
+            await self.begin_game(game_id)
+
+    def __get_actor(self, game_id: int) -> GameActor:
+        """
+        Get the actor of a game, it is started on first use.
+
+        :param game_id: The id of the game
+        :return: The actor of the game
+        """
+        actor = self.__actors.get(game_id)
+        if actor is None:
+            actor = GameActor()
+            actor.start()
+            self.__actors[game_id] = actor
+        return actor
+
+    async def __close_actor(self, game_id: int) -> None:
+        """
+        Close the actor of a game, when its last websocket is disconnected.
+
+        :param game_id: The id of the game
+        """
+        actor = self.__actors.pop(game_id, None)
+        if actor is not None:
+            await actor.close()
+
+    async def __send(
+        self,
+        websocket: WebSocket,
+        message: GameMessage,
+        game_id: int,
+    ) -> None:
+        """
+        Queue a message for a websocket.
+
+        :param websocket: The websocket
+        :param message: The message
+        :param game_id: The id of the game of the websocket
+        """
+        writer = self.__writers.get(websocket)
+        if writer is None or websocket in self.__waiting_state or writer.put(message):
+            return
+        if settings.websocket_overflow_policy == WebsocketOverflowPolicy.DISCONNECT:
+            await self.__overflow_disconnect(websocket, writer, game_id)
+            return
+        logger.error("websocket queue full, resync")
+        self.dropped_messages += writer.clear() + 1
+        self.resyncs += 1
+        writer.put(
+            GameMessage(
+                {
+                    "type": "resync",
+                    "state": gamem.game_manager.get_game_state(
+                        game_id,
+                        self.__websocket_to_player[websocket],
+                    ),
+                },
+            ),
+        )
+
+    async def __overflow_disconnect(
+        self,
+        websocket: WebSocket,
+        writer: WebsocketWriter,
+        game_id: int,
+    ) -> None:
+        """
+        Disconnect a websocket whose queue is full.
+
+        The websocket is closed by its writer in a new task, so the game
+        doesn't wait for the client, which is likely the reason it is full.
+
+        :param websocket: The websocket
+        :param writer: The writer of the websocket
+        :param game_id: The id of the game of the websocket
+        """
+        logger.error("websocket queue full, disconnect")
+        self.dropped_messages += writer.depth + 1
+        self.overflow_disconnects += 1
+        self.__writers.pop(websocket)
+        closing = writer.abort(status.WS_1008_POLICY_VIOLATION)
+        self.__closing.add(closing)
+        closing.add_done_callback(self.__closing.discard)
+        await self.disconnect(websocket, game_id)
+
+    async def __send_all(
+        self,
+        game_id: int,
+        messages: Iterable[Tuple[WebSocket, GameMessage]],
+    ) -> None:
+        """
+        Queue messages for websockets.
+
+        :param game_id: The id of the game of the websockets
+        :param messages: The websockets and the message to send to each
+        """
+        for websocket, message in list(messages):
+            await self.__send(websocket, message, game_id)
+
+    async def __dispatch(  # noqa: C901
+        self,
+        websocket: WebSocket,
+        data: Dict[str, str],
+        room_id: int,
+    ) -> None:  # noqa: C901
+        """
+        Run a message received from a player's websocket.
+
+        :param websocket: The websocket the message was recieved from
+        :param data: The data of the message
+        :param room_id: The id of the room of the player
+        """
+        if data["type"] == "deploy_card":
+            await self.deploy_card(room_id, websocket, data["id_card"], data)
+        elif data["type"] == "draw_card":
+            await self.draw_card(room_id, websocket)
+        elif data["type"] == "end_turn":
+            await self.next_turn(room_id, websocket)
+        elif data["type"] == "attack":
+            await self.attack(room_id, websocket, data)
+        elif data["type"] == "get_mana":
+            await self.get_mana(room_id, websocket)
+        elif data["type"] == "get_nexus_health":
+            await self.get_nexus_health(room_id, websocket)
+        elif data["type"] == "attack_nexus":
+            await self.attack_nexus(room_id, websocket, data["id_card"])  # type: ignore
+        elif data["type"] == "end_game":
+            await self.end_game(room_id, websocket, data["winner"])  # type: ignore
+
 
 websocket_manager = WebsocketGameManager()
@@ -1,16 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
 from fastapi.websockets import WebSocket
 from loguru import logger
 from starlette import status
-from starlette.responses import FileResponse
+from starlette.responses import FileResponse, Response
 
+from cyberarena import game_module as gamem
 from cyberarena.db.models.user_model import UserModel
+from cyberarena.game_module.settings import CardImageSize
 from cyberarena.web.api.connection.utils import get_current_user
-from cyberarena.web.api.game.schema import CardModel, TicketModel, TicketStatus
+from cyberarena.web.api.game.enums import CardAtlasKind
+from cyberarena.web.api.game.schema import (
+    CardModel,
+    CatalogueModel,
+    TicketModel,
+    TicketStatus,
+    WebsocketMetricsModel,
+)
 from cyberarena.web.api.game.utils import (
+    card_image_response,
+    get_card_atlas_path,
     get_card_data,
-    get_card_path,
     get_game_id,
+    json_payload_response,
     ticket_manager,
     websocket_manager,
 )
@@ -151,18 +164,71 @@ async def get_ticket_status(
     description="Get the data of a card.\n"
     "This include the name, the description, the cost, the type, "
     "the rarity, the attack, the health, the defense.\n"
+    "\nThe response has an ETag, send it back in the If-None-Match header "
+    "to receive a status code of 304 if the card didn't change.\n"
     "\nIf the card doesn't exist, "
-    "you will have a status code of 400.\n",
+    "you will have a status code of 404.\n",
 )
-async def get_card(card_id: int) -> CardModel:
+async def get_card(
+    card_id: int,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     """
     Get a card.
 
-    :param card_id: The id of the card to get  # noqa: DAR003
+    :param card_id: The id of the card to get
+    :param if_none_match: The ETag of the card the client already has
     :return: The card
-    :raise HTTPException: If the card doesn't exist
     """
-    return get_card_data(card_id)
+    return json_payload_response(get_card_data(card_id), if_none_match)
+
+
+@router.get(
+    "/cards",
+    response_model=List[CardModel],
+    summary="Get the data of all the cards.",
+    description="Get the data of all the cards of the game, ordered by id.\n"
+    "\nThe response has an ETag, send it back in the If-None-Match header "
+    "to receive a status code of 304 if the cards didn't change.\n",
+)
+async def get_cards(if_none_match: Optional[str] = Header(None)) -> Response:
+    """
+    Get all the cards.
+
+    :param if_none_match: The ETag of the cards the client already has
+    :return: The cards
+    """
+    return json_payload_response(gamem.get_catalogue_json(), if_none_match)
+
+
+@router.get(
+    "/catalogue",
+    response_model=CatalogueModel,
+    summary="Get the catalogue of the cards.",
+    description="Get the data of all the cards of the game with the URLs "
+    "of their images, in one request.\n"
+    "\nThe catalogue has a version, which is also its ETag. "
+    "Send it back in the If-None-Match header "
+    "to receive a status code of 304 if the cards didn't change.\n"
+    "\nThe response is compressed with brotli or gzip "
+    "if the Accept-Encoding header allows it.\n",
+)
+async def get_catalogue(
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+) -> Response:
+    """
+    Get the catalogue of the cards.
+
+    :param if_none_match: The version of the catalogue the client already has
+    :param accept_encoding: The encodings the client accepts
+    :return: The catalogue
+    """
+    return json_payload_response(
+        gamem.get_catalogue_with_images_json(),
+        if_none_match,
+        accept_encoding,
+    )
 
 
 @router.get(
@@ -170,18 +236,26 @@ async def get_card(card_id: int) -> CardModel:
     response_class=FileResponse,
     summary="Get the image of a card.",
     description="Get the image of a card.\n"
-    "Return the image file orf the card in a png format.\n"
+    "Return the image file of the card in a webp format if the Accept "
+    "header allows it, else in a png format.\n"
+    "\nThe size can be thumb, medium or full (default).\n"
     "\n**WARNING** : This card have not "
     "the number coreresponding to it stats.\n",
 )
-async def get_card_image(card_id: int) -> FileResponse:
+async def get_card_image(
+    card_id: int,
+    size: CardImageSize = CardImageSize.FULL,
+    accept: Optional[str] = Header(None),
+) -> FileResponse:
     """
     Get the image of a card.
 
     :param card_id: The id of the card to get the image
+    :param size: The size of the image
+    :param accept: The formats accepted by the client
     :return: The image of the card
     """
-    return FileResponse(get_card_path(card_id))
+    return card_image_response(card_id, fulfilled=False, size=size, accept=accept)
 
 
 @router.get(
@@ -189,18 +263,69 @@ async def get_card_image(card_id: int) -> FileResponse:
     response_class=FileResponse,
     summary="Get the image of a card.",
     description="Get the image of a card.\n"
-    "Return the image file orf the card in a png format.\n"
+    "Return the image file of the card in a webp format if the Accept "
+    "header allows it, else in a png format.\n"
+    "\nThe size can be thumb, medium or full (default).\n"
     "\nThis card is fully completed with card base stats.\n"
     "\nYou can't add number on it yourself.\n",
 )
-async def get_card_image_fulfilled(card_id: int) -> FileResponse:
+async def get_card_image_fulfilled(
+    card_id: int,
+    size: CardImageSize = CardImageSize.FULL,
+    accept: Optional[str] = Header(None),
+) -> FileResponse:
     """
     Get the image of a card.
 
     :param card_id: The id of the card to get the image
+    :param size: The size of the image
+    :param accept: The formats accepted by the client
     :return: The image of the card
     """
-    return FileResponse(get_card_path(card_id, full_path=True))
+    return card_image_response(card_id, fulfilled=True, size=size, accept=accept)
+
+
+@router.get(
+    "/atlas/{kind}",
+    response_class=FileResponse,
+    summary="Get the index of an atlas of card images.",
+    description="Get the index of an atlas of card images.\n"
+    "The atlas packs the images of all the cards in a few sheets, "
+    "to get them in a handful of requests.\n"
+    "\nThe index gives for each card id the sheet containing its image "
+    "and its position (x, y, width, height) in the sheet. "
+    "Get a sheet with /atlas/{kind}/{sheet}.\n"
+    "\nThe kind 'image' is the atlas of the cards without stats, "
+    "'imagefull' the atlas of the cards with their base stats.\n",
+)
+async def get_card_atlas(kind: CardAtlasKind) -> FileResponse:
+    """
+    Get the index of an atlas of card images.
+
+    :param kind: The kind of card images in the atlas
+    :return: The index of the atlas
+    """
+    return FileResponse(get_card_atlas_path(kind), media_type="application/json")
+
+
+@router.get(
+    "/atlas/{kind}/{sheet}",
+    response_class=FileResponse,
+    summary="Get a sheet of an atlas of card images.",
+    description="Get a sheet of an atlas of card images in a png format.\n"
+    "The position of each card in the sheet is in the index of the atlas.\n"
+    "\nIf the sheet doesn't exist, "
+    "you will have a status code of 404.\n",
+)
+async def get_card_atlas_sheet(kind: CardAtlasKind, sheet: int) -> FileResponse:
+    """
+    Get a sheet of an atlas of card images.
+
+    :param kind: The kind of card images in the atlas
+    :param sheet: The number of the sheet
+    :return: The image of the sheet
+    """
+    return FileResponse(get_card_atlas_path(kind, sheet))
 
 
 @router.websocket("/{room_id}/ws/{user_id}")
@@ -208,22 +333,54 @@ async def websocket_endpoint(
     websocket: WebSocket,
     room_id: int,
     user_id: int,
+    batch: bool = False,
 ) -> None:
     """
     Connect to a websocket game.
 
+    With batch, the messages sent together are received in one
+    events message, and the game begins with an initial state message.
+    The messages are sent with MessagePack instead of JSON
+    if the client asks for the cyberarena.msgpack subprotocol.
+
     :param websocket: The websocket
     :param room_id: The id of the room to connect to
     :param user_id: The id of the user trying to connect
+    :param batch: If True, receive the messages in batch mode
     """
     logger.error("room_id : " + str(room_id))
     logger.error("user_id : " + str(user_id))
-    await websocket_manager.connect(websocket, room_id, user_id)
-    while True:
-        data = await websocket.receive_json()
-        if data["type"] == "close":
-            break
-        await websocket_manager.receive(websocket, data, room_id, user_id)
+    await websocket_manager.connect(websocket, room_id, user_id, batch)
+    try:
+        while True:
+            data = await websocket_manager.read_message(websocket)
+            if data["type"] == "close":
+                break
+            await websocket_manager.receive(websocket, data, room_id, user_id)
+    finally:
+        await websocket_manager.disconnect(websocket, room_id)
+
+
+@router.get(
+    "/ws/metrics",
+    response_model=WebsocketMetricsModel,
+    summary="Get the metrics of the game websockets.",
+    description="Get the number of messages waiting to be sent "
+    "to the game websockets, how often their queues were full, "
+    "and the number of commands waiting to be run by the games.\n"
+    "\nIf you are not logged in, "
+    "you will have a status code of 401.\n",
+)
+async def get_websocket_metrics(
+    current_user: UserModel = Depends(get_current_user),
+) -> WebsocketMetricsModel:
+    """
+    Get the metrics of the queues of the game websockets.
+
+    :param current_user: The current user
+    :return: The metrics of the queues
+    """
+    return WebsocketMetricsModel(**websocket_manager.get_metrics())
 
 
 router.include_router(ticket_router, prefix="/ticket")
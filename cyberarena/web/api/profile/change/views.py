@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile
-from PIL import Image
 from starlette import status
 
 from cyberarena.db.dao.user_dao import UserDAO
@@ -161,6 +160,9 @@ async def save_avatar_img(  # noqa: WPS231
     :raises HTTPException: if the image failed to be saved
         or if the image is not PNG or JPEG.
     """
+    # Pillow is only imported when an avatar is uploaded
+    from PIL import Image  # noqa: WPS433
+
     try:
         # Open the img as same as the original image
         img = Image.open(avatar_img.file)
@@ -2,18 +2,6 @@ from asyncio import current_task
 from typing import Awaitable, Callable
 
 from fastapi import FastAPI
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
-from opentelemetry.sdk.resources import (
-    DEPLOYMENT_ENVIRONMENT,
-    SERVICE_NAME,
-    TELEMETRY_SDK_LANGUAGE,
-    Resource,
-)
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.trace import set_tracer_provider
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_scoped_session,
@@ -51,11 +39,33 @@ def setup_opentelemetry(app: FastAPI) -> None:  # pragma: no cover
     """
     Enables opentelemetry instrumentation.
 
+    The exporter and the instrumentations are only imported when
+    an endpoint is configured, they are slow to import.
+
     :param app: current application.
     """
     if not settings.opentelemetry_endpoint:
         return
 
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (  # noqa: WPS433
+        OTLPSpanExporter,
+    )
+    from opentelemetry.instrumentation.fastapi import (  # noqa: WPS433
+        FastAPIInstrumentor,
+    )
+    from opentelemetry.instrumentation.sqlalchemy import (  # noqa: WPS433
+        SQLAlchemyInstrumentor,
+    )
+    from opentelemetry.sdk.resources import (  # noqa: WPS433
+        DEPLOYMENT_ENVIRONMENT,
+        SERVICE_NAME,
+        TELEMETRY_SDK_LANGUAGE,
+        Resource,
+    )
+    from opentelemetry.sdk.trace import TracerProvider  # noqa: WPS433
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor  # noqa: WPS433
+    from opentelemetry.trace import set_tracer_provider  # noqa: WPS433
+
     tracer_provider = TracerProvider(
         resource=Resource(
             attributes={
@@ -83,15 +93,20 @@ def setup_opentelemetry(app: FastAPI) -> None:  # pragma: no cover
         app.url_path_for("redoc_html"),
     ]
 
-    FastAPIInstrumentor().instrument_app(
+    fastapi_instrumentor = FastAPIInstrumentor()
+    fastapi_instrumentor.instrument_app(
         app,
         tracer_provider=tracer_provider,
         excluded_urls=",".join(excluded_endpoints),
     )
-    SQLAlchemyInstrumentor().instrument(
+    sqlalchemy_instrumentor = SQLAlchemyInstrumentor()
+    sqlalchemy_instrumentor.instrument(
         tracer_provider=tracer_provider,
         engine=app.state.db_engine.sync_engine,
     )
+    # Kept to uninstrument on shutdown without importing them again
+    app.state.fastapi_instrumentor = fastapi_instrumentor
+    app.state.sqlalchemy_instrumentor = sqlalchemy_instrumentor
 
     set_tracer_provider(tracer_provider=tracer_provider)
 
@@ -105,8 +120,8 @@ def stop_opentelemetry(app: FastAPI) -> None:  # pragma: no cover
     if not settings.opentelemetry_endpoint:
         return
 
-    FastAPIInstrumentor().uninstrument_app(app)
-    SQLAlchemyInstrumentor().uninstrument()
+    app.state.fastapi_instrumentor.uninstrument_app(app)
+    app.state.sqlalchemy_instrumentor.uninstrument()
 
 
 def register_startup_event(
@@ -126,7 +141,6 @@ def register_startup_event(
     async def _startup() -> None:  # noqa: WPS430
         _setup_db(app)
         setup_opentelemetry(app)
-        pass  # noqa: WPS420
 
     return _startup
 
@@ -146,6 +160,5 @@ def register_shutdown_event(
         await app.state.db_engine.dispose()
 
         stop_opentelemetry(app)
-        pass  # noqa: WPS420
 
     return _shutdown